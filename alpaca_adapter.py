@@ -3,6 +3,15 @@ import asyncio, os, json, time, sys
 import websockets
 from events import Tick
 from config import SETTINGS
+from tracer import TRACER
+
+try:  # optional: orjson parses a frame several times faster than the stdlib
+    import orjson
+    loads = orjson.loads
+    HAVE_ORJSON = True
+except ImportError:
+    loads = json.loads
+    HAVE_ORJSON = False
 
 def log(*a): print("[ALPACA-WS]", *a, file=sys.stderr)
 
@@ -13,7 +22,68 @@ def make_subscribe(channel: str, symbol: str):
     if ch == "bars":   return {"action":"subscribe","bars":[sym]}
     return {"action":"subscribe","trades":[sym]}
 
-async def stream_ticks(symbol: str, out_queue: asyncio.Queue):
+MSG_TYPE = {"trades": "t", "quotes": "q", "bars": "b"}
+CONTROL_TYPES = frozenset({"success", "error", "subscription"})
+
+def make_decoder(channel: str, symbol: str, on_quote=None):
+    """Frame -> list of Ticks for one channel/symbol, specialised once per stream.
+
+    Returns ``decode(raw, ts_ns, recv_ns) -> (ticks, control)`` where ``control`` holds the
+    frame's non-data messages (subscription / error / success). Every tick of a frame gets
+    the frame's arrival time; numbers that are already float/int aren't converted again.
+    On the quotes channel ``on_quote(symbol, bid, ask)`` sees every two-sided quote (the
+    sim fill model's spread, ``FillModel.observe_quote``).
+    """
+    want = MSG_TYPE.get(channel, "t")
+
+    def decode(raw, ts_ns: int, recv_ns: int = 0):
+        try:
+            data = loads(raw)
+        except ValueError:
+            return [], []
+        if data.__class__ is not list:
+            return [], []
+        ticks, control = [], []
+        for d in data:
+            T = d.get("T")
+            if T != want:
+                if T in CONTROL_TYPES:
+                    control.append(d)
+                continue
+            if d.get("S") != symbol:
+                continue
+            if want == "t":
+                p, s = d.get("p"), d.get("s")
+                price = p if p.__class__ is float else float(p or 0)
+                size = s if s.__class__ is int else int(s or 0)
+            elif want == "q":
+                bp, ap = d.get("bp"), d.get("ap")
+                bp = bp if bp.__class__ is float else float(bp or 0)
+                ap = ap if ap.__class__ is float else float(ap or 0)
+                price = (bp + ap) / 2.0 if bp and ap else 0.0
+                size = 0
+                if price and on_quote is not None:
+                    on_quote(symbol, bp, ap)
+            else:
+                c = d.get("c")
+                price = c if c.__class__ is float else float(c or 0)
+                size = 0
+            if price:
+                ticks.append(Tick(ts_ns, symbol, price, size, recv_ns))
+        return ticks, control
+
+    return decode
+
+async def enqueue(out_queue, ticks: list):
+    """Hand a frame's ticks over in one go (put_many on pipeline stages / conflating channels)."""
+    put_many = getattr(out_queue, "put_many", None)
+    if put_many is not None:
+        await put_many(ticks)
+        return
+    for t in ticks:
+        await out_queue.put(t)
+
+async def stream_ticks(symbol: str, out_queue: asyncio.Queue, on_quote=None):
     WS_URL = os.getenv("ALPACA_WS_URL", "wss://stream.data.alpaca.markets/v2/iex")
     channel = os.getenv("ALPACA_CHANNEL", "trades").lower()
     key = SETTINGS.alpaca_key; secret = SETTINGS.alpaca_secret
@@ -88,43 +158,21 @@ async def stream_ticks(symbol: str, out_queue: asyncio.Queue):
 
                 wd_task = asyncio.create_task(no_tick_watchdog())
 
+                decode = make_decoder(channel, sub_symbol, on_quote)
                 async for msg in ws:
-                    try:
-                        data = json.loads(msg)
-                    except Exception:
-                        continue
-                    if not isinstance(data, list):
-                        continue
-                    for d in data:
-                        T = d.get("T"); S = d.get("S")
-                        if T == "subscription":
+                    ticks, control = decode(msg, time.time_ns(), TRACER.now())
+                    for d in control:
+                        if d.get("T") == "subscription":
                             # mark subscription start
                             first_sub_time = first_sub_time or time.time()
-                            continue
-                        if channel == "trades" and T == "t" and S == sub_symbol:
-                            price = float(d.get("p", 0) or 0)
-                            size = int(d.get("s", 0) or 0)
-                            if price:
-                                if log_ticks:
-                                    log(f"tick trade {S} p={price} s={size}")
-                                await out_queue.put(Tick(ts_ns=time.time_ns(), symbol=sub_symbol, price=price, size=size))
-                                tick_count += 1
-                        elif channel == "quotes" and T == "q" and S == sub_symbol:
-                            bp = float(d.get("bp",0) or 0); ap = float(d.get("ap",0) or 0)
-                            if bp and ap:
-                                mid = (bp+ap)/2.0
-                                if log_ticks:
-                                    log(f"tick quote {S} bp={bp} ap={ap} mid={mid}")
-                                await out_queue.put(Tick(ts_ns=time.time_ns(), symbol=sub_symbol, price=mid, size=0))
-                                tick_count += 1
-                        elif channel == "bars" and T == "b" and S == sub_symbol:
-                            c = float(d.get("c",0) or 0)
-                            if c:
-                                if log_ticks:
-                                    log(f"tick bar {S} c={c}")
-                                await out_queue.put(Tick(ts_ns=time.time_ns(), symbol=sub_symbol, price=c, size=0))
-                                tick_count += 1
-                    if tick_count > 0 and not wd_task.done():
+                    if not ticks:
+                        continue
+                    if log_ticks:
+                        for t in ticks:
+                            log(f"tick {channel} {t.symbol} p={t.price} s={t.size}")
+                    await enqueue(out_queue, ticks)
+                    tick_count += len(ticks)
+                    if not wd_task.done():
                         wd_task.cancel()
                 # after websocket exits, check if watchdog requested fallback
                 if fallback_requested and os.getenv("SIM_FALLBACK", "1").lower() in ("1","true","yes","on"):
@@ -135,7 +183,7 @@ async def stream_ticks(symbol: str, out_queue: asyncio.Queue):
                     except Exception:
                         pass
                     from sim_feed import stream_ticks as sim_stream
-                    await sim_stream(symbol, out_queue)
+                    await sim_stream(symbol, out_queue, on_quote)
                     return
         except Exception as e:
             log("Reconnect in", f"{backoff:.0f}s:", repr(e))
@@ -1,74 +1,132 @@
-import asyncio, csv, argparse, datetime as dt
+import asyncio, argparse
 from config import SETTINGS
 from strategy_engine import StrategyEngine
 from risk_gate import RiskGate
 from oms_router import OMSRouter
 from events import Tick, Execution, OrderApproved, OrderSignal
+from clock import VirtualClock, WALL_CLOCK
+from fill_model import make_fill_model
+from tracer import TRACER
+from pipeline import build_pipeline
+from tick_loader import first_ts, iter_batches, load_ticks
 import time
 
-async def feed_csv(path, ticks_q: asyncio.Queue, speed: float = 0.0):
-    # CSV columns: ts,price,size   ts = ISO8601 or epoch ns
-    with open(path, "r", newline="") as f:
-        rdr = csv.DictReader(f)
-        last_ts = None
-        for row in rdr:
-            ts_raw = row["ts"]
-            price = float(row["price"])
-            size = int(row.get("size", "0"))
-            try:
-                # try epoch ns
-                ts_ns = int(ts_raw)
-            except ValueError:
-                # try ISO
-                ts_ns = int(dt.datetime.fromisoformat(ts_raw).timestamp() * 1e9)
-            if last_ts and speed > 0:
+def first_tick_ts(path) -> int | None:
+    return first_ts(path)
+
+async def feed_csv(path, ticks_q: asyncio.Queue, speed: float = 0.0, clock=None, cache: bool = False):
+    # CSV (or .csv.gz) columns: ts,price,size   ts = ISO8601 or epoch ns; parsed in chunks by tick_loader
+    # With a VirtualClock the feed drives event time: timers due before each tick fire first.
+    virtual = isinstance(clock, VirtualClock)
+    batches = [load_ticks(path, cache=True)] if cache else iter_batches(path)
+    last_ts = None
+    symbol = SETTINGS.symbol
+    for batch in batches:
+        for ts_ns, price, size in zip(batch.ts_ns.tolist(), batch.price.tolist(), batch.size.tolist()):
+            if virtual:
+                await clock.advance_to(ts_ns)
+            elif last_ts and speed > 0:
                 # simulate pacing
                 delta = (ts_ns - last_ts) / 1e9 / speed
                 await asyncio.sleep(max(0.0, min(delta, 0.2)))
             last_ts = ts_ns
-            await ticks_q.put(Tick(ts_ns=ts_ns, symbol=SETTINGS.symbol, price=price, size=size))
+            await ticks_q.put(Tick(ts_ns=ts_ns, symbol=symbol, price=price, size=size, recv_ns=TRACER.now()))
+    if virtual and last_ts is not None:
+        # let the beats that fall exactly on the last tick fire
+        await clock.advance_to(last_ts + 1)
 
 async def main(args):
-    ticks_q = asyncio.Queue()
-    signals_q = asyncio.Queue()
-    approvals_q = asyncio.Queue()
-    exec_q = asyncio.Queue()
+    # bounded stages; ticks stay unconflated so tick-mode replays see every tick
+    pipe = build_pipeline(ticks="block:4096")
+    ticks_q, signals_q, approvals_q, exec_q = pipe.ticks, pipe.signals, pipe.approvals, pipe.exec
+
+    # speed 0: replay on event time as fast as possible; >0: paced against the wall clock
+    clock = VirtualClock(start_ns=first_tick_ts(args.csv) or 0) if args.speed <= 0 else None
+    engine = StrategyEngine(ticks_q, signals_q, clock=clock)
+    risk = RiskGate(clock=clock)
 
-    engine = StrategyEngine(ticks_q, signals_q)
-    risk = RiskGate()
+    fill_model = make_fill_model()
+    sim_clock = clock or WALL_CLOCK
 
     class FakeOMS:
+        pending: set = set()
+
         async def run(self, approvals_q):
             while True:
                 appr = await approvals_q.get()
-                # immediate synthetic fill @ last known price (for demo)
-                px = engine.last_price or 0.0
-                await exec_q.put(Execution(ts_ns=appr.ts_ns, symbol=appr.symbol, side=appr.side, qty=appr.qty, price=px))
+                # synthetic fills @ the price when the order reaches the market (FILL_MODEL)
+                task = asyncio.create_task(self.fill(appr))
+                self.pending.add(task)
+                task.add_done_callback(self.pending.discard)
+
+        async def fill(self, appr):
+            if TRACER.enabled:
+                TRACER.on_send(appr)
+            async for e in fill_model.execute(appr, lambda: engine.last_price or 0.0, sim_clock.sleep, sim_clock.time_ns):
+                if TRACER.enabled:
+                    TRACER.on_fill(e, appr)
+                await exec_q.put(e)
+
+    fills = 0
 
     async def exec_consumer():
-        fills = 0
+        nonlocal fills
         while True:
             e: Execution = await exec_q.get()
             fills += 1
-            risk.on_fill(e.side, e.qty, e.price)
+            risk.on_fill(e.side, e.qty, e.price, e.reason, legs=e.legs)
             if fills % 50 == 0:
                 print(f"[BT] Fills: {fills}")
 
     tasks = [
-        asyncio.create_task(feed_csv(args.csv, ticks_q, speed=args.speed)),
         asyncio.create_task(engine.run()),
         asyncio.create_task(risk.run(signals_q, approvals_q)),
         asyncio.create_task(FakeOMS().run(approvals_q)),
         asyncio.create_task(exec_consumer()),
     ]
-    await asyncio.gather(*tasks)
+    t0 = time.perf_counter()
+    await feed_csv(args.csv, ticks_q, speed=args.speed, clock=clock, cache=args.tick_cache)
+    if clock is None:
+        await asyncio.sleep(engine.beat_sec)  # paced run: let the final beat fire
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    risk.update_mark_to_market(engine.last_price)
+    print(f"[BT] Done in {time.perf_counter() - t0:.2f}s: fills={fills} position={risk.position} "
+          f"pnl={risk.daily_pnl:.2f} phase={engine.state.phase} cycles={engine.state.cycles}")
+    if fill_model.name != "instant":
+        print(f"[BT] Fills: {fill_model.format_metrics()}")
+    lt = engine.tick_latency
+    if lt["signals"]:
+        print(f"[BT] Tick-mode signals={lt['signals']} avg_latency={lt['sum_ns'] / lt['signals'] / 1e6:.3f}ms "
+              f"max_latency={lt['max_ns'] / 1e6:.3f}ms avg_ahead_of_beat={lt['lead_sum_ns'] / lt['signals'] / 1e9:.1f}s")
+    TRACER.summary()
+
+def main_batch(args):
+    from batch_backtest import load_csv, resample_to_beats, run_batch
+    t0 = time.perf_counter()
+    ts_ns, price, _ = load_csv(args.csv, cache=args.tick_cache)
+    t1 = time.perf_counter()
+    beat_ts, beat_px = resample_to_beats(ts_ns, price, SETTINGS.beat_sec)
+    res = run_batch(beat_ts, beat_px)
+    t2 = time.perf_counter()
+    print(f"[BT] {len(ts_ns)} ticks -> {len(beat_ts)} beats, {len(res.signals)} signals "
+          f"(load {t1 - t0:.2f}s, run {t2 - t1:.2f}s)")
+    for reason, n in sorted(res.counts().items(), key=lambda kv: int(kv[0][1:])):
+        print(f"[BT]   {reason}: {n}")
+    print(f"[BT] Final phase={res.state.phase} cycles={res.state.cycles}")
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--csv", required=True)
     ap.add_argument("--speed", type=float, default=0.0, help=">0 to pace; 0 for as-fast-as-possible")
+    ap.add_argument("--batch", action="store_true", help="evaluate triggers over NumPy beat arrays (no event loop)")
+    ap.add_argument("--tick-cache", action="store_true", help="reuse/write parsed ticks as <csv>.*.ticks.npy")
     args = ap.parse_args()
-    try:
-        asyncio.run(main(args))
-    except KeyboardInterrupt:
-        pass
+    if args.batch:
+        main_batch(args)
+    else:
+        try:
+            asyncio.run(main(args))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,212 @@
+# batch_backtest.py — array-based backtest of the T1–T16 ladder (no asyncio, no queues)
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from config import SETTINGS, Settings
+from events import OrderSignal, TickBatch
+from fill_model import make_fill_model
+from netting import net_beats
+from risk_gate import RiskGate
+from strategy_engine import LadderState, StrategyCore
+from tick_loader import load_ticks
+
+PHASES = ("IDLE", "T1_WINDOW", "T2_WINDOW", "T3_WINDOW", "T4_WINDOW", "T5_WINDOW")
+_PHASE_CODE = {p: i for i, p in enumerate(PHASES)}
+
+
+def load_batch(path, symbol: Optional[str] = None, cache: bool = False) -> TickBatch:
+    """Read a ts,price,size tick CSV / CSV.gz (ts = ISO8601 or epoch ns) into a ``TickBatch``."""
+    return load_ticks(path, symbol, cache=cache)
+
+
+def load_csv(path, cache: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read a tick CSV into int64/float64/int64 ts/price/size arrays."""
+    batch = load_batch(path, cache=cache)
+    return batch.ts_ns, batch.price, batch.size
+
+
+def resample_to_beats(ts_ns: np.ndarray, price: np.ndarray, beat_sec: float,
+                      start_ns: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+    """Sample the last traded price at every beat boundary.
+
+    Beats fire at ``start + k * beat_sec`` (k >= 1), like ``beat_loop`` sleeping from startup,
+    and see every tick with ``ts <= beat``. Beats before the first tick are dropped, matching
+    the engine skipping beats while ``last_price`` is still ``None``.
+    """
+    if len(ts_ns) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    t0 = int(ts_ns[0]) if start_ns is None else int(start_ns)
+    step = int(round(beat_sec * 1e9))
+    n = int((int(ts_ns[-1]) - t0) // step)
+    beat_ts = t0 + step * np.arange(1, n + 1, dtype=np.int64)
+    idx = np.searchsorted(ts_ns, beat_ts, side="right") - 1
+    keep = idx >= 0
+    return beat_ts[keep], price[idx[keep]]
+
+
+@dataclass
+class BatchResult:
+    beat_ts: np.ndarray           # int64 ns, one per evaluated beat
+    beat_px: np.ndarray           # float64 price seen at that beat
+    phase_code: np.ndarray        # int8 index into PHASES, state after the beat
+    cycles: np.ndarray            # int64 LadderState.cycles after the beat
+    signals: list[OrderSignal]
+    state: LadderState            # final ladder state
+
+    @property
+    def phases(self) -> list[str]:
+        return [PHASES[c] for c in self.phase_code.tolist()]
+
+    def counts(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for sig in self.signals:
+            out[sig.reason] = out.get(sig.reason, 0) + 1
+        return out
+
+
+def run_batch(beat_ts: np.ndarray, beat_px: np.ndarray, settings: Settings = SETTINGS,
+              lots: Optional[dict[str, int]] = None, symbol: Optional[str] = None) -> BatchResult:
+    """Step the shared StrategyCore once per resampled beat.
+
+    The ladder is a sequential state machine, so after the vectorised resample it is driven
+    over plain Python ints/floats (no NumPy scalars, no event loop) with the same ``step``
+    the live engine calls.
+    """
+    core = StrategyCore(symbol, settings=settings, lots=lots)
+    n = len(beat_px)
+    phase_code = np.zeros(n, dtype=np.int8)
+    cycles_out = np.zeros(n, dtype=np.int64)
+    signals: list[OrderSignal] = []
+    step, state = core.step, core.state
+    for i, (ts, price) in enumerate(zip(beat_ts.tolist(), beat_px.tolist())):
+        signals += step(ts, price)
+        phase_code[i] = _PHASE_CODE[state.phase]
+        cycles_out[i] = state.cycles
+    return BatchResult(beat_ts=beat_ts, beat_px=beat_px, phase_code=phase_code,
+                       cycles=cycles_out, signals=signals, state=core.state)
+
+
+@dataclass
+class FillSummary:
+    fills: int
+    pnl: float                    # realized + unrealized at the last beat
+    max_drawdown: float           # most negative (equity - running peak), sampled per beat
+    position: int
+    fills_by_trigger: dict[str, int]
+    fill_cost: float = 0.0        # sum of |fill - market price| * qty charged by the fill model
+    rejected: int = 0             # approved orders the fill model rejected
+
+
+def simulate_fills(res: BatchResult, ts_ns: np.ndarray, price: np.ndarray,
+                   settings: Settings = SETTINGS, protect: bool = True,
+                   spread: Optional[np.ndarray] = None) -> FillSummary:
+    """Route a batch signal stream through RiskGate, filled by ``settings.fill_model``.
+
+    The default "instant" model fills at the beat price. Other models price every signal up
+    front in one vectorized pass: the market price after the order's latency (last tick at
+    or before arrival) plus half the spread and the size impact; rejected orders don't fill.
+    ``spread`` is the quoted spread at each tick (aligned with ``ts_ns``); the spread at the
+    arrival tick is charged, else the model's spread for the symbol (``FILL_SPREAD_PTS``).
+    With ``protect`` the 37 s protection cycle is replayed on its own grid (stop at
+    ``per_leg_stop_pts``, take profit at 2.00 pts) between signals, as in ``protection_cycle``.
+    With ``settings.net_signals`` each beat's signals are netted into one order (window 0).
+    """
+    risk = RiskGate(settings=settings)
+    n_beats = len(res.beat_ts)
+    if n_beats == 0:
+        return FillSummary(0, 0.0, 0.0, 0, {})
+    signals = net_beats(res.signals) if settings.net_signals else res.signals
+    n_sig = len(signals)
+    sig_ts = np.fromiter((sg.ts_ns for sg in signals), dtype=np.int64, count=n_sig)
+    sig_beat = res.beat_px[np.searchsorted(res.beat_ts, sig_ts)]
+    model = make_fill_model(settings)
+    symbol = res.signals[0].symbol if res.signals else settings.symbol
+
+    def arrival(ts, lat, ref):
+        # price and quoted spread when the order reaches the market: last tick at or before ts + latency
+        if spread is None and not lat.any():
+            return ref, None
+        k = np.maximum(np.searchsorted(ts_ns, ts + lat, side="right") - 1, 0)
+        return np.where(lat > 0, price[k], ref), (None if spread is None else spread[k])
+
+    sig_ref, sig_spread = arrival(sig_ts, model.latency_ns(n_sig), sig_beat)
+    sign = np.fromiter((1.0 if sg.side == "BUY" else -1.0 for sg in signals), dtype=np.float64, count=n_sig)
+    qty = np.fromiter((sg.qty for sg in signals), dtype=np.float64, count=n_sig)
+    sig_px = model.avg_prices(sign, qty, sig_ref, sig_spread, symbol).tolist()
+    sig_beat, sig_ref = sig_beat.tolist(), sig_ref.tolist()
+    sig_rej = model.reject_mask(n_sig).tolist()
+    cost = 0.0
+    rejected = 0
+    if protect:
+        prot_ts, prot_px = resample_to_beats(ts_ns, price, settings.alt_beat_sec)
+        prot_ts, prot_px = prot_ts.tolist(), prot_px.tolist()
+    else:
+        prot_ts, prot_px = [], []
+
+    by_trigger: dict[str, int] = {}
+    curve_ts, curve_real, curve_pos, curve_avg = [], [], [], []
+
+    def fill(ts, side, qty, reason, px, legs=(), ref=None):
+        nonlocal cost
+        risk.on_fill(side, qty, px, reason, legs=legs)
+        if ref is not None:
+            cost += abs(px - ref) * qty
+        for r in ([r for r, _ in legs] if legs else [reason]):
+            by_trigger[r] = by_trigger.get(r, 0) + 1
+        curve_ts.append(ts); curve_real.append(risk._realized_pnl)
+        curve_pos.append(risk.position); curve_avg.append(risk._avg_price)
+
+    def protection(ts, px):
+        nonlocal rejected
+        if risk.position == 0:
+            return
+        adverse = (risk._avg_price - px) if risk.position > 0 else (px - risk._avg_price)
+        if adverse >= settings.per_leg_stop_pts or -adverse >= 2.00:
+            side = "SELL" if risk.position > 0 else "BUY"
+            sig = OrderSignal(ts_ns=ts, symbol=symbol, side=side, qty=abs(risk.position), reason="PROTECT",
+                              base_price=px, first_order_price=None, from_base_pts=None, from_first_pts=None)
+            risk.update_mark_to_market(px)
+            if risk.check(sig, ts / 1e9) is not None:
+                if model.reject_mask(1)[0]:
+                    rejected += 1
+                    return
+                ref, spr = arrival(np.array([ts]), model.latency_ns(1), np.array([px]))
+                ref = float(ref[0])
+                fpx = float(model.avg_prices(np.array([-1.0 if side == "SELL" else 1.0]), np.array([sig.qty]),
+                                             np.array([ref]), spr, symbol)[0])
+                fill(ts, side, sig.qty, "PROTECT", fpx, ref=ref)
+
+    j = 0
+    for sg, beat, ref, px, rej in zip(signals, sig_beat, sig_ref, sig_px, sig_rej):
+        while j < len(prot_ts) and prot_ts[j] < sg.ts_ns:
+            protection(prot_ts[j], prot_px[j]); j += 1
+        risk.update_mark_to_market(beat)
+        if risk.check(sg, sg.ts_ns / 1e9) is not None:
+            if rej:
+                rejected += 1
+                continue
+            fill(sg.ts_ns, sg.side, sg.qty, sg.reason, px, sg.legs, ref)
+    while j < len(prot_ts):
+        protection(prot_ts[j], prot_px[j]); j += 1
+
+    # equity at every beat from the piecewise-constant (realized, position, avg) after each fill
+    equity = np.zeros(n_beats)
+    if curve_ts:
+        k = np.searchsorted(np.asarray(curve_ts, dtype=np.int64), res.beat_ts, side="right") - 1
+        has = k >= 0
+        kk = k[has]
+        real = np.asarray(curve_real)[kk]
+        pos = np.asarray(curve_pos, dtype=np.float64)[kk]
+        avg = np.asarray(curve_avg)[kk]
+        equity[has] = real + pos * (res.beat_px[has] - avg)
+    drawdown = equity - np.maximum.accumulate(equity)
+    return FillSummary(fills=len(curve_ts), pnl=float(equity[-1]), max_drawdown=float(drawdown.min()),
+                       position=risk.position, fills_by_trigger=by_trigger, fill_cost=cost, rejected=rejected)
+
+
+def backtest_csv(path, settings: Settings = SETTINGS, beat_sec: Optional[float] = None) -> BatchResult:
+    ts_ns, price, _ = load_csv(path)
+    beat_ts, beat_px = resample_to_beats(ts_ns, price, beat_sec or settings.beat_sec)
+    return run_batch(beat_ts, beat_px, settings)
@@ -0,0 +1,134 @@
+# bench_alpaca_decode.py — market-data frame decode + enqueue throughput: old loop vs make_decoder
+"""
+  python bench_alpaca_decode.py                          # record 2000 frames from mock_alpaca, compare
+  python bench_alpaca_decode.py --save frames.jsonl      # ...and keep the recording
+  python bench_alpaca_decode.py --frames frames.jsonl    # replay a recording (one raw frame per line)
+
+Frames are recorded off the websocket of a local ``mock_alpaca`` subscribed to trades and
+quotes for several symbols (SIP-like: mixed message types, other symbols to skip). "legacy"
+is the previous message loop: ``json.loads``, per-field ``float``/``int``, string checks on
+every message and one ``await put`` per tick. "decoder" is ``alpaca_adapter.make_decoder``
+plus ``enqueue`` (one ``put_many`` per frame), with orjson when installed and with the
+stdlib parser. Each path feeds a conflating channel and a blocking pipeline stage, drained
+after every frame.
+"""
+import argparse, asyncio, json, pathlib, time
+
+import websockets
+
+import alpaca_adapter
+from alpaca_adapter import enqueue, make_decoder
+from channels import ConflatingChannel
+from events import Tick
+from mock_alpaca import MockAlpaca, MockConfig
+from pipeline import BoundedStage
+
+SYMBOLS = ("DIA", "SPY", "QQQ", "IWM", "AAPL", "MSFT", "NVDA", "TSLA")
+
+
+async def record(n: int, batch: int) -> list[str]:
+    mock = await MockAlpaca(MockConfig(symbols=SYMBOLS, rate=20_000, batch=batch, max_conns=0)).start()
+    frames = []
+    try:
+        async with websockets.connect(mock.ws_url, max_size=None) as ws:
+            await ws.recv()
+            await ws.send(json.dumps({"action": "auth", "key": "k", "secret": "s"}))
+            await ws.recv()
+            await ws.send(json.dumps({"action": "subscribe", "trades": list(SYMBOLS), "quotes": list(SYMBOLS)}))
+            while len(frames) < n:
+                msg = await ws.recv()
+                if '"T": "subscription"' not in msg:
+                    frames.append(msg)
+    finally:
+        await mock.stop()
+    return frames
+
+
+async def legacy(frames, q, symbol="DIA", channel="trades") -> int:
+    count = 0
+    for msg in frames:
+        try:
+            data = json.loads(msg)
+        except Exception:
+            continue
+        if not isinstance(data, list):
+            continue
+        for d in data:
+            T = d.get("T"); S = d.get("S")
+            if T == "subscription":
+                continue
+            if channel == "trades" and T == "t" and S == symbol:
+                price = float(d.get("p", 0) or 0)
+                size = int(d.get("s", 0) or 0)
+                if price:
+                    await q.put(Tick(ts_ns=time.time_ns(), symbol=symbol, price=price, size=size))
+                    count += 1
+            elif channel == "quotes" and T == "q" and S == symbol:
+                bp = float(d.get("bp", 0) or 0); ap = float(d.get("ap", 0) or 0)
+                if bp and ap:
+                    await q.put(Tick(ts_ns=time.time_ns(), symbol=symbol, price=(bp + ap) / 2.0, size=0))
+                    count += 1
+        while not q.empty():
+            q.get_nowait()
+    return count
+
+
+async def decoder(frames, q, symbol="DIA", channel="trades") -> int:
+    decode = make_decoder(channel, symbol)
+    count = 0
+    for msg in frames:
+        ticks, _ = decode(msg, time.time_ns())
+        if ticks:
+            await enqueue(q, ticks)
+            count += len(ticks)
+        while not q.empty():
+            q.get_nowait()
+    return count
+
+
+async def timed(fn, frames, make_q, repeat: int) -> tuple[float, int]:
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        q = make_q()
+        t0 = time.perf_counter()
+        count = await fn(frames, q)
+        best = min(best, time.perf_counter() - t0)
+    return best, count
+
+
+async def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--frames", help="recorded frames, one raw websocket message per line")
+    ap.add_argument("--save", help="write the recorded frames here")
+    ap.add_argument("--n", type=int, default=2000, help="frames to record")
+    ap.add_argument("--batch", type=int, default=25, help="mock messages per frame (per symbol and channel)")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    if args.frames:
+        frames = [ln for ln in pathlib.Path(args.frames).read_text().splitlines() if ln.strip()]
+    else:
+        frames = await record(args.n, args.batch)
+        if args.save:
+            pathlib.Path(args.save).write_text("\n".join(frames) + "\n")
+    msgs = sum(len(json.loads(f)) for f in frames)
+    print(f"[BENCH] {len(frames)} frames, {msgs} messages ({msgs / len(frames):.0f}/frame), "
+          f"orjson={'yes' if alpaca_adapter.HAVE_ORJSON else 'no'}")
+
+    queues = {"conflate": ConflatingChannel, "block": lambda: BoundedStage("ticks", 1 << 20, "block")}
+    paths = [("legacy", legacy, None), ("decoder/json", decoder, json.loads)]
+    if alpaca_adapter.HAVE_ORJSON:
+        paths.append(("decoder/orjson", decoder, alpaca_adapter.orjson.loads))
+    base = {}
+    for qname, make_q in queues.items():
+        for name, fn, loads in paths:
+            if loads is not None:
+                alpaca_adapter.loads = loads
+            sec, ticks = await timed(fn, frames, make_q, args.repeat)
+            base.setdefault(qname, sec)
+            print(f"[BENCH] {qname:>8} {name:<15} {msgs / sec / 1e6:6.2f}M msg/s {ticks / sec / 1e3:8.0f}k ticks/s "
+                  f"{sec / len(frames) * 1e6:7.1f}us/frame  {base[qname] / sec:4.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+# bench_oms.py — order round-trip latency: client per order vs OMSRouter's pooled client
+"""
+  python bench_oms.py                        # 60 orders over plain HTTP to a local mock
+  python bench_oms.py --tls --orders 200     # self-signed TLS (needs the openssl CLI)
+  python bench_oms.py --handshake-ms 20      # charge each *new* connection 20ms (models RTTs)
+
+``mock_alpaca.MockAlpaca`` answers POST /v2/orders (and GET /v2/clock) from a background
+thread. "fresh" is the old place_order: a new ``httpx.AsyncClient`` (new SSL
+context, new TCP/TLS connection) per order. "pooled" is ``OMSRouter.place_order`` after
+``start()`` warmed the pool. Orders go out in ladder-like bursts of three (T4/T5/T7) with
+a pause between bursts; the per-order histograms are printed side by side.
+"""
+import argparse, asyncio, ssl, subprocess, tempfile, time, pathlib
+
+import certifi
+import httpx
+
+import oms_router
+from latency import LatencyHistogram
+from mock_alpaca import MockAlpaca, MockConfig
+from oms_router import OMSRouter
+
+
+def self_signed(tmp: pathlib.Path) -> pathlib.Path:
+    cert, key = tmp / "cert.pem", tmp / "key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                    "-keyout", str(key), "-out", str(cert)], check=True, capture_output=True)
+    return cert
+
+
+def client_ctx(cert) -> ssl.SSLContext:
+    # what httpx builds by default (certifi bundle) plus the bench's self-signed cert
+    ctx = ssl.create_default_context(cafile=certifi.where())
+    if cert:
+        ctx.load_verify_locations(cert)
+    return ctx
+
+
+async def run_fresh(base: str, cert, orders: int, burst: int, gap: float) -> LatencyHistogram:
+    h = LatencyHistogram("fresh")
+    data = {"symbol": "DIA", "side": "buy", "type": "market", "time_in_force": "day", "qty": 10}
+    for i in range(orders):
+        t0 = time.perf_counter_ns()
+        async with httpx.AsyncClient(timeout=10.0, verify=client_ctx(cert)) as client:
+            r = await client.post(f"{base}/v2/orders", json=data)
+            r.raise_for_status()
+            r.json()
+        h.record(time.perf_counter_ns() - t0)
+        if (i + 1) % burst == 0:
+            await asyncio.sleep(gap)
+    return h
+
+
+async def run_pooled(base: str, cert, orders: int, burst: int, gap: float) -> LatencyHistogram:
+    oms = OMSRouter(asyncio.Queue(), mode="live", track_orders=False)
+    oms.base = base
+    if cert:
+        oms.verify = client_ctx(cert)
+    await oms.start()
+    try:
+        for i in range(orders):
+            await oms.place_order("DIA", "BUY", 10)
+            if (i + 1) % burst == 0:
+                await asyncio.sleep(gap)
+    finally:
+        await oms.aclose()
+    return oms.latency
+
+
+def show(name: str, h: LatencyHistogram, width: int = 40):
+    print(f"{name:>7}: {h.format()}")
+    rows = h.buckets()
+    # coarsen to ~12 rows so the two modes are easy to compare by eye
+    step = max(1, len(rows) // 12 + (len(rows) % 12 > 0))
+    peak = max(c for _, c in rows)
+    for k in range(0, len(rows), step):
+        chunk = rows[k:k + step]
+        c = sum(n for _, n in chunk)
+        print(f"         <= {chunk[-1][0]:8.2f}ms {c:5d} {'#' * max(1, round(width * c / peak / step))}")
+
+
+async def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--orders", type=int, default=60)
+    ap.add_argument("--burst", type=int, default=3, help="orders sent back to back (T4/T5/T7)")
+    ap.add_argument("--gap-ms", type=float, default=50.0, help="pause between bursts")
+    ap.add_argument("--handshake-ms", type=float, default=0.0, help="server delay on each new connection")
+    ap.add_argument("--tls", action="store_true", help="serve HTTPS with a throwaway self-signed cert")
+    args = ap.parse_args()
+
+    oms_router.print = lambda *a, **k: None  # keep per-order response lines out of the report
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, server_ctx = None, None
+        if args.tls:
+            cert = self_signed(pathlib.Path(tmp))
+            server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            server_ctx.load_cert_chain(cert, pathlib.Path(tmp) / "key.pem")
+        mock = MockAlpaca(MockConfig(connect_latency_ms=args.handshake_ms), server_ctx).run_in_thread()
+        base = mock.rest_url
+        print(f"[BENCH] {args.orders} orders to {base} in bursts of {args.burst}, "
+              f"gap {args.gap_ms:.0f}ms, handshake {args.handshake_ms:.0f}ms")
+        gap = args.gap_ms / 1000.0
+        results = {}
+        for name, fn in (("fresh", run_fresh), ("pooled", run_pooled)):
+            conns = mock.stats.rest_connections
+            results[name] = await fn(base, cert, args.orders, args.burst, gap)
+            print(f"[BENCH] {name}: {mock.stats.rest_connections - conns} connection(s) opened")
+        mock.stop_thread()
+    for name, h in results.items():
+        show(name, h)
+    f, p = results["fresh"].summary(), results["pooled"].summary()
+    if p["p50"]:
+        print(f"[BENCH] p50 {f['p50'] / p['p50']:.1f}x faster, p99 {f['p99'] / max(p['p99'], 1e-9):.1f}x faster")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
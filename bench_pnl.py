@@ -0,0 +1,90 @@
+# bench_pnl.py — vectorized avg-cost PnL vs the per-row replay loops
+"""
+  python bench_pnl.py                     # 10k / 100k / 1M fills
+  python bench_pnl.py --sizes 10000 50000 --pandas-max 20000
+
+"pandas" is the dashboards' old ``df.loc[idx, ...]`` loop (only run up to --pandas-max fills,
+it is far too slow beyond that), "scalar" the same loop over NumPy arrays, "vector" pnl.avg_cost_pnl.
+"""
+import argparse, time
+
+import numpy as np
+import pandas as pd
+
+from pnl import avg_cost_pnl, avg_cost_pnl_scalar
+
+
+def make_fills(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # ladder-like flow: runs of same-side adds, partial exits and the occasional flip
+    side = np.where(np.cumsum(rng.random(n) < 0.15) % 2 == 0, "BUY", "SELL")
+    qty = rng.choice([10, 20, 50, 100, 1000], n)
+    price = np.round(480 + np.cumsum(rng.normal(0, 0.05, n)), 2)
+    price[rng.random(n) < 0.01] = 0.0  # demo fills without a price
+    return pd.DataFrame({"side": side, "qty": qty, "price": price})
+
+
+def pandas_loop(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['entry_price'] = 0.0
+    df['pnl'] = 0.0
+    df['unrealized_pnl'] = 0.0
+    open_position = 0
+    open_vwap = 0.0
+    for idx in df.index:
+        side = df.loc[idx, 'side']
+        qty = df.loc[idx, 'qty']
+        price = df.loc[idx, 'price']
+        if price == 0:
+            continue
+        delta = qty if side == "BUY" else -qty
+        if open_position != 0 and ((open_position > 0 and delta < 0) or (open_position < 0 and delta > 0)):
+            close_qty = min(abs(delta), abs(open_position))
+            df.loc[idx, 'pnl'] = (price - open_vwap) * close_qty if open_position > 0 else (open_vwap - price) * close_qty
+            df.loc[idx, 'entry_price'] = open_vwap
+        if open_position == 0 or (open_position > 0 and delta > 0) or (open_position < 0 and delta < 0):
+            open_vwap = ((abs(open_position) * open_vwap) + (abs(delta) * price)) / (abs(open_position) + abs(delta)) if (abs(open_position) + abs(delta)) > 0 else price
+            df.loc[idx, 'entry_price'] = open_vwap
+        elif abs(delta) > abs(open_position):
+            open_vwap = price
+            df.loc[idx, 'entry_price'] = open_vwap
+        open_position += delta
+        if open_position != 0:
+            df.loc[idx, 'unrealized_pnl'] = (price - open_vwap) * open_position
+    df['cumulative_pnl'] = df['pnl'].cumsum() + df['unrealized_pnl']
+    return df
+
+
+def timed(fn, *args, repeat: int = 3):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    ap.add_argument("--pandas-max", type=int, default=10_000)
+    args = ap.parse_args()
+
+    print(f"{'fills':>10} {'pandas':>10} {'scalar':>10} {'vector':>10} {'speedup':>9} {'max|diff|':>10}")
+    for n in args.sizes:
+        df = make_fills(n)
+        arrays = (df["side"].to_numpy(), df["qty"].to_numpy(), df["price"].to_numpy())
+        t_vec, vec = timed(avg_cost_pnl, *arrays)
+        t_sc, ref = timed(avg_cost_pnl_scalar, *arrays, repeat=1)
+        t_pd = None
+        if n <= args.pandas_max:
+            t_pd, pdf = timed(pandas_loop, df, repeat=1)
+            assert np.allclose(pdf["cumulative_pnl"].to_numpy(), vec.cumulative, atol=1e-6)
+        diff = float(np.max(np.abs(vec.cumulative - ref.cumulative))) if n else 0.0
+        base = t_pd if t_pd is not None else t_sc
+        pd_txt = f"{t_pd:>9.3f}s" if t_pd is not None else f"{'-':>10}"
+        print(f"{n:>10} {pd_txt} {t_sc:>9.3f}s {t_vec:>9.4f}s {base / t_vec:>8.0f}x {diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
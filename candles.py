@@ -0,0 +1,152 @@
+# candles.py — streaming multi-timeframe OHLCV bars built from engine ticks
+"""
+The engine feeds every tick it consumes into a ``CandleAggregator``; each configured
+timeframe keeps one forming bar and appends it to a ``tick_store`` directory when it
+completes::
+
+    runtime/bars/5s/20250114.bin
+    runtime/bars/1min/20250114.bin
+
+Bars are epoch-aligned (``ts_ns`` = bar start) and built from ``ConflatedTick`` open/high/
+low/volume when the pipeline conflates, so highs and lows between engine reads still land in
+the bar. Empty intervals produce no bar (same as ``resample().dropna()``). Dashboards read
+the last N bars of any timeframe with ``load_bars`` — an mmap tail, independent of history.
+"""
+import pathlib
+from typing import Iterable, Optional
+
+import numpy as np
+
+from tick_store import StoreReader, StoreWriter
+
+BAR_DTYPE = np.dtype([("ts_ns", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"),
+                      ("close", "<f8"), ("volume", "<i8"), ("count", "<i4")])
+DEFAULT_TIMEFRAMES = ("5s", "15s", "30s", "1min")
+_UNITS = {"s": 1, "min": 60, "m": 60, "h": 3600}
+
+
+def parse_timeframe(tf: str) -> int:
+    """'5s' / '1min' / '1h' -> bar length in ns."""
+    tf = tf.strip().lower()
+    for unit in sorted(_UNITS, key=len, reverse=True):
+        if tf.endswith(unit) and tf[:-len(unit)].isdigit():
+            return int(tf[:-len(unit)]) * _UNITS[unit] * 1_000_000_000
+    raise ValueError(f"bad timeframe {tf!r}; expected e.g. 5s, 1min, 1h")
+
+
+class BarBuilder:
+    """One timeframe's forming bar."""
+
+    def __init__(self, tf: str):
+        self.tf = tf
+        self.tf_ns = parse_timeframe(tf)
+        self.start_ns: Optional[int] = None
+        self.open = self.high = self.low = self.close = 0.0
+        self.volume = 0
+        self.count = 0
+
+    def bar(self) -> tuple:
+        return (self.start_ns, self.open, self.high, self.low, self.close, self.volume, self.count)
+
+    def update(self, ts_ns: int, open_: float, high: float, low: float, close: float,
+               volume: int = 0, count: int = 1) -> Optional[tuple]:
+        """Fold one (possibly conflated) tick in; returns the bar it completed, if any."""
+        start = ts_ns - ts_ns % self.tf_ns
+        done = None
+        if self.start_ns is not None and start > self.start_ns:
+            done = self.bar()
+            self.start_ns = None
+        if self.start_ns is None:
+            self.start_ns = start
+            self.open, self.high, self.low = open_, high, low
+            self.volume = self.count = 0
+        else:
+            if high > self.high:
+                self.high = high
+            if low < self.low:
+                self.low = low
+        self.close = close
+        self.volume += volume
+        self.count += count
+        return done
+
+    def close_due(self, now_ns: int) -> Optional[tuple]:
+        """Complete the forming bar once its interval has ended (no tick needed)."""
+        if self.start_ns is not None and now_ns >= self.start_ns + self.tf_ns:
+            done = self.bar()
+            self.start_ns = None
+            return done
+        return None
+
+
+class CandleAggregator:
+    """Bars for several timeframes at once, persisted per timeframe under ``root``."""
+
+    def __init__(self, root="runtime/bars", timeframes: Iterable[str] = DEFAULT_TIMEFRAMES,
+                 persist: bool = True):
+        self.root = pathlib.Path(root)
+        self.builders = [BarBuilder(tf) for tf in timeframes]
+        self.writers = {b.tf: StoreWriter(self.root / b.tf, BAR_DTYPE) for b in self.builders} if persist else {}
+        self.completed: dict[str, list[tuple]] = {b.tf: [] for b in self.builders}  # persist=False only
+        self.bars = 0
+
+    def _emit(self, tf: str, bar: tuple):
+        self.bars += 1
+        if self.writers:
+            self.writers[tf].append(*bar)
+        else:
+            self.completed[tf].append(bar)
+
+    def on_tick(self, t):
+        """Accepts ``Tick`` or ``ConflatedTick`` (uses its open/high/low/volume/count)."""
+        if t.price is None:
+            return
+        if hasattr(t, "high"):
+            o, h, l, v, n = t.open, t.high, t.low, t.volume, t.count
+        else:
+            o = h = l = t.price
+            v, n = t.size or 0, 1
+        for b in self.builders:
+            done = b.update(t.ts_ns, o, h, l, t.price, v, n)
+            if done is not None:
+                self._emit(b.tf, done)
+
+    def close_due(self, now_ns: int):
+        """Flush bars whose interval ended without a newer tick (call periodically)."""
+        for b in self.builders:
+            done = b.close_due(now_ns)
+            if done is not None:
+                self._emit(b.tf, done)
+
+    def forming(self, tf: str) -> Optional[tuple]:
+        for b in self.builders:
+            if b.tf == tf and b.start_ns is not None:
+                return b.bar()
+        return None
+
+    def close(self):
+        for w in self.writers.values():
+            w.close()
+
+
+def available_timeframes(root="runtime/bars") -> list[str]:
+    """Timeframe directories present under ``root``, shortest first."""
+    root = pathlib.Path(root)
+    if not root.is_dir():
+        return []
+    tfs = []
+    for p in root.iterdir():
+        try:
+            tfs.append((parse_timeframe(p.name), p.name))
+        except ValueError:
+            continue
+    return [name for _, name in sorted(tfs)]
+
+
+def bar_reader(root, tf: str) -> StoreReader:
+    return StoreReader(pathlib.Path(root) / tf, BAR_DTYPE)
+
+
+def load_bars(root, tf: str, n: int) -> np.ndarray:
+    """Last ``n`` completed bars of timeframe ``tf``."""
+    return bar_reader(root, tf).tail(n)
@@ -0,0 +1,103 @@
+# channels.py — conflating latest-value tick channel (drop-in for the feeds' asyncio.Queue)
+import asyncio
+from dataclasses import dataclass
+
+from events import Tick
+
+
+@dataclass(slots=True)
+class ConflatedTick(Tick):
+    """Latest tick for a symbol plus the OHLC/volume of every tick folded into it."""
+    open: float = 0.0
+    high: float = 0.0
+    low: float = 0.0
+    volume: int = 0
+    count: int = 1  # ticks represented by this one
+
+
+class ConflatingChannel:
+    """Keeps only the newest unread tick per symbol.
+
+    Feeds call ``put``/``put_nowait`` exactly as on an ``asyncio.Queue``; a put for a symbol
+    that already has an unread tick overwrites it (counted in ``conflated``) while extending
+    its high/low/volume, so memory is bounded by the number of symbols and a stalled consumer
+    always resumes on the latest price. With ``aggregate=False`` the overwrite is plain
+    last-value (open/high/low = price, volume = size; ``count`` still grows). ``get`` returns symbols in first-dirtied order;
+    ``drain`` hands over everything pending in one call.
+    """
+
+    def __init__(self, aggregate: bool = True, max_symbols: int = 0):
+        self.aggregate = aggregate
+        self.max_symbols = max_symbols  # 0 = unlimited
+        self._pending: dict[str, ConflatedTick] = {}  # insertion order = delivery order
+        self._event = asyncio.Event()
+        self.puts = 0
+        self.delivered = 0
+        self.conflated = 0  # ticks overwritten before a consumer saw them
+        self.dropped = 0    # ticks rejected because max_symbols was reached
+
+    def put_nowait(self, tick: Tick):
+        self.puts += 1
+        slot = self._pending.get(tick.symbol)
+        if slot is None:
+            if self.max_symbols and len(self._pending) >= self.max_symbols:
+                self.dropped += 1
+                return
+            self._pending[tick.symbol] = ConflatedTick(
+                ts_ns=tick.ts_ns, symbol=tick.symbol, price=tick.price, size=tick.size, recv_ns=tick.recv_ns,
+                open=tick.price, high=tick.price, low=tick.price, volume=tick.size,
+            )
+        else:
+            self.conflated += 1
+            slot.ts_ns = tick.ts_ns
+            slot.price = tick.price
+            slot.size = tick.size
+            slot.recv_ns = tick.recv_ns
+            slot.count += 1
+            if self.aggregate:
+                if tick.price > slot.high:
+                    slot.high = tick.price
+                if tick.price < slot.low:
+                    slot.low = tick.price
+                slot.volume += tick.size
+            else:  # last value: the slot is just the newest tick
+                slot.open = slot.high = slot.low = tick.price
+                slot.volume = tick.size
+        self._event.set()
+
+    async def put(self, tick: Tick):
+        self.put_nowait(tick)
+
+    async def put_many(self, ticks):
+        for t in ticks:
+            self.put_nowait(t)
+
+    def get_nowait(self) -> ConflatedTick:
+        if not self._pending:
+            raise asyncio.QueueEmpty
+        sym = next(iter(self._pending))
+        self.delivered += 1
+        return self._pending.pop(sym)
+
+    async def get(self) -> ConflatedTick:
+        while not self._pending:
+            self._event.clear()
+            await self._event.wait()
+        return self.get_nowait()
+
+    def drain(self) -> list[ConflatedTick]:
+        """Take every pending tick (one per symbol) at once."""
+        out = list(self._pending.values())
+        self._pending.clear()
+        self.delivered += len(out)
+        return out
+
+    def qsize(self) -> int:
+        return len(self._pending)
+
+    def empty(self) -> bool:
+        return not self._pending
+
+    def stats(self) -> dict:
+        return {"puts": self.puts, "delivered": self.delivered, "conflated": self.conflated,
+                "dropped": self.dropped, "pending": len(self._pending)}
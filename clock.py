@@ -0,0 +1,77 @@
+# clock.py — pluggable time source for the engine, risk gate, EOD watcher and backtests
+import asyncio, heapq, itertools, time
+
+
+class WallClock:
+    """Real time: ``time.time()`` and ``asyncio.sleep()``. Used by live and sim runs."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def time_ns(self) -> int:
+        return time.time_ns()
+
+    async def sleep(self, sec: float):
+        await asyncio.sleep(sec)
+
+
+class VirtualClock:
+    """Event time driven by the feed instead of the wall.
+
+    ``sleep()`` parks the caller on a timer heap; the feed calls ``advance_to(tick_ts)`` before
+    handing over each tick, which wakes every timer due before that tick in deadline order. After
+    each wake-up the clock yields until the event loop is idle, so the woken coroutine and
+    everything downstream of it (signals -> netter -> risk -> OMS -> exec queues, however many
+    hops) runs before time moves on. A replay therefore runs as fast as the CPU allows and sees
+    exactly the prices a live run would.
+    """
+
+    MAX_SETTLE_PASSES = 100_000  # a task spinning on sleep(0) would keep the loop busy forever
+
+    def __init__(self, start_ns: int = 0, settle_passes: int = 16):
+        self._now_ns = int(start_ns)
+        self._timers: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self.settle_passes = settle_passes  # only for loops that don't expose their ready queue
+
+    def time(self) -> float:
+        return self._now_ns / 1e9
+
+    def time_ns(self) -> int:
+        return self._now_ns
+
+    async def sleep(self, sec: float):
+        if sec <= 0:
+            await asyncio.sleep(0)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self._now_ns + int(round(sec * 1e9)), next(self._seq), fut))
+        await fut
+
+    async def settle(self):
+        """Yield until no other callback is runnable (nothing left to do at this instant)."""
+        ready = getattr(asyncio.get_running_loop(), "_ready", None)  # asyncio's run queue
+        if ready is None:  # e.g. uvloop: fall back to a fixed number of passes
+            for _ in range(self.settle_passes):
+                await asyncio.sleep(0)
+            return
+        for _ in range(self.MAX_SETTLE_PASSES):
+            await asyncio.sleep(0)
+            if not ready:  # only this task was runnable: everything else waits on a timer or I/O
+                return
+        raise RuntimeError(f"VirtualClock: event loop still busy after {self.MAX_SETTLE_PASSES} passes")
+
+    async def advance_to(self, ts_ns: int):
+        """Fire all timers due strictly before ``ts_ns`` (so a beat sees ticks with ts <= beat)."""
+        await self.settle()
+        while self._timers and self._timers[0][0] < ts_ns:
+            deadline, _, fut = heapq.heappop(self._timers)
+            if fut.done():  # sleeper was cancelled
+                continue
+            self._now_ns = max(self._now_ns, deadline)
+            fut.set_result(None)
+            await self.settle()
+        self._now_ns = max(self._now_ns, int(ts_ns))
+
+
+WALL_CLOCK = WallClock()
@@ -39,6 +39,52 @@ class Settings:
     t15_move_mark: float = float(os.getenv("T15_MOVE_MARK", "0.11"))  # 0.00024 * 475
     t16_fallback_window: int = int(os.getenv("T16_FALLBACK_WINDOW", "11"))
     t16_fallback_move: float = float(os.getenv("T16_FALLBACK_MOVE", "0.10"))  # 0.0002 * 475
+    # Tick-driven evaluation (opt-in): T8/T14 and protection stops checked on ticks, not just beats
+    tick_triggers: bool = os.getenv("TICK_TRIGGERS", "false").lower() in ("1","true","yes","on")
+    tick_eval_min_ms: float = float(os.getenv("TICK_EVAL_MIN_MS", "250"))  # min spacing between tick checks
+    # OHLCV bars built from engine ticks (runtime/bars/<tf>/)
+    candle_timeframes: str = os.getenv("CANDLE_TIMEFRAMES", "5s,15s,30s,1min")
+    # Signal netting: one order per symbol for each beat's signals (plus NET_WINDOW_MS), legs kept for attribution
+    net_signals: bool = os.getenv("NET_SIGNALS", "false").lower() in ("1","true","yes","on")
+    net_window_ms: float = float(os.getenv("NET_WINDOW_MS", "0"))
+    # Pipeline queues: "policy[:maxsize]" with policy block | drop_oldest | coalesce (ticks: also conflate)
+    pipe_ticks: str = os.getenv("PIPE_TICKS", "conflate")
+    pipe_signals: str = os.getenv("PIPE_SIGNALS", "block:1024")
+    pipe_approvals: str = os.getenv("PIPE_APPROVALS", "block:256")
+    pipe_exec: str = os.getenv("PIPE_EXEC", "block:1024")
+    # Journal (trade logs / state files written off the event loop)
+    journal_flush_ms: float = float(os.getenv("JOURNAL_FLUSH_MS", "200"))
+    journal_fsync: str = os.getenv("JOURNAL_FSYNC", "commit")  # none | commit | always
+    # Live state (mmap region published on every change; state.json is a slow debug snapshot)
+    state_json_sec: float = float(os.getenv("STATE_JSON_SEC", "5"))  # 0 = don't write state.json
+    live_state_max_age_sec: float = float(os.getenv("LIVE_STATE_MAX_AGE_SEC", "300"))  # readers skip older slots; 0 = pid check only
+    # Stage latency tracing (tracer.py): per-stage stamps on events, histograms per stage and symbol
+    trace: bool = os.getenv("TRACE", "false").lower() in ("1","true","yes","on")
+    trace_dump_sec: float = float(os.getenv("TRACE_DUMP_SEC", "60"))  # periodic dump; 0 = only at shutdown
+    # OMS HTTP client: one pooled keep-alive client per router (HTTP/2 when the h2 package is installed)
+    oms_http2: bool = os.getenv("OMS_HTTP2", "true").lower() in ("1","true","yes","on")
+    oms_pool_max: int = int(os.getenv("OMS_POOL_MAX", "10"))            # max connections
+    oms_pool_keepalive: int = int(os.getenv("OMS_POOL_KEEPALIVE", "4"))  # idle connections kept open
+    oms_warm_conns: int = int(os.getenv("OMS_WARM_CONNS", "2"))          # opened at startup in live mode
+    oms_keepalive_sec: float = float(os.getenv("OMS_KEEPALIVE_SEC", "15"))  # idle ping interval; 0 = off
+    oms_timeout_sec: float = float(os.getenv("OMS_TIMEOUT_SEC", "10"))
+    oms_track_orders: bool = os.getenv("OMS_TRACK_ORDERS", "true").lower() in ("1","true","yes","on")
+    trade_stream_url: str = os.getenv("ALPACA_TRADE_STREAM_URL", "")  # default: wss://<base host>/stream
+    order_poll_sec: float = float(os.getenv("ORDER_POLL_SEC", "1"))     # fallback poll cadence
+    order_stale_sec: float = float(os.getenv("ORDER_STALE_SEC", "5"))   # poll an order this quiet even with the stream up
+    oms_max_inflight: int = int(os.getenv("OMS_MAX_INFLIGHT", "4"))  # concurrent orders (1 kept for PROTECT/FLATTEN)
+    # Simulated execution (sim-mode OMS, backtests, sweeps): instant | impact (see fill_model.py)
+    fill_model: str = os.getenv("FILL_MODEL", "instant")
+    fill_latency_ms: float = float(os.getenv("FILL_LATENCY_MS", "50"))        # median order latency
+    fill_latency_sigma: float = float(os.getenv("FILL_LATENCY_SIGMA", "0.5"))  # lognormal spread of it
+    fill_spread_pts: float = float(os.getenv("FILL_SPREAD_PTS", "0.02"))      # bid/ask spread when no quote seen
+    fill_impact_pts: float = float(os.getenv("FILL_IMPACT_PTS", "0.02"))      # impact at FILL_IMPACT_QTY shares
+    fill_impact_qty: float = float(os.getenv("FILL_IMPACT_QTY", "1000"))
+    fill_impact_exp: float = float(os.getenv("FILL_IMPACT_EXP", "0.5"))       # 0.5 = square-root law
+    fill_clip_qty: int = int(os.getenv("FILL_CLIP_QTY", "0"))                 # partial fills of this size; 0 = one fill
+    fill_clip_ms: float = float(os.getenv("FILL_CLIP_MS", "0"))
+    fill_reject_rate: float = float(os.getenv("FILL_REJECT_RATE", "0"))
+    fill_seed: int = int(os.getenv("FILL_SEED", "0"))
     # Lots
     lot_t1: int = int(os.getenv("LOT_T1", "10"))
     lot_t2: int = int(os.getenv("LOT_T2", "10"))
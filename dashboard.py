@@ -4,11 +4,36 @@ import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 
+from tail_reader import TailReader
+from ledger import LedgerFollower
+from pnl import avg_cost_pnl
+from config import SETTINGS
+from live_state import read_state
+from candles import available_timeframes, bar_reader
+
 st.set_page_config(page_title="DIA Strategy Monitor", layout="wide")
 
 RUNTIME_DIR = pathlib.Path("runtime")
-STATE_PATH = RUNTIME_DIR / "state.json"
 TRADES_PATH = RUNTIME_DIR / "trades.jsonl"
+BARS_DIR = RUNTIME_DIR / "bars"
+
+
+@st.cache_resource
+def _trades_tail():
+    # kept across reruns: each refresh parses only the fills appended since the last one
+    return TailReader(TRADES_PATH)
+
+@st.cache_resource
+def _ledger():
+    # resumes from runtime/ledger.ckpt.json, then applies only new fills each rerun
+    return LedgerFollower(TRADES_PATH)
+
+@st.cache_resource
+def _bars(tf: str):
+    return bar_reader(BARS_DIR, tf)
+
+def load_trades() -> pd.DataFrame:
+    return pd.DataFrame(_trades_tail().snapshot())
 
 mode_text = "unknown"
 if (RUNTIME_DIR / "mode.txt").exists():
@@ -78,8 +103,10 @@ with control_cols[4]:
             # Archive existing files
             if TRADES_PATH.exists():
                 TRADES_PATH.rename(archive_dir / f"trades_{timestamp}.jsonl")
-            if (RUNTIME_DIR / "prices.jsonl").exists():
-                (RUNTIME_DIR / "prices.jsonl").rename(archive_dir / f"prices_{timestamp}.jsonl")
+            if (RUNTIME_DIR / "prices").exists():
+                (RUNTIME_DIR / "prices").rename(archive_dir / f"prices_{timestamp}")
+            if BARS_DIR.exists():
+                BARS_DIR.rename(archive_dir / f"bars_{timestamp}")
             
             # Pause trading automatically when clearing logs
             pause_flag = RUNTIME_DIR / "pause.flag"
@@ -104,12 +131,7 @@ left, right = st.columns([1,3])
 
 with left:
     st.subheader("Engine Status")
-    state = {}
-    if STATE_PATH.exists():
-        try:
-            state = json.loads(STATE_PATH.read_text())
-        except Exception:
-            state = {}
+    state = read_state(RUNTIME_DIR, SETTINGS.symbol) or {}  # seqlock read of runtime/live_state.bin
     
     # Trading status indicator
     pause_flag = RUNTIME_DIR / "pause.flag"
@@ -143,52 +165,10 @@ with left:
     current_pnl = 0.0
     if TRADES_PATH.exists():
         try:
-            trades_df = pd.read_json(TRADES_PATH, lines=True)
-            if not trades_df.empty:
-                # Calculate position
-                current_position = int((trades_df['qty'].where(trades_df['side']=="BUY", -trades_df['qty'])).sum())
-                
-                # Calculate PnL (simple realized + unrealized)
-                open_position = 0
-                open_vwap = 0.0
-                realized_pnl = 0.0
-                
-                for idx in trades_df.index:
-                    side = trades_df.loc[idx, 'side']
-                    qty = trades_df.loc[idx, 'qty']
-                    price = trades_df.loc[idx, 'price']
-                    
-                    if price == 0:
-                        continue
-                    
-                    delta = qty if side == "BUY" else -qty
-                    
-                    # Calculate realized PnL for closing trades
-                    if open_position != 0 and ((open_position > 0 and delta < 0) or (open_position < 0 and delta > 0)):
-                        close_qty = min(abs(delta), abs(open_position))
-                        if open_position > 0:
-                            realized_pnl += (price - open_vwap) * close_qty
-                        else:
-                            realized_pnl += (open_vwap - price) * close_qty
-                    
-                    # Update position and VWAP
-                    if open_position == 0 or (open_position > 0 and delta > 0) or (open_position < 0 and delta < 0):
-                        new_vwap = ((abs(open_position) * open_vwap) + (abs(delta) * price)) / (abs(open_position) + abs(delta)) if (abs(open_position) + abs(delta)) > 0 else price
-                        open_vwap = new_vwap
-                    elif abs(delta) > abs(open_position):
-                        open_vwap = price
-                    
-                    open_position += delta
-                
-                # Calculate unrealized PnL for open position
-                unrealized_pnl = 0.0
-                if open_position != 0 and lp and isinstance(lp, (int, float)):
-                    if open_position > 0:
-                        unrealized_pnl = (lp - open_vwap) * abs(open_position)
-                    else:
-                        unrealized_pnl = (open_vwap - lp) * abs(open_position)
-                
-                current_pnl = realized_pnl + unrealized_pnl
+            ledger = _ledger().poll()
+            current_position = ledger.total_position()
+            mark = lp if isinstance(lp, (int, float)) else None
+            current_pnl = ledger.total_pnl({sym: mark for sym in ledger.books})
         except Exception as e:
             pass
     
@@ -208,47 +188,33 @@ with left:
 
 with right:
     st.subheader("Price (Candles)")
-    prices_path = RUNTIME_DIR / "prices.jsonl"
-    if prices_path.exists():
+    timeframes = available_timeframes(BARS_DIR)
+    if timeframes:
         try:
-            # load last ~600 samples (~5 minutes at 2 Hz)
-            with prices_path.open("r") as f:
-                lines = f.readlines()[-600:]
-            recs = [json.loads(x) for x in lines]
-            if recs:
-                pdf = pd.DataFrame(recs)
-                pdf["time"] = pd.to_datetime(pdf["ts"], unit="s")
-                # timeframe selector
-                tf = st.selectbox("Timeframe", ["5s","15s","30s","1min"], index=2, help="Aggregate taps to OHLC")
-                rule = {"5s":"5S","15s":"15S","30s":"30S","1min":"1min"}[tf]
-                ohlc = (
-                    pdf.set_index("time")["price"]
-                    .resample(rule)
-                    .agg(["first","max","min","last"])  # O H L C but adjust ordering below
-                    .dropna()
-                )
-                ohlc.rename(columns={"first":"open","max":"high","min":"low","last":"close"}, inplace=True)
-                if not ohlc.empty:
-                    fig = go.Figure(data=[go.Candlestick(
-                        x=ohlc.index,
-                        open=ohlc["open"], high=ohlc["high"], low=ohlc["low"], close=ohlc["close"],
-                        increasing_line_color="#26a69a", decreasing_line_color="#ef5350"
-                    )])
-                    fig.update_layout(height=250, margin=dict(l=10,r=10,t=10,b=10))
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("Not enough samples yet to form candles.")
+            tf_col, n_col = st.columns(2)
+            tf = tf_col.selectbox("Timeframe", timeframes, index=min(2, len(timeframes) - 1), help="Bars built by the engine from every tick")
+            n_bars = n_col.slider("Bars", 20, 500, 60)
+            # completed bars, read straight off the mmap (cost independent of history length)
+            bars = _bars(tf).tail(n_bars)
+            if len(bars):
+                fig = go.Figure(data=[go.Candlestick(
+                    x=pd.to_datetime(bars["ts_ns"], unit="ns"),
+                    open=bars["open"], high=bars["high"], low=bars["low"], close=bars["close"],
+                    increasing_line_color="#26a69a", decreasing_line_color="#ef5350"
+                )])
+                fig.update_layout(height=250, margin=dict(l=10,r=10,t=10,b=10))
+                st.plotly_chart(fig, use_container_width=True)
             else:
-                st.info("No price samples yet.")
+                st.warning("No completed bars yet for this timeframe.")
         except Exception as ex:
-            st.warning(f"Could not load prices: {ex}")
+            st.warning(f"Could not load bars: {ex}")
     else:
-        st.info("No prices file yet. It will appear once the engine runs.")
+        st.info("No bars yet. They will appear once the engine runs.")
 
     st.subheader("P&L Performance")
     if TRADES_PATH.exists():
         try:
-            df = pd.read_json(TRADES_PATH, lines=True)
+            df = load_trades()
             if not df.empty:
                 df['time'] = pd.to_datetime(df['ts'], unit='s')
                 df = df.sort_values('time')
@@ -256,65 +222,12 @@ with right:
                 # Calculate position and PnL
                 df['pos'] = (df['qty'].where(df['side']=="BUY", -df['qty'])).cumsum()
                 
-                # Calculate realized + unrealized PnL per trade
-                df['entry_price'] = 0.0
-                df['pnl'] = 0.0
-                df['unrealized_pnl'] = 0.0
-                
-                open_position = 0
-                open_vwap = 0.0
-                realized_pnl_total = 0.0
-                
-                for idx in df.index:
-                    side = df.loc[idx, 'side']
-                    qty = df.loc[idx, 'qty']
-                    price = df.loc[idx, 'price']
-                    
-                    if price == 0:  # Skip demo orders with no price
-                        df.loc[idx, 'pnl'] = 0.0
-                        df.loc[idx, 'entry_price'] = 0.0
-                        df.loc[idx, 'unrealized_pnl'] = 0.0
-                        continue
-                    
-                    delta = qty if side == "BUY" else -qty
-                    realized_pnl = 0.0
-                    
-                    # Calculate PnL for closing trades
-                    if open_position != 0 and ((open_position > 0 and delta < 0) or (open_position < 0 and delta > 0)):
-                        close_qty = min(abs(delta), abs(open_position))
-                        if open_position > 0:  # closing long
-                            realized_pnl = (price - open_vwap) * close_qty
-                        else:  # closing short
-                            realized_pnl = (open_vwap - price) * close_qty
-                        df.loc[idx, 'pnl'] = realized_pnl
-                        df.loc[idx, 'entry_price'] = open_vwap
-                        realized_pnl_total += realized_pnl
-                    
-                    # Update open position
-                    if open_position == 0 or (open_position > 0 and delta > 0) or (open_position < 0 and delta < 0):
-                        # Adding to position - update VWAP
-                        new_vwap = ((abs(open_position) * open_vwap) + (abs(delta) * price)) / (abs(open_position) + abs(delta)) if (abs(open_position) + abs(delta)) > 0 else price
-                        open_vwap = new_vwap
-                        df.loc[idx, 'entry_price'] = open_vwap  # Show VWAP for entry trades
-                    elif abs(delta) > abs(open_position):
-                        # Flipping position
-                        open_vwap = price
-                        df.loc[idx, 'entry_price'] = open_vwap
-                    
-                    open_position += delta
-                    
-                    # Calculate unrealized P&L for open position
-                    if open_position != 0:
-                        if open_position > 0:  # long
-                            unrealized = (price - open_vwap) * abs(open_position)
-                        else:  # short
-                            unrealized = (open_vwap - price) * abs(open_position)
-                        df.loc[idx, 'unrealized_pnl'] = unrealized
-                    else:
-                        df.loc[idx, 'unrealized_pnl'] = 0.0
-                
-                # Total PnL = realized + unrealized
-                df['cumulative_pnl'] = df['pnl'].cumsum() + df['unrealized_pnl']
+                # Realized + unrealized PnL per trade (vectorized avg-cost replay)
+                cols = avg_cost_pnl(df['side'].to_numpy(), df['qty'].to_numpy(), df['price'].to_numpy())
+                df['entry_price'] = cols.entry_price
+                df['pnl'] = cols.realized
+                df['unrealized_pnl'] = cols.unrealized
+                df['cumulative_pnl'] = cols.cumulative
                 
                 # Per-minute PnL Chart
                 df_minute = df.set_index('time')
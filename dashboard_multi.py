@@ -1,13 +1,26 @@
 # dashboard_multi.py — Streamlit dashboard for multi-symbol monitoring
-import json, glob, time, pathlib
+import json, time, pathlib
 import pandas as pd
 import streamlit as st
 
+from tick_store import StoreReader
+from tail_reader import TailReader, csv_parser
+from live_state import read_all_states
+
 RUNTIME = pathlib.Path("runtime")
+TRADE_COLS = ["ts", "side", "qty", "price"]
+
+
+@st.cache_resource
+def _trades_tail(symbol: str):
+    # last 25 executions, then only newly appended rows on each rerun
+    return TailReader(RUNTIME / f"trades_{symbol}.csv", parse=csv_parser(TRADE_COLS), window=25, max_records=25)
+
+
 st.set_page_config(page_title="Multi-Symbol Monitor", layout="wide")
 
 st.title("🌍 Multi-Symbol Strategy Monitor")
-st.caption("Shows per-symbol state (~1 Hz), price taps (~2 Hz), and recent executions from runtime/ files.")
+st.caption("Shows per-symbol live state (updated on every tick), price taps (~2 Hz), and recent executions from runtime/ files.")
 
 # Control Panel
 st.markdown("---")
@@ -91,25 +104,18 @@ if auto:
             except Exception:
                 pass
 
-# load per-symbol state
-state_files = sorted(glob.glob(str(RUNTIME / "state_*.json")))
-rows = []
-for path in state_files:
-    try:
-        j = json.loads(pathlib.Path(path).read_text())
-        rows.append({
-            "symbol": j.get("symbol"),
-            "last_price": j.get("last_price"),
-            "phase": j.get("phase"),
-            "cycles": int(j.get("cycles", 0) or 0),
-            "position": int(j.get("position", 0) or 0),
-            "ts": float(j.get("ts", 0.0) or 0.0),
-        })
-    except Exception:
-        pass
+# per-symbol state: one seqlock read per slot of runtime/live_state.bin
+rows = [{
+    "symbol": j["symbol"],
+    "last_price": j["last_price"],
+    "phase": j["phase"],
+    "cycles": j["cycles"],
+    "position": j["position"],
+    "ts": j["ts"],
+} for j in read_all_states(RUNTIME)]
 
 if not rows:
-    st.info("No state files found yet. Run the engine first: `python run_multi.py`")
+    st.info("No live state found yet. Run the engine first: `python run_multi.py`")
     st.stop()
 
 df = pd.DataFrame(rows).sort_values("symbol")
@@ -128,18 +134,13 @@ left, right = st.columns([2,1], gap="large")
 
 with left:
     st.markdown(f"### {sel} — live price trace (last ~3 minutes)")
-    prices_path = RUNTIME / f"prices_{sel}.jsonl"
-    ts_list, px_list = [], []
-    if prices_path.exists():
-        try:
-            with open(prices_path, "r") as f:
-                tail = f.readlines()[-360:]
-            for line in tail:
-                j = json.loads(line); ts_list.append(float(j["ts"])); px_list.append(float(j["price"]))
-        except Exception:
-            pass
-    if px_list:
-        chart_df = pd.DataFrame({"ts": ts_list, "price": px_list}).sort_values("ts").set_index("ts")
+    recs = None
+    try:
+        recs = StoreReader(RUNTIME / f"prices_{sel}").tail(360)
+    except Exception:
+        pass
+    if recs is not None and len(recs):
+        chart_df = pd.DataFrame({"ts": recs["ts_ns"] / 1e9, "price": recs["price"]}).set_index("ts")
         st.line_chart(chart_df, height=260)
     else:
         st.warning("No prices yet for this symbol.")
@@ -158,13 +159,8 @@ with right:
     st.markdown("### Recent executions")
     trades_csv = RUNTIME / f"trades_{sel}.csv"
     if trades_csv.exists():
-        try:
-            tdf = pd.read_csv(trades_csv)
-            if set(tdf.columns) != {"ts","side","qty","price"}:
-                tdf = pd.read_csv(trades_csv, names=["ts","side","qty","price"], header=0)
-        except Exception:
-            tdf = pd.read_csv(trades_csv, names=["ts","side","qty","price"])
-        st.dataframe(tdf.tail(25), hide_index=True, use_container_width=True)
+        tdf = pd.DataFrame(_trades_tail(sel).snapshot(), columns=TRADE_COLS)
+        st.dataframe(tdf, hide_index=True, use_container_width=True)
     else:
         st.write("No trades yet.")
 
@@ -1,6 +1,7 @@
 import asyncio, datetime as dt
 from zoneinfo import ZoneInfo
 from config import SETTINGS
+from clock import WALL_CLOCK
 
 def next_close(now: dt.datetime) -> dt.datetime:
     # Compute today's or next market close at EOD_HHMM in TZ
@@ -14,11 +15,12 @@ def next_close(now: dt.datetime) -> dt.datetime:
         return nxt.replace(hour=hh, minute=mm, second=0, microsecond=0)
     return today_close
 
-async def eod_watcher(flatten_cb, reset_cb):
+async def eod_watcher(flatten_cb, reset_cb, clock=None):
+    clock = clock or WALL_CLOCK
     while True:
-        now = dt.datetime.now(SETTINGS.zone)
+        now = dt.datetime.fromtimestamp(clock.time(), SETTINGS.zone)
         target = next_close(now)
-        await asyncio.sleep((target - now).total_seconds())
+        await clock.sleep((target - now).total_seconds())
         try:
             await flatten_cb()
         finally:
@@ -1,15 +1,25 @@
-from dataclasses import dataclass, field
+from array import array
+from dataclasses import dataclass, field, fields, make_dataclass, MISSING
 from typing import Optional, Literal
 import time
 
-@dataclass
+import numpy as np
+
+# Events are slotted: no per-instance __dict__, so a Tick is ~half the size and attribute
+# access is a fixed offset. Frozen* variants (below) are hashable/immutable copies for
+# journals, caches and cross-task sharing.
+# The *_ns stage stamps after ts_ns are perf_counter_ns values set only with TRACE=true
+# (0 otherwise); see tracer.py.
+
+@dataclass(slots=True)
 class Tick:
     ts_ns: int
     symbol: str
     price: float
     size: int = 0
+    recv_ns: int = 0     # feed put it on ticks_q
 
-@dataclass
+@dataclass(slots=True)
 class OrderSignal:
     ts_ns: int
     symbol: str
@@ -20,16 +30,24 @@ class OrderSignal:
     first_order_price: float | None
     from_base_pts: float
     from_first_pts: float | None
+    legs: tuple = ()  # netted order: ((reason, signed qty), ...) of the signals it replaced
+    tick_ns: int = 0     # recv_ns of the tick behind the price the signal was computed from
+    signal_ns: int = 0   # engine emitted it
 
-@dataclass
+@dataclass(slots=True)
 class OrderApproved:
     ts_ns: int
     symbol: str
     side: str
     qty: int
     reason: str
+    legs: tuple = ()
+    tick_ns: int = 0
+    signal_ns: int = 0
+    approve_ns: int = 0  # risk gate approved it
+    send_ns: int = 0     # OMS dispatched it
 
-@dataclass
+@dataclass(slots=True)
 class Execution:
     ts_ns: int
     symbol: str
@@ -38,3 +56,141 @@ class Execution:
     price: float
     status: str = "filled"
     reason: str = ""
+    legs: tuple = ()
+    tick_ns: int = 0
+    signal_ns: int = 0
+    approve_ns: int = 0
+    send_ns: int = 0
+    fill_ns: int = 0     # fill reported (OMS / order tracker / sim fill model)
+
+
+def _frozen_variant(cls):
+    spec = []
+    for f in fields(cls):
+        spec.append((f.name, f.type) if f.default is MISSING else (f.name, f.type, field(default=f.default)))
+    frozen = make_dataclass("Frozen" + cls.__name__, spec, frozen=True, slots=True)
+    frozen.__module__ = __name__  # so the variants pickle by reference
+    return frozen
+
+
+FrozenTick = _frozen_variant(Tick)
+FrozenOrderSignal = _frozen_variant(OrderSignal)
+FrozenOrderApproved = _frozen_variant(OrderApproved)
+FrozenExecution = _frozen_variant(Execution)
+_FROZEN = {Tick: FrozenTick, OrderSignal: FrozenOrderSignal,
+           OrderApproved: FrozenOrderApproved, Execution: FrozenExecution}
+
+
+def freeze(ev):
+    """Immutable copy of a mutable event (returns frozen events unchanged)."""
+    cls = _FROZEN.get(type(ev))
+    if cls is None:
+        return ev
+    return cls(*(getattr(ev, f.name) for f in fields(ev)))
+
+
+class TickBatch:
+    """Columnar block of ticks for one symbol: ``ts_ns`` int64, ``price`` float64, ``size`` int64.
+
+    Used on bulk paths (CSV replay, recording, batch backtests) in place of a list of ``Tick``
+    objects — 24 bytes per tick and no per-tick allocation. Indexing with an int materialises
+    a ``Tick``; slices and ``between`` return views.
+    """
+
+    __slots__ = ("symbol", "ts_ns", "price", "size")
+
+    def __init__(self, symbol: str, ts_ns, price, size=None):
+        self.symbol = symbol
+        self.ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.size = (np.zeros(len(self.ts_ns), dtype=np.int64) if size is None
+                     else np.asarray(size, dtype=np.int64))
+        if not (len(self.ts_ns) == len(self.price) == len(self.size)):
+            raise ValueError("TickBatch columns must have equal length")
+
+    @classmethod
+    def from_ticks(cls, ticks, symbol: Optional[str] = None) -> "TickBatch":
+        b = TickBatchBuilder(symbol)
+        for t in ticks:
+            b.append_tick(t)
+        return b.build()
+
+    @classmethod
+    def concat(cls, batches) -> "TickBatch":
+        batches = list(batches)
+        if not batches:
+            raise ValueError("concat needs at least one batch")
+        return cls(batches[0].symbol,
+                   np.concatenate([b.ts_ns for b in batches]),
+                   np.concatenate([b.price for b in batches]),
+                   np.concatenate([b.size for b in batches]))
+
+    def __len__(self) -> int:
+        return len(self.ts_ns)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return TickBatch(self.symbol, self.ts_ns[k], self.price[k], self.size[k])
+        return Tick(ts_ns=int(self.ts_ns[k]), symbol=self.symbol,
+                    price=float(self.price[k]), size=int(self.size[k]))
+
+    def ticks(self):
+        """Iterate as ``Tick`` objects (for feeding queues)."""
+        sym = self.symbol
+        for ts, px, sz in zip(self.ts_ns.tolist(), self.price.tolist(), self.size.tolist()):
+            yield Tick(ts_ns=ts, symbol=sym, price=px, size=sz)
+
+    def sorted(self) -> "TickBatch":
+        if len(self) < 2 or bool(np.all(self.ts_ns[1:] >= self.ts_ns[:-1])):
+            return self
+        order = np.argsort(self.ts_ns, kind="stable")
+        return TickBatch(self.symbol, self.ts_ns[order], self.price[order], self.size[order])
+
+    def between(self, start_ns: int, end_ns: int) -> "TickBatch":
+        """Ticks with start_ns <= ts < end_ns (batch must be time-sorted)."""
+        lo, hi = np.searchsorted(self.ts_ns, [start_ns, end_ns], side="left")
+        return self[int(lo):int(hi)]
+
+    @property
+    def nbytes(self) -> int:
+        return self.ts_ns.nbytes + self.price.nbytes + self.size.nbytes
+
+    def __repr__(self) -> str:
+        return f"TickBatch({self.symbol!r}, n={len(self)})"
+
+
+class TickBatchBuilder:
+    """Append-only ``array``-backed accumulator that turns into a ``TickBatch``."""
+
+    __slots__ = ("symbol", "_ts", "_px", "_sz")
+
+    def __init__(self, symbol: Optional[str] = None):
+        self.symbol = symbol
+        self._ts = array("q")
+        self._px = array("d")
+        self._sz = array("q")
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def append(self, ts_ns: int, price: float, size: int = 0):
+        self._ts.append(ts_ns)
+        self._px.append(price)
+        self._sz.append(size)
+
+    def append_tick(self, t: Tick):
+        if self.symbol is None:
+            self.symbol = t.symbol
+        self.append(t.ts_ns, t.price, t.size)
+
+    def build(self, clear: bool = True) -> TickBatch:
+        # copy out of the arrays so the builder can keep growing / be reused
+        batch = TickBatch(self.symbol or "",
+                          np.frombuffer(self._ts, dtype=np.int64).copy(),
+                          np.frombuffer(self._px, dtype=np.float64).copy(),
+                          np.frombuffer(self._sz, dtype=np.int64).copy())
+        if clear:
+            self._ts = array("q")
+            self._px = array("d")
+            self._sz = array("q")
+        return batch
@@ -0,0 +1,211 @@
+# fill_model.py — simulated execution: latency, spread, size impact, partial fills, rejects
+"""
+Sim-mode OMSRouter, backtest.py and batch_backtest / sweep fill orders through a
+``FillModel`` instead of "instantly at the last price"::
+
+    model = make_fill_model()                      # FILL_MODEL=instant | impact
+    async for e in model.execute(appr, lambda: engine.last_price, clock.sleep):
+        await exec_q.put(e)                        # one Execution per clip
+    px = model.avg_prices(side, qty, ref)          # numpy, whole signal streams at once
+
+``FillModel`` is the old behaviour (no latency, no cost, one fill) and the base for other
+models. ``ImpactFill`` charges, relative to the price when the order reaches the market
+(``FILL_LATENCY_MS`` median, lognormal with ``FILL_LATENCY_SIGMA``):
+
+- half the spread: the last spread ``observe_quote`` saw for the symbol (the feeds report
+  every quote: alpaca_adapter on the quotes channel, sim_feed's synthetic ``SIM_SPREAD``),
+  else ``FILL_SPREAD_PTS``; batch runs can pass a spread per order instead
+- impact ``FILL_IMPACT_PTS * (q / FILL_IMPACT_QTY) ** FILL_IMPACT_EXP`` points at
+  cumulative quantity ``q`` (square-root law by default), so 5000 lots cost more per
+  share than 10
+- orders above ``FILL_CLIP_QTY`` fill in clips ``FILL_CLIP_MS`` apart, each clip at the
+  impact of the quantity done so far
+- ``FILL_REJECT_RATE`` of orders are rejected (no Execution)
+
+``avg_prices`` gives the volume-weighted price the clips of each order would get, so the
+vectorized and per-order paths agree for the same reference price.
+"""
+import asyncio, math, time
+from typing import Callable, Optional
+
+import numpy as np
+
+from config import SETTINGS, Settings
+from events import Execution
+
+
+class FillModel:
+    """Instant fill of the whole order at the reference price."""
+
+    name = "instant"
+
+    def __init__(self, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.spreads: dict[str, float] = {}
+        self.orders = 0
+        self.rejected = 0
+        self.clips = 0
+        self.cost = 0.0  # sum of |fill - reference| * qty, in price units
+
+    @classmethod
+    def from_settings(cls, settings: Settings = SETTINGS) -> "FillModel":
+        return cls(seed=settings.fill_seed)
+
+    # ---- per-order pieces (override these) ----
+    def observe_quote(self, symbol: str, bid: float, ask: float):
+        if 0 < bid <= ask:
+            self.spreads[symbol] = ask - bid
+
+    def latency_sec(self) -> float:
+        return 0.0
+
+    def rejects(self) -> bool:
+        return False
+
+    def clip_fills(self, symbol: str, side: str, qty: int, ref: float) -> list[tuple[int, float]]:
+        """(qty, price) per clip for an order reaching the market at ``ref``."""
+        return [(qty, ref)]
+
+    # ---- vectorized (backtests / sweeps) ----
+    def latency_ns(self, n: int) -> np.ndarray:
+        return np.zeros(n, dtype=np.int64)
+
+    def reject_mask(self, n: int) -> np.ndarray:
+        return np.zeros(n, dtype=bool)
+
+    def avg_prices(self, sign: np.ndarray, qty: np.ndarray, ref: np.ndarray,
+                   spread: Optional[np.ndarray] = None, symbol: Optional[str] = None) -> np.ndarray:
+        """Average fill price per order; ``sign`` is +1 buy / -1 sell. ``spread`` (per order)
+        overrides the quoted spread of ``symbol``."""
+        return np.asarray(ref, dtype=np.float64)
+
+    # ---- order lifecycle ----
+    def clip_gap_sec(self) -> float:
+        return 0.0
+
+    async def execute(self, appr, price: Callable[[], Optional[float]], sleep=asyncio.sleep,
+                      now_ns: Callable[[], int] = time.time_ns):
+        """Yield the Executions for ``appr``: wait out the latency, then fill clip by clip."""
+        self.orders += 1
+        if self.rejects():
+            self.rejected += 1
+            print(f"[SIM-FILL] {appr.side} {appr.qty} {appr.symbol} rejected (reason: {appr.reason})")
+            return
+        lat = self.latency_sec()
+        if lat > 0:
+            await sleep(lat)
+        ref = price()
+        if ref is None:
+            return
+        clips = self.clip_fills(appr.symbol, appr.side, appr.qty, ref)
+        done = 0
+        for k, (q, px) in enumerate(clips):
+            if k and self.clip_gap_sec() > 0:
+                await sleep(self.clip_gap_sec())
+            done += q
+            self.clips += 1
+            self.cost += abs(px - ref) * q
+            yield Execution(ts_ns=appr.ts_ns if lat == 0 and k == 0 else now_ns(), symbol=appr.symbol,
+                            side=appr.side, qty=q, price=px,
+                            status="filled" if done >= appr.qty else "partially_filled",
+                            reason=appr.reason, legs=appr.legs)
+
+    def format_metrics(self) -> str:
+        return (f"model={self.name} orders={self.orders} rejected={self.rejected} clips={self.clips} "
+                f"cost={self.cost:.2f}")
+
+
+class ImpactFill(FillModel):
+    """Latency, half-spread and concave size impact, with clipped partial fills and rejects."""
+
+    name = "impact"
+
+    def __init__(self, latency_ms: float = 50.0, latency_sigma: float = 0.5, spread_pts: float = 0.02,
+                 impact_pts: float = 0.02, impact_qty: float = 1000.0, impact_exp: float = 0.5,
+                 clip_qty: int = 0, clip_ms: float = 0.0, reject_rate: float = 0.0, seed: int = 0):
+        super().__init__(seed)
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.spread_pts = spread_pts
+        self.impact_pts = impact_pts
+        self.impact_qty = impact_qty
+        self.impact_exp = impact_exp
+        self.clip_qty = clip_qty
+        self.clip_ms = clip_ms
+        self.reject_rate = reject_rate
+
+    @classmethod
+    def from_settings(cls, settings: Settings = SETTINGS) -> "ImpactFill":
+        s = settings
+        return cls(latency_ms=s.fill_latency_ms, latency_sigma=s.fill_latency_sigma, spread_pts=s.fill_spread_pts,
+                   impact_pts=s.fill_impact_pts, impact_qty=s.fill_impact_qty, impact_exp=s.fill_impact_exp,
+                   clip_qty=s.fill_clip_qty, clip_ms=s.fill_clip_ms, reject_rate=s.fill_reject_rate,
+                   seed=s.fill_seed)
+
+    def impact(self, q: float) -> float:
+        return self.impact_pts * (q / self.impact_qty) ** self.impact_exp if q > 0 else 0.0
+
+    def latency_sec(self) -> float:
+        if self.latency_ms <= 0:
+            return 0.0
+        return self.latency_ms / 1000.0 * math.exp(self.latency_sigma * self.rng.standard_normal())
+
+    def rejects(self) -> bool:
+        return self.reject_rate > 0 and self.rng.random() < self.reject_rate
+
+    def clip_gap_sec(self) -> float:
+        return self.clip_ms / 1000.0
+
+    def spread(self, symbol: Optional[str]) -> float:
+        """Last quoted spread of ``symbol``, else ``spread_pts``."""
+        return self.spreads.get(symbol, self.spread_pts)
+
+    def clip_fills(self, symbol: str, side: str, qty: int, ref: float) -> list[tuple[int, float]]:
+        sign = 1.0 if side.upper() == "BUY" else -1.0
+        half = self.spread(symbol) / 2.0
+        clip = self.clip_qty if 0 < self.clip_qty < qty else qty
+        out, done = [], 0
+        while done < qty:
+            q = min(clip, qty - done)
+            done += q
+            out.append((q, round(ref + sign * (half + self.impact(done)), 4)))
+        return out
+
+    def latency_ns(self, n: int) -> np.ndarray:
+        if self.latency_ms <= 0:
+            return np.zeros(n, dtype=np.int64)
+        lat = self.latency_ms * 1e6 * np.exp(self.latency_sigma * self.rng.standard_normal(n))
+        return lat.astype(np.int64)
+
+    def reject_mask(self, n: int) -> np.ndarray:
+        if self.reject_rate <= 0:
+            return np.zeros(n, dtype=bool)
+        return self.rng.random(n) < self.reject_rate
+
+    def avg_prices(self, sign, qty, ref, spread=None, symbol=None) -> np.ndarray:
+        sign = np.asarray(sign, dtype=np.float64)
+        qty = np.asarray(qty, dtype=np.float64)
+        half = (self.spread(symbol) if spread is None else np.asarray(spread, dtype=np.float64)) / 2.0
+        if self.clip_qty > 0 and len(qty) and qty.max() > self.clip_qty:
+            # sum over clips of clip_qty * impact(cumulative qty), one pass per clip index
+            clip = float(self.clip_qty)
+            cost = np.zeros(len(qty))
+            for k in range(1, int(math.ceil(qty.max() / clip)) + 1):
+                done = np.minimum(k * clip, qty)
+                q = done - np.minimum((k - 1) * clip, qty)
+                cost += q * self.impact_pts * (done / self.impact_qty) ** self.impact_exp
+            imp = np.divide(cost, qty, out=np.zeros(len(qty)), where=qty > 0)
+        else:
+            imp = self.impact_pts * (qty / self.impact_qty) ** self.impact_exp
+        return np.round(np.asarray(ref, dtype=np.float64) + sign * (half + imp), 4)
+
+
+FILL_MODELS = {"instant": FillModel, "impact": ImpactFill}
+
+
+def make_fill_model(settings: Settings = SETTINGS) -> FillModel:
+    try:
+        cls = FILL_MODELS[settings.fill_model.lower()]
+    except KeyError:
+        raise ValueError(f"FILL_MODEL must be one of {', '.join(FILL_MODELS)}, got {settings.fill_model!r}")
+    return cls.from_settings(settings)
@@ -0,0 +1,209 @@
+# journal.py — batched background-thread writer for trade logs, CSVs and state snapshots
+"""
+Event-loop code never touches the disk directly: ``append``/``append_csv``/``replace`` only
+take a lock and stash the record, a daemon thread writes everything that accumulated in one
+pass every ``journal_flush_ms`` (or sooner when ``max_batch`` records are waiting or a
+``commit=True`` record arrives).
+
+fsync policy (``JOURNAL_FSYNC``):
+  none    leave durability to the OS page cache
+  commit  fsync files that received a commit record (fills) — one fsync per batch covers
+          every fill that arrived while the previous batch was being written (group commit)
+  always  fsync after every batch
+
+``replace`` is latest-value: only the newest payload per path is written, via tmp file +
+``os.replace`` so readers never see a half-written state file.
+"""
+import asyncio, atexit, csv, io, os, pathlib, threading, time
+from typing import Optional
+
+from config import SETTINGS
+
+FSYNC_POLICIES = ("none", "commit", "always")
+
+
+class Journal:
+    def __init__(self, flush_ms: Optional[float] = None, fsync: Optional[str] = None, max_batch: int = 512):
+        self.flush_interval = (SETTINGS.journal_flush_ms if flush_ms is None else flush_ms) / 1000.0
+        self.fsync = (fsync or SETTINGS.journal_fsync).lower()
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"unknown fsync policy {self.fsync!r}; expected one of {FSYNC_POLICIES}")
+        self.max_batch = max_batch
+        self._cv = threading.Condition()
+        self._appends: dict[pathlib.Path, list[str]] = {}
+        self._headers: dict[pathlib.Path, str] = {}
+        self._replaces: dict[pathlib.Path, str] = {}
+        self._commit_paths: set[pathlib.Path] = set()
+        self._pending = 0
+        self._force = False
+        self._seq = 0    # records accepted
+        self._done = 0   # records written (or failed) by the writer thread
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._files: dict[pathlib.Path, tuple] = {}  # path -> (file, inode); writer thread only
+        self.batches = 0
+        self.records = 0
+        self.fsyncs = 0
+        self.errors = 0
+        self.max_batch_ms = 0.0
+
+    # ---- producer side (any thread, never blocks on I/O) -------------------------------
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _accept(self, commit: bool) -> int:
+        self._seq += 1
+        self._pending += 1
+        if commit or self._pending >= self.max_batch:
+            self._cv.notify()
+        return self._seq
+
+    def append(self, path, line: str, commit: bool = False, header: Optional[str] = None) -> int:
+        """Queue one line for ``path``; ``header`` is written first if the file is new/empty."""
+        path = pathlib.Path(path)
+        if not line.endswith("\n"):
+            line += "\n"
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("journal is closed")
+            self._ensure_thread()
+            self._appends.setdefault(path, []).append(line)
+            if header is not None and path not in self._headers:
+                self._headers[path] = header if header.endswith("\n") else header + "\n"
+            if commit:
+                self._commit_paths.add(path)
+            return self._accept(commit)
+
+    def append_csv(self, path, row, header=None, commit: bool = False) -> int:
+        buf = io.StringIO()
+        w = csv.writer(buf)
+        w.writerow(row)
+        line = buf.getvalue()
+        if header is not None:
+            buf.seek(0); buf.truncate()
+            w.writerow(header)
+            header = buf.getvalue()
+        return self.append(path, line, commit=commit, header=header)
+
+    def replace(self, path, text: str) -> int:
+        """Atomically replace ``path`` with ``text`` (coalesced: last write per batch wins)."""
+        path = pathlib.Path(path)
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("journal is closed")
+            self._ensure_thread()
+            self._replaces[path] = text
+            return self._accept(False)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is written; returns False on timeout."""
+        with self._cv:
+            if self._thread is None:
+                return True
+            target = self._seq
+            self._force = True
+            self._cv.notify_all()
+            return self._cv.wait_for(lambda: self._done >= target, timeout)
+
+    async def aflush(self, timeout: Optional[float] = None) -> bool:
+        return await asyncio.to_thread(self.flush, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush, stop the writer thread and close file handles (idempotent)."""
+        with self._cv:
+            if self._closed:
+                return
+            self._closed = True
+            self._cv.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {"pending": self._pending, "batches": self.batches, "records": self.records,
+                "fsyncs": self.fsyncs, "errors": self.errors, "max_batch_ms": round(self.max_batch_ms, 3)}
+
+    # ---- writer thread -----------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            with self._cv:
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._closed or self._force or self._commit_paths or self._pending >= self.max_batch):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cv.wait(remaining)
+                appends, self._appends = self._appends, {}
+                headers, self._headers = self._headers, {}
+                replaces, self._replaces = self._replaces, {}
+                commits, self._commit_paths = self._commit_paths, set()
+                n, self._pending = self._pending, 0
+                target, closing = self._seq, self._closed
+                self._force = False
+            if n:
+                t0 = time.perf_counter()
+                self._write(appends, headers, replaces, commits)
+                self.max_batch_ms = max(self.max_batch_ms, (time.perf_counter() - t0) * 1e3)
+                self.batches += 1
+                self.records += n
+            with self._cv:
+                self._done = target
+                self._cv.notify_all()
+                if closing and not self._pending:
+                    break
+        for f, _ in self._files.values():
+            try:
+                f.close()
+            except OSError:
+                pass
+        self._files.clear()
+
+    def _handle(self, path: pathlib.Path):
+        cached = self._files.get(path)
+        if cached is not None:
+            try:  # file rotated/archived underneath us -> reopen at the original path
+                if os.stat(path).st_ino == cached[1]:
+                    return cached[0]
+            except FileNotFoundError:
+                pass
+            cached[0].close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(path, "a", newline="")
+        self._files[path] = (f, os.fstat(f.fileno()).st_ino)
+        return f
+
+    def _write(self, appends, headers, replaces, commits):
+        for path, lines in appends.items():
+            try:
+                f = self._handle(path)
+                if path in headers and f.tell() == 0:
+                    f.write(headers[path])
+                f.write("".join(lines))
+                f.flush()
+                if self.fsync == "always" or (self.fsync == "commit" and path in commits):
+                    os.fsync(f.fileno())
+                    self.fsyncs += 1
+            except OSError as ex:
+                self.errors += 1
+                print(f"[WARN] journal append to {path} failed: {ex}")
+        for path, text in replaces.items():
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "w") as f:
+                    f.write(text)
+                    if self.fsync == "always":
+                        f.flush()
+                        os.fsync(f.fileno())
+                        self.fsyncs += 1
+                os.replace(tmp, path)
+            except OSError as ex:
+                self.errors += 1
+                print(f"[WARN] journal replace of {path} failed: {ex}")
+
+
+JOURNAL = Journal()
@@ -0,0 +1,114 @@
+# latency.py — fixed-memory latency histogram (log-spaced buckets) for order round trips
+"""
+``LatencyHistogram`` keeps counts in log-spaced buckets (~5% wide, 1µs .. ~100s), so
+recording is O(1), memory is fixed no matter how many orders a session sends, and
+percentiles are accurate to a bucket width::
+
+    h = LatencyHistogram()
+    h.record(time.perf_counter_ns() - t0)
+    h.format()   # "n=42 mean=3.10ms p50=2.87ms p90=4.02ms p99=9.75ms max=10.12ms"
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+MIN_NS = 1_000          # everything below 1µs lands in bucket 0
+GROWTH = 1.05           # bucket upper bound ratio
+_LOG_GROWTH = math.log(GROWTH)
+N_BUCKETS = int(math.log(100e9 / MIN_NS) / _LOG_GROWTH) + 1
+
+
+class LatencyHistogram:
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.counts = [0] * N_BUCKETS
+        self.n = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.min_ns: Optional[int] = None
+
+    @staticmethod
+    def bucket(ns: int) -> int:
+        if ns <= MIN_NS:
+            return 0
+        return min(int(math.log(ns / MIN_NS) / _LOG_GROWTH) + 1, N_BUCKETS - 1)
+
+    @staticmethod
+    def upper_ns(i: int) -> float:
+        """Upper bound of bucket ``i``."""
+        return MIN_NS * GROWTH ** i
+
+    def record(self, ns: int):
+        self.counts[self.bucket(ns)] += 1
+        self.n += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+
+    def record_many(self, ns):
+        """Record a batch of samples (any int sequence / array) in one vectorized pass."""
+        a = np.asarray(ns, dtype=np.int64)
+        if not len(a):
+            return
+        idx = np.zeros(len(a), dtype=np.int64)
+        big = a > MIN_NS
+        idx[big] = np.minimum((np.log(a[big] / MIN_NS) / _LOG_GROWTH).astype(np.int64) + 1, N_BUCKETS - 1)
+        for i, c in zip(*np.unique(idx, return_counts=True)):
+            self.counts[int(i)] += int(c)
+        self.n += len(a)
+        self.total_ns += int(a.sum())
+        self.max_ns = max(self.max_ns, int(a.max()))
+        lo = int(a.min())
+        if self.min_ns is None or lo < self.min_ns:
+            self.min_ns = lo
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.n += other.n
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+
+    def reset(self):
+        self.__init__(self.name)
+
+    def percentile(self, p: float) -> float:
+        """``p``-th percentile (0..100) in ns, reported as its bucket's upper bound (capped at max)."""
+        if not self.n:
+            return 0.0
+        rank = max(1, math.ceil(self.n * p / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self.upper_ns(i), float(self.max_ns))
+        return float(self.max_ns)
+
+    def summary(self) -> dict:
+        """Milliseconds: n, mean, min, p50, p90, p99, max."""
+        ms = 1e6
+        return {
+            "n": self.n,
+            "mean": self.total_ns / self.n / ms if self.n else 0.0,
+            "min": (self.min_ns or 0) / ms,
+            "p50": self.percentile(50) / ms,
+            "p90": self.percentile(90) / ms,
+            "p99": self.percentile(99) / ms,
+            "max": self.max_ns / ms,
+        }
+
+    def format(self) -> str:
+        s = self.summary()
+        if not s["n"]:
+            return "n=0"
+        return (f"n={s['n']} mean={s['mean']:.2f}ms p50={s['p50']:.2f}ms p90={s['p90']:.2f}ms "
+                f"p99={s['p99']:.2f}ms max={s['max']:.2f}ms")
+
+    def buckets(self) -> list[tuple[float, int]]:
+        """Non-empty ``(upper_ms, count)`` pairs, fastest first."""
+        return [(self.upper_ns(i) / 1e6, c) for i, c in enumerate(self.counts) if c]
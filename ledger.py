@@ -0,0 +1,233 @@
+# ledger.py — incremental multi-symbol position / avg-cost / PnL book with checkpoints
+"""
+``Ledger`` applies fills one at a time (the avg-cost rules ``RiskGate`` has always used) and
+keeps per-symbol position, average entry, realized PnL and per-trigger attribution. The
+engine's ``RiskGate`` owns one; readers of ``runtime/trades.jsonl`` (dashboards,
+status_monitor, reset_trading) use a ``LedgerFollower``, which resumes from
+``runtime/ledger.ckpt.json`` (books + byte offset + inode of the trade log) and only applies
+the fills appended since, instead of replaying the whole log on every refresh.
+
+Realized PnL is attributed to the trigger (``reason``) of the fill that closed the exposure.
+A netted fill (``legs``, see netting.py) moves the position once, at its net quantity. Its
+quantity and realized PnL are split pro rata between the legs on the side that actually
+traded, so the legs' quantities add up to the fill's; legs crossed internally are credited
+nothing.
+"""
+import json, os, pathlib, threading, time
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+from tail_reader import TailReader
+
+CHECKPOINT_NAME = "ledger.ckpt.json"
+_HEAD_BYTES = 64  # start of the trade log, guards against inode reuse after an archive
+
+
+@dataclass
+class TriggerStats:
+    fills: int = 0
+    qty: int = 0
+    realized: float = 0.0
+
+
+@dataclass
+class Book:
+    symbol: str
+    position: int = 0
+    avg_price: float = 0.0  # average entry of the open position
+    realized: float = 0.0
+    fills: int = 0
+    last_price: Optional[float] = None
+    by_trigger: dict[str, TriggerStats] = field(default_factory=dict)
+
+    def apply(self, side: str, qty: int, price: float, reason: str = "", legs=()) -> float:
+        """Apply one fill; returns the PnL it realized."""
+        if price is None:
+            price = 0.0
+        delta = qty if side == "BUY" else -qty
+        pos = self.position
+        realized = 0.0
+        if pos == 0 or (pos > 0 and delta > 0) or (pos < 0 and delta < 0):
+            # increasing exposure in the same direction: weighted average entry
+            abs_pos = abs(pos)
+            self.avg_price = (self.avg_price * abs_pos + price * abs(delta)) / (abs_pos + abs(delta)) if abs_pos > 0 else price
+        else:
+            # reducing or flipping: realize PnL on the closed shares
+            close_qty = min(abs(qty), abs(pos))
+            realized = (price - self.avg_price) * close_qty if pos > 0 else (self.avg_price - price) * close_qty
+            self.realized += realized
+            if abs(delta) > abs(pos):
+                self.avg_price = price  # flipped; remainder entered at the fill price
+        self.position = pos + delta
+        self.fills += 1
+        if legs:
+            self._attribute_legs(legs, qty, delta, realized)
+            return realized
+        t = self._trigger(reason)
+        t.fills += 1
+        t.qty += qty
+        t.realized += realized
+        return realized
+
+    def _trigger(self, reason: str) -> TriggerStats:
+        t = self.by_trigger.get(reason)
+        if t is None:
+            t = self.by_trigger[reason] = TriggerStats()
+        return t
+
+    def _attribute_legs(self, legs, qty: int, delta: int, realized: float):
+        side = [(reason, abs(q)) for reason, q in legs if q and (q > 0) == (delta > 0)]
+        traded = sum(q for _, q in side)
+        if not traded:
+            return
+        # largest remainder, so the legs' shares of this (partial) fill sum to its qty
+        exact = [qty * q / traded for _, q in side]
+        shares = [int(x) for x in exact]
+        for i in sorted(range(len(side)), key=lambda i: shares[i] - exact[i])[:qty - sum(shares)]:
+            shares[i] += 1
+        for (reason, q), share in zip(side, shares):
+            t = self._trigger(reason)
+            t.fills += 1
+            t.qty += share
+            t.realized += realized * q / traded
+
+    def unrealized(self, last_price: Optional[float] = None) -> float:
+        px = self.last_price if last_price is None else last_price
+        if px is None or self.position == 0:
+            return 0.0
+        if self.position > 0:
+            return (px - self.avg_price) * self.position
+        return (self.avg_price - px) * abs(self.position)
+
+    def pnl(self, last_price: Optional[float] = None) -> float:
+        return self.realized + self.unrealized(last_price)
+
+
+class Ledger:
+    def __init__(self, default_symbol: str = ""):
+        self.default_symbol = default_symbol
+        self.books: dict[str, Book] = {}
+
+    def book(self, symbol: Optional[str] = None) -> Book:
+        sym = symbol or self.default_symbol
+        b = self.books.get(sym)
+        if b is None:
+            b = self.books[sym] = Book(sym)
+        return b
+
+    def apply(self, side: str, qty: int, price: float, reason: str = "", symbol: Optional[str] = None,
+              legs=()) -> float:
+        return self.book(symbol).apply(side, qty, price, reason, legs)
+
+    def apply_record(self, rec: dict) -> float:
+        """Apply one trades.jsonl record ({"side","qty","price","symbol","reason",...})."""
+        side = rec.get("side")
+        if side not in ("BUY", "SELL"):
+            return 0.0
+        legs = tuple((r, int(q)) for r, q in rec.get("legs") or ())
+        return self.apply(side, int(rec.get("qty") or 0), rec.get("price"), rec.get("reason") or "", rec.get("symbol"), legs)
+
+    def mark(self, price: Optional[float], symbol: Optional[str] = None):
+        self.book(symbol).last_price = price if isinstance(price, (int, float)) else None
+
+    def reset_realized(self, symbol: Optional[str] = None):
+        """Start a fresh PnL day: realized and its attribution go to zero, positions stay."""
+        for b in ([self.book(symbol)] if symbol else self.books.values()):
+            b.realized = 0.0
+            for t in b.by_trigger.values():
+                t.realized = 0.0
+
+    def total_position(self) -> int:
+        return sum(b.position for b in self.books.values())
+
+    def total_realized(self) -> float:
+        return sum(b.realized for b in self.books.values())
+
+    def total_pnl(self, marks: Optional[dict] = None) -> float:
+        marks = marks or {}
+        return sum(b.pnl(marks.get(s)) for s, b in self.books.items())
+
+    def to_dict(self) -> dict:
+        return {"default_symbol": self.default_symbol, "books": {s: asdict(b) for s, b in self.books.items()}}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Ledger":
+        led = cls(d.get("default_symbol", ""))
+        for s, b in d.get("books", {}).items():
+            trig = {k: TriggerStats(**v) for k, v in b.pop("by_trigger", {}).items()}
+            led.books[s] = Book(**b, by_trigger=trig)
+        return led
+
+
+class LedgerFollower:
+    """Keeps a ``Ledger`` in sync with an append-only trade log, resuming from a checkpoint."""
+
+    def __init__(self, trades_path="runtime/trades.jsonl", checkpoint_path=None,
+                 checkpoint_every: float = 5.0):
+        self.trades_path = pathlib.Path(trades_path)
+        self.checkpoint_path = pathlib.Path(checkpoint_path or self.trades_path.with_name(CHECKPOINT_NAME))
+        self.checkpoint_every = checkpoint_every
+        self.reader = TailReader(self.trades_path, parse=json.loads, max_records=0)  # apply, don't retain
+        self.ledger = Ledger()
+        self._head = b""
+        self._dirty = False
+        self._last_ckpt = 0.0
+        self._lock = threading.Lock()  # dashboards share one follower across sessions
+        self._resume()
+
+    def _read_head(self) -> bytes:
+        try:
+            with open(self.trades_path, "rb") as f:
+                return f.read(_HEAD_BYTES)
+        except OSError:
+            return b""
+
+    def _resume(self):
+        try:
+            ck = json.loads(self.checkpoint_path.read_text())
+            st = os.stat(self.trades_path)
+        except (OSError, ValueError):
+            return
+        head = self._read_head()
+        if (ck.get("inode") != st.st_ino or ck.get("offset", 0) > st.st_size
+                or ck.get("head") != head[:len(ck.get("head", ""))].decode("utf-8", "replace")):
+            return  # different/rewritten log: replay it from the top
+        self.ledger = Ledger.from_dict(ck["ledger"])
+        self.reader.offset, self.reader.inode = ck["offset"], st.st_ino
+        self._head = head
+
+    def poll(self) -> Ledger:
+        """Apply fills appended since the last poll (resetting if the log was archived)."""
+        with self._lock:
+            return self._poll()
+
+    def _poll(self) -> Ledger:
+        rotations = self.reader.rotations
+        new = self.reader.poll()
+        if self.reader.rotations != rotations:
+            self.ledger = Ledger()  # log archived/truncated: its replacement starts a new book
+            self._head = b""
+            self._dirty = True
+        for rec in new:
+            self.ledger.apply_record(rec)
+        if new:
+            self._dirty = True
+            if not self._head:
+                self._head = self._read_head()
+        if self._dirty and time.monotonic() - self._last_ckpt >= self.checkpoint_every:
+            self.checkpoint()
+        return self.ledger
+
+    def checkpoint(self):
+        """Atomically write books + log offset so the next reader can resume here."""
+        ck = {"offset": self.reader.offset, "inode": self.reader.inode,
+              "head": self._head.decode("utf-8", "replace"), "ts": time.time(),
+              "ledger": self.ledger.to_dict()}
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(ck))
+            os.replace(tmp, self.checkpoint_path)
+        except OSError:
+            return
+        self._dirty = False
+        self._last_ckpt = time.monotonic()
@@ -0,0 +1,288 @@
+# live_state.py — fixed-layout, memory-mapped live engine state with seqlock reads
+"""
+One file (``runtime/live_state.bin``) holds a slot per symbol. The engine publishes into its
+slot on every change (tick, beat, fill, mode switch); readers on the same host (dashboards,
+status_monitor, reset_trading) map the file and copy a slot out without any JSON parsing.
+
+Layout (little-endian):
+  header  64 bytes   magic "TTLS", version, slot size, slot count
+  slot   128 bytes   seq (u64) + fixed body (see ``_BODY``)
+
+Seqlock: a single writer per slot bumps ``seq`` to odd, writes the body, bumps it to even.
+A reader copies the body between two reads of ``seq`` and retries if they differ or are odd,
+so it never returns a torn mix of two publishes. ``None`` prices are stored as NaN.
+
+Slots outlive their engines. ``read_state``/``read_all_states`` skip a slot whose writer
+``pid`` is gone or that has not been published for ``LIVE_STATE_MAX_AGE_SEC``, and a new
+engine reuses a dead slot once the file is full.
+"""
+import json, math, mmap, os, pathlib, struct, time
+from typing import Optional
+
+from config import SETTINGS
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: slot claiming is unlocked
+    fcntl = None
+
+MAGIC = b"TTLS"
+VERSION = 1
+DEFAULT_SLOTS = 64
+DEFAULT_PATH = pathlib.Path("runtime/live_state.bin")
+
+_HEADER = struct.Struct("<4sHHI")
+_HEADER_SIZE = 64
+_SEQ = struct.Struct("<Q")
+# symbol, phase, mode, cycles, pid, last_price, base_price, first_order_price,
+# position, realized, pnl, last_tick_ns, updated_ns
+_BODY = struct.Struct("<16s16s8siidddqddqq")
+SLOT_SIZE = 128
+assert _SEQ.size + _BODY.size <= SLOT_SIZE
+
+FIELDS = ("symbol", "phase", "mode", "cycles", "pid", "last_price", "base_price",
+          "first_order_price", "position", "realized", "pnl", "last_tick_ns", "updated_ns")
+_TEXT = {"symbol": 16, "phase": 16, "mode": 8}
+_PRICES = ("last_price", "base_price", "first_order_price")
+_MAX_RETRIES = 10_000
+
+
+def _pack_text(s, width: int) -> bytes:
+    return (s or "").encode("ascii", "replace")[:width]
+
+
+def _unpack_text(b: bytes) -> str:
+    return b.rstrip(b"\0").decode("ascii", "replace")
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0 or os.name != "posix":  # os.kill(pid, 0) terminates the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by another user
+    return True
+
+
+def is_live(rec: dict, max_age_sec: float, now_ns: Optional[int] = None) -> bool:
+    """Writer still running and (if ``max_age_sec`` > 0) published within ``max_age_sec``."""
+    if max_age_sec > 0:
+        now_ns = time.time_ns() if now_ns is None else now_ns
+        if now_ns - rec["updated_ns"] > max_age_sec * 1e9:
+            return False
+    return _pid_alive(rec["pid"])
+
+
+class LiveSlot:
+    """Writer handle for one symbol's slot; keeps a local copy and republishes it whole."""
+
+    def __init__(self, region: "LiveState", index: int, symbol: str):
+        self.region = region
+        self.index = index
+        self.offset = _HEADER_SIZE + index * SLOT_SIZE
+        self.values = {"symbol": symbol, "phase": "", "mode": "", "cycles": 0, "pid": os.getpid(),
+                       "last_price": None, "base_price": None, "first_order_price": None,
+                       "position": 0, "realized": 0.0, "pnl": 0.0, "last_tick_ns": 0, "updated_ns": 0}
+        self.seq = _SEQ.unpack_from(region.mm, self.offset)[0] & ~1
+        self.publishes = 0
+
+    def update(self, **fields):
+        """Merge ``fields`` into the slot and publish it."""
+        self.values.update(fields)
+        self.publish()
+
+    def publish(self):
+        v = self.values
+        v["updated_ns"] = time.time_ns()
+        body = _BODY.pack(
+            _pack_text(v["symbol"], 16), _pack_text(v["phase"], 16), _pack_text(v["mode"], 8),
+            int(v["cycles"] or 0), v["pid"],
+            *(math.nan if v[k] is None else float(v[k]) for k in _PRICES),
+            int(v["position"] or 0), float(v["realized"] or 0.0), float(v["pnl"] or 0.0),
+            int(v["last_tick_ns"] or 0), v["updated_ns"])
+        mm, off = self.region.mm, self.offset
+        _SEQ.pack_into(mm, off, self.seq + 1)   # odd: write in progress
+        mm[off + _SEQ.size:off + _SEQ.size + _BODY.size] = body
+        self.seq += 2
+        _SEQ.pack_into(mm, off, self.seq)       # even: consistent
+        self.publishes += 1
+
+
+class LiveState:
+    """Mapping of the live state file; ``writable=True`` creates/claims slots."""
+
+    def __init__(self, path=DEFAULT_PATH, slots: int = DEFAULT_SLOTS, writable: bool = False):
+        self.path = pathlib.Path(path)
+        self.writable = writable
+        if writable:
+            self._create(slots)
+        fd = os.open(self.path, os.O_RDWR if writable else os.O_RDONLY)
+        try:
+            st = os.fstat(fd)
+            self.inode = st.st_ino
+            self.mm = mmap.mmap(fd, st.st_size, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        magic, version, slot_size, n = _HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION or slot_size != SLOT_SIZE:
+            self.mm.close()
+            raise ValueError(f"{self.path} is not a v{VERSION} live state file")
+        self.slots = n
+
+    def _create(self, slots: int):
+        size = _HEADER_SIZE + slots * SLOT_SIZE
+        try:
+            with open(self.path, "rb") as f:
+                head = f.read(_HEADER.size)
+            if len(head) == _HEADER.size:
+                magic, version, slot_size, n = _HEADER.unpack(head)
+                if (magic, version, slot_size) == (MAGIC, VERSION, SLOT_SIZE) \
+                        and os.path.getsize(self.path) == _HEADER_SIZE + n * SLOT_SIZE:
+                    return  # keep the existing file: readers may already have it mapped
+        except FileNotFoundError:
+            pass
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, SLOT_SIZE, slots).ljust(_HEADER_SIZE, b"\0"))
+            f.write(b"\0" * (slots * SLOT_SIZE))
+        os.replace(tmp, self.path)
+
+    def close(self):
+        self.mm.close()
+
+    def _symbol_at(self, i: int) -> str:
+        off = _HEADER_SIZE + i * SLOT_SIZE + _SEQ.size
+        return _unpack_text(self.mm[off:off + 16])
+
+    def slot(self, symbol: str) -> LiveSlot:
+        """Writer slot for ``symbol``: its existing slot, else the first free one, else a dead one."""
+        if not self.writable:
+            raise PermissionError("live state opened read-only")
+        with open(self.path, "rb") as lockf:
+            if fcntl is not None:
+                fcntl.flock(lockf, fcntl.LOCK_EX)  # concurrent engines claiming slots
+            names = [self._symbol_at(i) for i in range(self.slots)]
+            if symbol in names:
+                idx = names.index(symbol)
+            elif "" in names:
+                idx = names.index("")
+            else:
+                dead = [i for i in range(self.slots) if (r := self.read_slot(i)) and not _pid_alive(r["pid"])]
+                if not dead:
+                    raise RuntimeError(f"live state full ({self.slots} slots)")
+                idx = dead[0]
+            slot = LiveSlot(self, idx, symbol)
+            slot.publish()  # claims the slot (symbol is written under the lock)
+        return slot
+
+    def read_slot(self, i: int) -> Optional[dict]:
+        """Consistent copy of slot ``i`` (None if unused or the writer never settles)."""
+        off = _HEADER_SIZE + i * SLOT_SIZE
+        mm = self.mm
+        for _ in range(_MAX_RETRIES):
+            s1 = _SEQ.unpack_from(mm, off)[0]
+            if s1 & 1:
+                continue
+            body = mm[off + _SEQ.size:off + _SEQ.size + _BODY.size]
+            if _SEQ.unpack_from(mm, off)[0] == s1:
+                break
+        else:
+            return None
+        if s1 == 0:
+            return None
+        rec = dict(zip(FIELDS, _BODY.unpack(body)))
+        for k in _TEXT:
+            rec[k] = _unpack_text(rec[k])
+        for k in _PRICES:
+            if math.isnan(rec[k]):
+                rec[k] = None
+        return rec
+
+    def read_all(self, max_age_sec: Optional[float] = None) -> list[dict]:
+        """Every used slot; with ``max_age_sec`` only those passing ``is_live``."""
+        now_ns = time.time_ns()
+        return [r for i in range(self.slots) if (r := self.read_slot(i)) is not None
+                and (max_age_sec is None or is_live(r, max_age_sec, now_ns))]
+
+    def read(self, symbol: Optional[str] = None, max_age_sec: Optional[float] = None) -> Optional[dict]:
+        """Slot for ``symbol`` (default: the first used slot), filtered as in ``read_all``."""
+        for i in range(self.slots):
+            r = self.read_slot(i)
+            if r is not None and (symbol is None or r["symbol"] == symbol) \
+                    and (max_age_sec is None or is_live(r, max_age_sec)):
+                return r
+        return None
+
+
+def as_state(rec: dict, now: Optional[float] = None) -> dict:
+    """Slot record in the shape of the old ``state.json`` (plus position/PnL)."""
+    now = time.time() if now is None else now
+    tick_ns = rec["last_tick_ns"]
+    return {
+        "symbol": rec["symbol"],
+        "phase": rec["phase"],
+        "last_price": rec["last_price"],
+        "base_price": rec["base_price"],
+        "first_order_price": rec["first_order_price"],
+        "cycles": rec["cycles"],
+        "mode": rec["mode"],
+        "position": rec["position"],
+        "realized": rec["realized"],
+        "pnl": rec["pnl"],
+        "last_tick_age": now - tick_ns / 1e9 if tick_ns else None,
+        "ts": rec["updated_ns"] / 1e9,
+    }
+
+
+_READERS: dict[pathlib.Path, LiveState] = {}
+
+
+def _reader(runtime) -> Optional[LiveState]:
+    path = pathlib.Path(runtime) / DEFAULT_PATH.name
+    ls = _READERS.get(path)
+    try:
+        ino = os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+    if ls is None or ls.inode != ino:
+        if ls is not None:
+            ls.close()
+        try:
+            ls = _READERS[path] = LiveState(path)
+        except (OSError, ValueError):
+            _READERS.pop(path, None)
+            return None
+    return ls
+
+
+def read_state(runtime="runtime", symbol: Optional[str] = None,
+               max_age_sec: Optional[float] = None) -> Optional[dict]:
+    """State of the live engine trading ``symbol`` (None if there is none); ``state.json``
+    when there is no live region at all."""
+    ls = _reader(runtime)
+    if ls is not None:
+        rec = ls.read(symbol, SETTINGS.live_state_max_age_sec if max_age_sec is None else max_age_sec)
+        return as_state(rec) if rec is not None else None
+    try:
+        return json.loads((pathlib.Path(runtime) / "state.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def read_all_states(runtime="runtime", max_age_sec: Optional[float] = None) -> list[dict]:
+    """States of every live engine (dead or silent slots skipped)."""
+    ls = _reader(runtime)
+    if ls is None:
+        return []
+    now = time.time()
+    return [as_state(r, now) for r in ls.read_all(SETTINGS.live_state_max_age_sec if max_age_sec is None else max_age_sec)]
+
+
+if __name__ == "__main__":
+    # `python live_state.py [runtime_dir]` — dump every slot as JSON (replaces `cat state.json | jq`)
+    import sys
+    print(json.dumps(read_all_states(sys.argv[1] if len(sys.argv) > 1 else "runtime"), indent=2))
@@ -0,0 +1,515 @@
+# mock_alpaca.py — local stand-in for Alpaca's REST orders API and websocket streams
+"""
+Offline target for the live path (alpaca_adapter, OMSRouter + OrderTracker, ws_probe,
+bench_oms) with configurable load and faults::
+
+    python mock_alpaca.py --rate 200 --rest-latency-ms 5 --disconnect-every 30
+    ALPACA_PAPER_BASE=http://127.0.0.1:8090 ALPACA_WS_URL=ws://127.0.0.1:8091/v2/iex \
+        ALPACA_TRADE_STREAM_URL=ws://127.0.0.1:8091/stream python run_demo.py
+
+The trading stream is served on the websocket port, not next to the REST API as on Alpaca,
+so ``ALPACA_TRADE_STREAM_URL`` is required: without it OrderTracker derives the REST port
+and every fill arrives through ``ORDER_POLL_SEC`` polling instead of trade_updates.
+
+Endpoints
+  REST (``--rest-port``)  POST/GET/DELETE /v2/orders, GET /v2/orders/{id},
+                          GET /v2/orders:by_client_order_id, GET /v2/clock, GET /v2/account
+                          (a doubled ``/v2/v2`` prefix is accepted, as OMSRouter builds it from
+                          a base URL that may already end in /v2)
+  WS   (``--ws-port``)    /stream: trading stream (auth, listen trade_updates)
+                          any other path: market data (connected, auth, subscribe trades/quotes/bars)
+
+Market data is a random walk per symbol at ``--rate`` events/s, sent ``--batch`` messages per
+frame. Faults: ``--ws-latency-ms`` / ``--rest-latency-ms`` (+ ``--jitter-ms``) delivery delay,
+``--connect-latency-ms`` per new REST connection, ``--fail-auth`` (401),
+``--max-conns`` (406 beyond it, Alpaca's one-connection limit by default), ``--rate-limit``
+REST requests/s before 429, ``--error-rate`` share of REST calls answered 500, and
+``--disconnect-every`` seconds for market-data sockets. Orders fill after
+``--fill-delay-ms`` at the mock price, in ``--partials`` pieces, with trade_updates events.
+Filled and canceled orders stay queryable for ``--order-retention-sec`` (at most
+``--max-orders`` of them), so a long soak run does not grow without bound.
+"""
+import argparse, asyncio, datetime as dt, json, random, threading, time, uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+import websockets
+
+
+@dataclass
+class MockConfig:
+    symbols: tuple = ("DIA",)
+    price: float = 480.0
+    rate: float = 10.0              # market-data events per second per symbol and channel
+    batch: int = 1                  # messages per websocket frame
+    bar_sec: float = 60.0
+    ws_latency_ms: float = 0.0
+    rest_latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    connect_latency_ms: float = 0.0
+    key: str = ""                   # "" accepts any credentials
+    secret: str = ""
+    fail_auth: bool = False
+    max_conns: int = 1              # concurrent market-data connections; 0 = unlimited
+    rate_limit: float = 0.0         # REST requests/s before 429; 0 = unlimited
+    error_rate: float = 0.0
+    disconnect_every: float = 0.0
+    fill_delay_ms: float = 0.0
+    partials: int = 1
+    order_retention_sec: float = 300.0  # terminal orders are dropped after this long...
+    max_orders: int = 10_000            # ...or once more than this many are kept
+    seed: int = 0
+
+
+@dataclass
+class MockStats:
+    md_connections: int = 0
+    md_messages: int = 0
+    md_frames: int = 0
+    disconnects: int = 0
+    auth_failures: int = 0
+    rejected_406: int = 0
+    rest_connections: int = 0
+    rest_requests: int = 0
+    rest_429: int = 0
+    rest_500: int = 0
+    orders: int = 0
+    fills: int = 0
+    trade_updates: int = 0
+
+
+def _iso(ns: Optional[int] = None) -> str:
+    ns = time.time_ns() if ns is None else ns
+    return dt.datetime.fromtimestamp(ns // 1_000_000_000, dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S") \
+        + f".{ns % 1_000_000_000:09d}Z"
+
+
+@dataclass(eq=False)
+class _MDConn:
+    ws: object
+    subs: dict = field(default_factory=lambda: {"trades": set(), "quotes": set(), "bars": set()})
+    outbox: Optional[asyncio.Queue] = None
+
+
+class MockAlpaca:
+    def __init__(self, cfg: Optional[MockConfig] = None, ssl_ctx=None):
+        self.cfg = cfg or MockConfig()
+        self.ssl_ctx = ssl_ctx  # REST over TLS (bench_oms --tls)
+        self.stats = MockStats()
+        self.rng = random.Random(self.cfg.seed)
+        self.prices = {s: self.cfg.price for s in self.cfg.symbols}
+        self.orders: dict[str, dict] = {}
+        self._by_coid: dict[str, str] = {}
+        self._md: set[_MDConn] = set()
+        self._listeners: set = set()   # trading-stream sockets listening on trade_updates
+        self._rest_conns: set[asyncio.Task] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._terminal: deque = deque()  # (monotonic time, order id) of filled/canceled orders
+        self._window = [0.0, 0]         # rate limiter: window start, requests in window
+        self._bar: dict[str, list] = {}
+        self.rest_url = self.ws_url = self.stream_url = ""
+
+    # ---- lifecycle ----
+    async def start(self, host: str = "127.0.0.1", rest_port: int = 0, ws_port: int = 0):
+        self._rest = await asyncio.start_server(self._rest_conn, host, rest_port, ssl=self.ssl_ctx)
+        self._ws = await websockets.serve(self._ws_conn, host, ws_port)
+        rp = self._rest.sockets[0].getsockname()[1]
+        wp = self._ws.sockets[0].getsockname()[1]
+        self.rest_url = f"{'https' if self.ssl_ctx else 'http'}://{host}:{rp}"
+        self.ws_url = f"ws://{host}:{wp}/v2/iex"
+        self.stream_url = f"ws://{host}:{wp}/stream"
+        self._spawn(self._market())
+        return self
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def stop(self):
+        for t in list(self._tasks):
+            t.cancel()
+        self._ws.close()
+        self._rest.close()
+        for t in list(self._rest_conns):
+            t.cancel()
+        await asyncio.gather(*self._tasks, *self._rest_conns, return_exceptions=True)
+        await self._ws.wait_closed()
+
+    def run_in_thread(self, **kw) -> "MockAlpaca":
+        """Serve from a daemon thread with its own loop (keeps the caller's loop unloaded)."""
+        ready = threading.Event()
+
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._stopped = asyncio.Event()
+            await self.start(**kw)
+            ready.set()
+            await self._stopped.wait()
+            await self.stop()
+
+        self._thread = threading.Thread(target=asyncio.run, args=(main(),), daemon=True)
+        self._thread.start()
+        ready.wait(5)
+        return self
+
+    def stop_thread(self):
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join(5)
+
+    async def _delay(self, base_ms: float):
+        ms = base_ms + (self.rng.uniform(0, self.cfg.jitter_ms) if self.cfg.jitter_ms else 0.0)
+        if ms > 0:
+            await asyncio.sleep(ms / 1000.0)
+
+    # ---- market data ----
+    def _step(self, symbol: str) -> float:
+        p = self.prices[symbol] = round(max(0.01, self.prices[symbol] + self.rng.gauss(0, 0.02)), 2)
+        return p
+
+    def _events(self, symbol: str, ns: int) -> dict:
+        p = self._step(symbol)
+        ts = _iso(ns)
+        size = self.rng.choice((1, 5, 10, 100))
+        out = {"trades": {"T": "t", "S": symbol, "i": self.stats.md_messages, "x": "V", "p": p, "s": size,
+                          "t": ts, "c": ["@"], "z": "B"},
+               "quotes": {"T": "q", "S": symbol, "bx": "V", "bp": round(p - 0.01, 2), "bs": 2,
+                          "ax": "V", "ap": round(p + 0.01, 2), "as": 3, "t": ts, "c": ["R"], "z": "B"}}
+        bar = self._bar.get(symbol)
+        start = ns - ns % int(self.cfg.bar_sec * 1e9)
+        if bar is None or bar[0] != start:
+            if bar is not None:
+                out["bars"] = {"T": "b", "S": symbol, "o": bar[1], "h": bar[2], "l": bar[3], "c": bar[4],
+                               "v": bar[5], "t": _iso(bar[0])}
+            bar = self._bar[symbol] = [start, p, p, p, p, 0]
+        bar[2], bar[3], bar[4], bar[5] = max(bar[2], p), min(bar[3], p), p, bar[5] + size
+        return out
+
+    async def _market(self):
+        interval = self.cfg.batch / self.cfg.rate if self.cfg.rate > 0 else None
+        while True:
+            if interval is None:
+                await asyncio.sleep(3600)
+                continue
+            await asyncio.sleep(interval)
+            frames: dict[_MDConn, list] = {}
+            for _ in range(self.cfg.batch):
+                ns = time.time_ns()
+                for sym in self.cfg.symbols:
+                    ev = self._events(sym, ns)
+                    for c in self._md:
+                        for ch, msg in ev.items():
+                            if sym in c.subs[ch] or "*" in c.subs[ch]:
+                                frames.setdefault(c, []).append(msg)
+            due = time.monotonic() + self.cfg.ws_latency_ms / 1000.0
+            for c, msgs in frames.items():
+                c.outbox.put_nowait((due, json.dumps(msgs)))
+
+    async def _sender(self, c: _MDConn):
+        while True:
+            due, frame = await c.outbox.get()
+            wait = due - time.monotonic() + (self.rng.uniform(0, self.cfg.jitter_ms) / 1000.0 if self.cfg.jitter_ms else 0.0)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await c.ws.send(frame)
+            self.stats.md_frames += 1
+            self.stats.md_messages += frame.count('"T":')
+
+    def _auth_ok(self, key, secret) -> bool:
+        if self.cfg.fail_auth:
+            return False
+        return not self.cfg.key or (key == self.cfg.key and secret == self.cfg.secret)
+
+    async def _ws_conn(self, ws):
+        if ws.request.path.rstrip("/").endswith("/stream"):
+            return await self._trade_stream(ws)
+        await ws.send(json.dumps([{"T": "success", "msg": "connected"}]))
+        try:
+            msg = json.loads(await ws.recv())
+            if msg.get("action") != "auth" or not self._auth_ok(msg.get("key"), msg.get("secret")):
+                self.stats.auth_failures += 1
+                await ws.send(json.dumps([{"T": "error", "code": 401, "msg": "not authenticated"}]))
+                return
+            if self.cfg.max_conns and len(self._md) >= self.cfg.max_conns:
+                self.stats.rejected_406 += 1
+                await ws.send(json.dumps([{"T": "error", "code": 406, "msg": "connection limit exceeded"}]))
+                return
+            await ws.send(json.dumps([{"T": "success", "msg": "authenticated"}]))
+        except websockets.ConnectionClosed:
+            return
+        c = _MDConn(ws, outbox=asyncio.Queue())
+        self._md.add(c)
+        self.stats.md_connections += 1
+        sender = asyncio.create_task(self._sender(c))
+        killer = asyncio.create_task(self._disconnect_later(ws)) if self.cfg.disconnect_every > 0 else None
+        try:
+            async for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                except ValueError:
+                    await ws.send(json.dumps([{"T": "error", "code": 400, "msg": "invalid syntax"}]))
+                    continue
+                action = msg.get("action")
+                if action in ("subscribe", "unsubscribe"):
+                    for ch in ("trades", "quotes", "bars"):
+                        for sym in msg.get(ch) or ():
+                            (c.subs[ch].add if action == "subscribe" else c.subs[ch].discard)(sym.upper())
+                    await ws.send(json.dumps([{"T": "subscription", **{ch: sorted(v) for ch, v in c.subs.items()}}]))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._md.discard(c)
+            sender.cancel()
+            if killer is not None:
+                killer.cancel()
+
+    async def _disconnect_later(self, ws):
+        await asyncio.sleep(self.cfg.disconnect_every)
+        self.stats.disconnects += 1
+        await ws.close(1011, "mock disconnect")
+
+    # ---- trading stream ----
+    async def _trade_stream(self, ws):
+        try:
+            msg = json.loads(await ws.recv())
+            data = msg.get("data") or {}
+            ok = self._auth_ok(msg.get("key") or data.get("key_id"), msg.get("secret") or data.get("secret_key"))
+            await ws.send(json.dumps({"stream": "authorization",
+                                      "data": {"action": "authenticate", "status": "authorized" if ok else "unauthorized"}}))
+            if not ok:
+                self.stats.auth_failures += 1
+                return
+            msg = json.loads(await ws.recv())
+            streams = (msg.get("data") or {}).get("streams") or []
+            await ws.send(json.dumps({"stream": "listening", "data": {"streams": streams}}))
+            if "trade_updates" in streams:
+                self._listeners.add(ws)
+            await ws.wait_closed()
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._listeners.discard(ws)
+
+    def _publish(self, event: str, order: dict, **extra):
+        msg = json.dumps({"stream": "trade_updates",
+                          "data": {"event": event, "timestamp": _iso(), "order": order, **extra}})
+        for ws in list(self._listeners):
+            self._spawn(self._send(ws, msg))
+            self.stats.trade_updates += 1
+
+    @staticmethod
+    async def _send(ws, msg: str):
+        try:
+            await ws.send(msg)
+        except websockets.ConnectionClosed:
+            pass
+
+    # ---- orders ----
+    def _finished(self, order: dict):
+        self._terminal.append((time.monotonic(), order["id"]))
+
+    def _prune(self):
+        """Forget terminal orders past the retention time or beyond ``max_orders``."""
+        cutoff = time.monotonic() - self.cfg.order_retention_sec
+        term = self._terminal
+        while term and (term[0][0] < cutoff or len(term) > self.cfg.max_orders):
+            o = self.orders.pop(term.popleft()[1], None)
+            if o is not None:
+                self._by_coid.pop(o["client_order_id"], None)
+
+    def _new_order(self, body: dict) -> tuple[int, dict]:
+        try:
+            symbol = str(body["symbol"]).upper()
+            qty = int(float(body["qty"]))
+            side = str(body["side"]).lower()
+        except (KeyError, TypeError, ValueError):
+            return 422, {"code": 40010000, "message": "invalid order request"}
+        if side not in ("buy", "sell") or qty <= 0:
+            return 422, {"code": 40010000, "message": "invalid side or qty"}
+        self._prune()
+        coid = body.get("client_order_id") or str(uuid.uuid4())
+        if coid in self._by_coid:
+            return 422, {"code": 40010001, "message": "client_order_id must be unique"}
+        now = _iso()
+        oid = str(uuid.uuid4())
+        order = {"id": oid, "client_order_id": coid, "created_at": now, "submitted_at": now, "filled_at": None,
+                 "symbol": symbol, "qty": str(qty), "filled_qty": "0", "filled_avg_price": None,
+                 "type": body.get("type", "market"), "side": side, "time_in_force": body.get("time_in_force", "day"),
+                 "status": "accepted"}
+        self.orders[oid] = order
+        self._by_coid[coid] = oid
+        self.stats.orders += 1
+        self.prices.setdefault(symbol, self.cfg.price)
+        self._spawn(self._fill(order))
+        return 200, dict(order)
+
+    async def _fill(self, order: dict):
+        order["status"] = "new"
+        self._publish("new", dict(order))
+        qty, done, notional = int(order["qty"]), 0, 0.0
+        n = max(1, min(self.cfg.partials, qty))
+        for k in range(n):
+            await asyncio.sleep(self.cfg.fill_delay_ms / 1000.0 / n)
+            if order["status"] == "canceled":
+                return
+            part = qty - done if k == n - 1 else qty // n
+            px = self._step(order["symbol"])
+            done += part
+            notional += part * px
+            order.update(filled_qty=str(done), filled_avg_price=f"{notional / done:.4f}",
+                         status="filled" if done == qty else "partially_filled")
+            if done == qty:
+                order["filled_at"] = _iso()
+                self._finished(order)
+            self.stats.fills += 1
+            self._publish("fill" if done == qty else "partial_fill", dict(order),
+                          price=str(px), qty=str(part), position_qty=str(done))
+
+    def _route(self, method: str, path: str, query: dict, body: dict) -> tuple[int, object]:
+        while path.startswith("/v2/v2/"):
+            path = path[3:]
+        if path == "/v2/orders" and method == "POST":
+            return self._new_order(body)
+        if path == "/v2/orders" and method == "GET":
+            return 200, [dict(o) for o in self.orders.values()]
+        if path == "/v2/orders:by_client_order_id" and method == "GET":
+            oid = self._by_coid.get((query.get("client_order_id") or [""])[0])
+            return (200, dict(self.orders[oid])) if oid else (404, {"code": 40410000, "message": "order not found"})
+        if path.startswith("/v2/orders/"):
+            o = self.orders.get(path.rsplit("/", 1)[1])
+            if o is None:
+                return 404, {"code": 40410000, "message": "order not found"}
+            if method == "DELETE":
+                if o["status"] == "filled":
+                    return 422, {"code": 42210000, "message": "order is already filled"}
+                if o["status"] != "canceled":
+                    o["status"] = "canceled"
+                    self._finished(o)
+                self._publish("canceled", dict(o))
+                return 204, None
+            return 200, dict(o)
+        if path == "/v2/clock":
+            return 200, {"timestamp": _iso(), "is_open": True, "next_open": _iso(), "next_close": _iso()}
+        if path == "/v2/account":
+            return 200, {"id": "mock", "status": "ACTIVE", "currency": "USD", "buying_power": "1000000"}
+        return 404, {"code": 40410000, "message": "endpoint not found"}
+
+    def _limited(self) -> bool:
+        if not self.cfg.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window[0] >= 1.0:
+            self._window = [now, 0]
+        self._window[1] += 1
+        return self._window[1] > self.cfg.rate_limit
+
+    async def _rest_conn(self, reader, writer):
+        task = asyncio.current_task()
+        self._rest_conns.add(task)
+        self.stats.rest_connections += 1
+        await self._delay(self.cfg.connect_latency_ms)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {}
+                for ln in lines[1:]:
+                    if ":" in ln:
+                        k, v = ln.split(":", 1)
+                        headers[k.strip().lower()] = v.strip()
+                n = int(headers.get("content-length") or 0)
+                raw = await reader.readexactly(n) if n else b""
+                self.stats.rest_requests += 1
+                u = urlsplit(target)
+                if self._limited():
+                    self.stats.rest_429 += 1
+                    status, out = 429, {"code": 42910000, "message": "rate limit exceeded"}
+                elif self.cfg.error_rate and self.rng.random() < self.cfg.error_rate:
+                    self.stats.rest_500 += 1
+                    status, out = 500, {"code": 50010000, "message": "internal server error"}
+                elif not self._auth_ok(headers.get("apca-api-key-id"), headers.get("apca-api-secret-key")):
+                    self.stats.auth_failures += 1
+                    status, out = 401, {"code": 40110000, "message": "request is not authorized"}
+                else:
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except ValueError:
+                        body = None
+                    status, out = (422, {"code": 40010000, "message": "malformed json"}) if body is None \
+                        else self._route(method, u.path, parse_qs(u.query), body)
+                await self._delay(self.cfg.rest_latency_ms)
+                data = b"" if out is None else json.dumps(out).encode()
+                writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                             % (status, _REASONS.get(status, b"OK"), len(data), data))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self._rest_conns.discard(task)
+
+
+_REASONS = {200: b"OK", 204: b"No Content", 401: b"Unauthorized", 404: b"Not Found",
+            422: b"Unprocessable Entity", 429: b"Too Many Requests", 500: b"Internal Server Error"}
+
+
+async def main(args):
+    cfg = MockConfig(symbols=tuple(s.upper() for s in args.symbols), price=args.price, rate=args.rate,
+                     batch=args.batch, bar_sec=args.bar_sec, ws_latency_ms=args.ws_latency_ms,
+                     rest_latency_ms=args.rest_latency_ms, jitter_ms=args.jitter_ms,
+                     connect_latency_ms=args.connect_latency_ms, key=args.key, secret=args.secret,
+                     fail_auth=args.fail_auth, max_conns=args.max_conns, rate_limit=args.rate_limit,
+                     error_rate=args.error_rate, disconnect_every=args.disconnect_every,
+                     fill_delay_ms=args.fill_delay_ms, partials=args.partials,
+                     order_retention_sec=args.order_retention_sec, max_orders=args.max_orders, seed=args.seed)
+    mock = await MockAlpaca(cfg).start(args.host, args.rest_port, args.ws_port)
+    print(f"[MOCK] REST {mock.rest_url}  market data {mock.ws_url}  trading stream {mock.stream_url}")
+    print(f"[MOCK]   ALPACA_PAPER_BASE={mock.rest_url} ALPACA_WS_URL={mock.ws_url} "
+          f"ALPACA_TRADE_STREAM_URL={mock.stream_url}")
+    try:
+        while True:
+            await asyncio.sleep(args.stats_sec)
+            s = mock.stats
+            print(f"[MOCK] md conns={len(mock._md)} msgs={s.md_messages} frames={s.md_frames} "
+                  f"disconnects={s.disconnects} 401={s.auth_failures} 406={s.rejected_406} | "
+                  f"rest conns={s.rest_connections} reqs={s.rest_requests} 429={s.rest_429} 500={s.rest_500} "
+                  f"orders={s.orders} fills={s.fills} updates={s.trade_updates}")
+    finally:
+        await mock.stop()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--rest-port", type=int, default=8090)
+    ap.add_argument("--ws-port", type=int, default=8091)
+    ap.add_argument("--symbols", nargs="+", default=["DIA"])
+    ap.add_argument("--price", type=float, default=480.0)
+    ap.add_argument("--rate", type=float, default=10.0, help="events/s per symbol and channel")
+    ap.add_argument("--batch", type=int, default=1, help="messages per websocket frame")
+    ap.add_argument("--bar-sec", type=float, default=60.0)
+    ap.add_argument("--ws-latency-ms", type=float, default=0.0)
+    ap.add_argument("--rest-latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--connect-latency-ms", type=float, default=0.0, help="delay on each new REST connection")
+    ap.add_argument("--key", default="", help="required API key (default: accept any)")
+    ap.add_argument("--secret", default="")
+    ap.add_argument("--fail-auth", action="store_true", help="reject every auth (401)")
+    ap.add_argument("--max-conns", type=int, default=1, help="market-data connections before 406 (0 = unlimited)")
+    ap.add_argument("--rate-limit", type=float, default=0.0, help="REST requests/s before 429 (0 = off)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of REST calls answered 500")
+    ap.add_argument("--disconnect-every", type=float, default=0.0, help="close market-data sockets after N s")
+    ap.add_argument("--fill-delay-ms", type=float, default=0.0)
+    ap.add_argument("--partials", type=int, default=1, help="fills per order")
+    ap.add_argument("--order-retention-sec", type=float, default=300.0, help="keep filled/canceled orders this long")
+    ap.add_argument("--max-orders", type=int, default=10_000, help="filled/canceled orders kept at most")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--stats-sec", type=float, default=10.0)
+    try:
+        asyncio.run(main(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
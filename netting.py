@@ -0,0 +1,145 @@
+# netting.py — net the signals of one beat (or a short window) into one order per symbol
+"""
+A beat can fire several triggers at once (T14, T8/T9, T10-T13, the ladder, T7), often in
+opposite directions. With ``NET_SIGNALS=true`` the risk gate reads the signal queue in
+batches and routes one order per symbol for the net quantity::
+
+    T4 BUY 200 + T5 BUY 500 + T14 SELL 400   ->   NET BUY 300, legs=(("T4", 200), ("T5", 500), ("T14", -400))
+
+A batch is everything already queued when the first signal is taken (i.e. one beat's worth)
+plus whatever arrives within ``NET_WINDOW_MS`` on the engine's clock. A lone signal passes
+through unchanged; a batch that nets to zero sends nothing. PROTECT / FLATTEN are never
+netted or delayed: one arriving while a window is open is handed over at once, and the
+window's entries keep collecting until its deadline. ``legs`` rides on the approval and the fills so the ledger can still
+attribute quantity and PnL per trigger.
+"""
+import asyncio
+
+from clock import WALL_CLOCK
+from events import OrderSignal
+
+PASS_THROUGH = frozenset({"PROTECT", "FLATTEN"})
+NET_REASON = "NET"
+
+
+def signed_qty(sig) -> int:
+    return sig.qty if sig.side == "BUY" else -sig.qty
+
+
+def _legs(sig) -> tuple:
+    return sig.legs or ((sig.reason, signed_qty(sig)),)
+
+
+def net_signals(sigs: list[OrderSignal]) -> list[OrderSignal]:
+    """Exits first (unchanged), then one netted signal per symbol; flat symbols are dropped."""
+    out = [s for s in sigs if s.reason in PASS_THROUGH]
+    groups: dict[str, list[OrderSignal]] = {}
+    for s in sigs:
+        if s.reason not in PASS_THROUGH:
+            groups.setdefault(s.symbol, []).append(s)
+    for symbol, group in groups.items():
+        if len(group) == 1:
+            out.append(group[0])
+            continue
+        legs = tuple(leg for s in group for leg in _legs(s))
+        net = sum(q for _, q in legs)
+        if net == 0:
+            continue
+        last = group[-1]
+        out.append(OrderSignal(
+            ts_ns=last.ts_ns, symbol=symbol, side="BUY" if net > 0 else "SELL", qty=abs(net),
+            reason=NET_REASON, base_price=last.base_price, first_order_price=last.first_order_price,
+            from_base_pts=last.from_base_pts, from_first_pts=last.from_first_pts, legs=legs,
+            tick_ns=group[0].tick_ns, signal_ns=group[0].signal_ns))  # traced from the oldest leg
+    return out
+
+
+def net_beats(sigs: list[OrderSignal]) -> list[OrderSignal]:
+    """``net_signals`` over each run of same-timestamp signals (batch backtests: one beat each)."""
+    out: list[OrderSignal] = []
+    i, n = 0, len(sigs)
+    while i < n:
+        j = i + 1
+        while j < n and sigs[j].ts_ns == sigs[i].ts_ns:
+            j += 1
+        out += net_signals(sigs[i:j]) if j - i > 1 else sigs[i:j]
+        i = j
+    return out
+
+
+def describe(legs) -> str:
+    return " + ".join(f"{r} {'BUY' if q > 0 else 'SELL'} {abs(q)}" for r, q in legs)
+
+
+class SignalNetter:
+    """Batches a signal queue and nets each batch; counts what netting saved."""
+
+    def __init__(self, window_sec: float = 0.0, clock=None):
+        self.window_sec = window_sec
+        self.clock = clock or WALL_CLOCK
+        self.signals_in = 0
+        self.orders_out = 0
+        self.crossed_qty = 0   # quantity that offset inside a batch instead of going to the broker
+        self._open: list[OrderSignal] = []  # entries of the window being collected
+        self._deadline_ns = 0
+
+    async def _get_until(self, signals_q, timeout: float) -> OrderSignal | None:
+        """Next signal, or None once ``timeout`` seconds pass on the clock."""
+        get = asyncio.ensure_future(signals_q.get())
+        timer = asyncio.ensure_future(self.clock.sleep(timeout))
+        try:
+            await asyncio.wait((get, timer), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            timer.cancel()
+            if not get.done():
+                get.cancel()
+        return get.result() if get.done() and not get.cancelled() else None
+
+    async def next_batch(self, signals_q) -> list[OrderSignal]:
+        """The next exit on its own as soon as it arrives, else the entries of one window."""
+        if not self._open:
+            first = await signals_q.get()
+            if first.reason in PASS_THROUGH:
+                return [first]
+            self._open.append(first)
+            self._deadline_ns = self.clock.time_ns() + int(self.window_sec * 1e9)
+        while True:
+            while not signals_q.empty():
+                s = signals_q.get_nowait()
+                if s.reason in PASS_THROUGH:
+                    return [s]
+                self._open.append(s)
+            remaining = (self._deadline_ns - self.clock.time_ns()) / 1e9
+            if remaining <= 0:
+                break
+            s = await self._get_until(signals_q, remaining)
+            if s is None:
+                break
+            if s.reason in PASS_THROUGH:
+                return [s]
+            self._open.append(s)
+        batch, self._open = self._open, []
+        return batch
+
+    def net(self, batch: list[OrderSignal]) -> list[OrderSignal]:
+        out = net_signals(batch) if len(batch) > 1 else batch
+        self.signals_in += len(batch)
+        self.orders_out += len(out)
+        gross = sum(abs(q) for s in batch if s.reason not in PASS_THROUGH for _, q in _legs(s))
+        net = sum(s.qty for s in out if s.reason not in PASS_THROUGH)
+        self.crossed_qty += gross - net
+        for s in out:
+            if s.legs:
+                print(f"[NET] {describe(s.legs)} -> {s.side} {s.qty}")
+        flat = {s.symbol for s in batch if s.reason not in PASS_THROUGH} - {s.symbol for s in out}
+        for symbol in flat:
+            legs = tuple(leg for s in batch if s.symbol == symbol and s.reason not in PASS_THROUGH for leg in _legs(s))
+            print(f"[NET] {symbol} {describe(legs)} -> flat, no order")
+        return out
+
+    async def batches(self, signals_q):
+        while True:
+            yield self.net(await self.next_batch(signals_q))
+
+    def format_metrics(self) -> str:
+        return f"signals={self.signals_in} orders={self.orders_out} crossed_qty={self.crossed_qty}"
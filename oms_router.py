@@ -1,9 +1,18 @@
-import asyncio, time, httpx, json
+import asyncio, heapq, importlib.util, time, httpx, json
 from events import OrderApproved, Execution
+from clock import WALL_CLOCK
 from config import SETTINGS
+from fill_model import make_fill_model
+from latency import LatencyHistogram
+from tracer import TRACER
+from order_tracker import OrderTracker
+
+HAVE_H2 = importlib.util.find_spec("h2") is not None  # httpx[http2]
+PRIORITY_REASONS = frozenset({"PROTECT", "FLATTEN"})  # exits are dispatched ahead of queued entries
 
 class OMSRouter:
-    def __init__(self, exec_q: asyncio.Queue, engine=None, mode="live"):
+    def __init__(self, exec_q: asyncio.Queue, engine=None, mode="live", client: httpx.AsyncClient | None = None,
+                 track_orders: bool | None = None):
         self.exec_q = exec_q
         self.engine = engine  # Reference to get current price in sim mode
         self.mode = mode  # "live" or "sim"
@@ -15,44 +24,264 @@ class OMSRouter:
             "APCA-API-SECRET-KEY": self.secret,
             "Content-Type": "application/json"
         }
+        # One long-lived pooled client: orders reuse warm connections instead of paying
+        # TCP + TLS setup each time. Created in start() (or on first order), closed in aclose().
+        self.client = client
+        self.http2 = False
+        self.verify = True  # TLS verification for the pool (an ssl.SSLContext for private CAs)
+        self.latency = LatencyHistogram("orders")  # POST /v2/orders round trip
+        self._last_io = 0.0  # monotonic time of the last request on the pool
+        self._keepalive_task = None
+        # Dispatcher: approvals wait in a (priority, arrival) heap and up to max_inflight orders
+        # run at once, so one slow response no longer holds up everything behind it. Each symbol
+        # has at most one entry in flight; later entries wait in its own heap until it completes
+        # (exits are never held).
+        self.max_inflight = SETTINGS.oms_max_inflight
+        self.inflight = 0
+        self.inflight_max = 0
+        self.dispatched = 0
+        self.wait = LatencyHistogram("queue_wait")  # approval received -> order dispatched
+        self._pending: list = []
+        self._busy: set[str] = set()  # symbols with an entry in flight
+        self._held: dict[str, list] = {}  # symbol -> heap of entries waiting for that symbol
+        self._seq = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._wake: asyncio.Event | None = None
+        # Live fills come from the broker's order updates (real prices, partial fills) rather
+        # than the POST response; without a tracker the old immediate-fill assumption applies.
+        track = SETTINGS.oms_track_orders if track_orders is None else track_orders
+        self.tracker = OrderTracker(exec_q, self) if track else None
+        self.fill_model = make_fill_model()  # sim-mode fills: latency, spread, impact, partials (FILL_MODEL)
 
-    async def place_order(self, symbol: str, side: str, qty: int, typ="market", tif="day"):
-        url = f"{self.base}/v2/orders"
-        data = {"symbol": symbol, "side": side.lower(), "type": typ, "time_in_force": tif, "qty": qty}
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            r = await client.post(url, headers=self.headers, json=data)
-            r.raise_for_status()
-            j = r.json()
+    def _make_client(self) -> httpx.AsyncClient:
+        S = SETTINGS
+        limits = httpx.Limits(
+            max_connections=S.oms_pool_max,
+            max_keepalive_connections=S.oms_pool_keepalive,
+            # idle connections must outlive the ping interval or the pool drops them first
+            keepalive_expiry=max(4 * S.oms_keepalive_sec, 30.0),
+        )
+        self.http2 = S.oms_http2 and HAVE_H2
+        return httpx.AsyncClient(headers=self.headers, timeout=S.oms_timeout_sec, limits=limits,
+                                 http2=self.http2, verify=self.verify)
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self.client is None or self.client.is_closed:
+            self.client = self._make_client()
+        return self.client
+
+    async def start(self, warm: bool = True):
+        """Create the pool, open connections ahead of the first order and start idle pings."""
+        self._ensure_client()
+        if warm:
+            await self.warm_up()
+        if self._keepalive_task is None and SETTINGS.oms_keepalive_sec > 0:
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def _ping(self) -> bool:
+        # any HTTP status means the connection is up; /v2/clock is the cheapest authenticated GET
+        await self.client.get(f"{self.base}/v2/clock")
+        return True
+
+    async def warm_up(self, n: int | None = None, quiet: bool = False) -> int:
+        """Open up to ``n`` pooled connections (concurrent GETs; one suffices on HTTP/2)."""
+        self._ensure_client()
+        n = SETTINGS.oms_warm_conns if n is None else n
+        if self.http2:
+            n = min(n, 1)
+        results = await asyncio.gather(*(self._ping() for _ in range(n)), return_exceptions=True)
+        self._last_io = time.monotonic()
+        ok = sum(r is True for r in results)
+        if not quiet:
+            errs = [r for r in results if isinstance(r, Exception)]
+            print(f"[OMS] Warmed {ok}/{n} connection(s) to {self.base}"
+                  + (f" (last error: {errs[-1]!r})" if errs else ""))
+        return ok
+
+    async def _keepalive(self):
+        """Ping the pool while idle so the next order doesn't find its connections closed."""
+        interval = SETTINGS.oms_keepalive_sec
+        while True:
+            await asyncio.sleep(interval)
+            if self.mode != "live" or time.monotonic() - self._last_io < interval:
+                continue
             try:
-                print("[OMS] Order response:", j)
+                await self.warm_up(quiet=True)
             except Exception:
                 pass
-            # For the demo, assume immediate fill. In reality, poll order status or subscribe to trade updates.
+
+    async def aclose(self):
+        if self.tracker is not None:
+            self.tracker.stop()
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def place_order(self, symbol: str, side: str, qty: int, typ="market", tif="day", reason: str = "",
+                          legs: tuple = (), trace: OrderApproved | None = None):
+        """POST the order. Tracked orders return None (fills arrive via the tracker), else the fill price."""
+        url = f"{self.base}/v2/orders"
+        data = {"symbol": symbol, "side": side.lower(), "type": typ, "time_in_force": tif, "qty": qty}
+        tracked = None
+        if self.tracker is not None:
+            tracked = self.tracker.track(symbol, side, qty, reason, legs, trace)
+            data["client_order_id"] = tracked.client_order_id
+        client = self._ensure_client()
+        t0 = time.perf_counter_ns()
+        try:
+            r = await client.post(url, json=data)
+        except Exception:
+            if tracked is not None:
+                tracked.posted = False  # may or may not have reached the broker: the poller asks by client_order_id
+            raise
+        dt_ns = time.perf_counter_ns() - t0
+        self.latency.record(dt_ns)
+        self._last_io = time.monotonic()
+        if tracked is not None and r.is_error:
+            self.tracker.forget(tracked.client_order_id)  # rejected outright, no order exists
+        r.raise_for_status()
+        j = r.json()
+        try:
+            print(f"[OMS] Order response ({dt_ns / 1e6:.1f}ms):", j)
+        except Exception:
+            pass
+        if tracked is not None:
+            tracked.posted = True
+            await self.tracker.on_order(j)  # usually just "accepted"; may already carry fills
+            return None
+        # Untracked: assume immediate fill at the reported price (usually empty for a fresh market order).
+        px = None
+        try:
+            px = float(j.get("filled_avg_price") or 0) or None
+        except Exception:
             px = None
+        return px
+
+    def submit(self, appr: OrderApproved):
+        """Queue an approval for dispatch (PROTECT/FLATTEN first, otherwise arrival order)."""
+        prio = 0 if appr.reason in PRIORITY_REASONS else 1
+        heapq.heappush(self._pending, (prio, self._seq, time.perf_counter_ns(), appr))
+        self._seq += 1
+        if self._wake is not None:
+            self._wake.set()
+
+    def _has_slot(self, prio: int) -> bool:
+        # entries leave one slot free so an exit is never stuck behind hung entry orders
+        limit = self.max_inflight if prio == 0 else max(1, self.max_inflight - 1)
+        return self.inflight < limit
+
+    def _done(self, task: asyncio.Task, symbol: str | None):
+        self._tasks.discard(task)
+        self.inflight -= 1
+        self._busy.discard(symbol)
+        held = self._held.get(symbol)
+        if held:
+            heapq.heappush(self._pending, heapq.heappop(held))  # keeps its priority and arrival
+            if not held:
+                del self._held[symbol]
+        self._wake.set()
+
+    async def _execute(self, appr: OrderApproved):
+        px = None
+        if TRACER.enabled:
+            TRACER.on_send(appr)
+
+        # In sim mode, use current price from engine instead of placing real orders
+        if self.mode == "sim" and self.engine and self.engine.last_price is not None:
+            clock = getattr(self.engine, "clock", WALL_CLOCK)
+            async for e in self.fill_model.execute(appr, lambda: self.engine.last_price, clock.sleep, clock.time_ns):
+                print(f"[OMS-SIM] {e.side} {e.qty} @ {e.price:.2f} (reason: {e.reason})")
+                if TRACER.enabled:
+                    TRACER.on_fill(e, appr)
+                await self.exec_q.put(e)
+            return
+        elif self.tracker is not None:
+            # Live mode, tracked: the tracker puts Executions on exec_q as the broker reports fills
             try:
-                px = float(j.get("filled_avg_price") or 0) or None
-            except Exception:
-                px = None
-            return px
+                await self.place_order(appr.symbol, appr.side, appr.qty, reason=appr.reason, legs=appr.legs, trace=appr)
+            except Exception as e:
+                print(f"[OMS-ERROR] Order failed: {e}")
+            return
+        else:
+            # Live mode: place actual order
+            try:
+                px = await self.place_order(appr.symbol, appr.side, appr.qty)
+            except Exception as e:
+                print(f"[OMS-ERROR] Order failed: {e}")
+                # In case of error, use engine price as fallback
+                if self.engine and self.engine.last_price is not None:
+                    px = self.engine.last_price
 
-    async def run(self, approvals_q: asyncio.Queue):
+        exec_evt = Execution(ts_ns=appr.ts_ns, symbol=appr.symbol, side=appr.side, qty=appr.qty, price=px or 0.0,
+                             reason=appr.reason, legs=appr.legs)
+        if TRACER.enabled:
+            TRACER.on_fill(exec_evt, appr)
+        await self.exec_q.put(exec_evt)
+
+    async def _intake(self, approvals_q: asyncio.Queue):
         while True:
-            appr: OrderApproved = await approvals_q.get()
-            px = None
-            
-            # In sim mode, use current price from engine instead of placing real orders
-            if self.mode == "sim" and self.engine and self.engine.last_price is not None:
-                px = self.engine.last_price
-                print(f"[OMS-SIM] {appr.side} {appr.qty} @ {px:.2f} (reason: {appr.reason})")
-            else:
-                # Live mode: place actual order
-                try:
-                    px = await self.place_order(SETTINGS.symbol, appr.side, appr.qty)
-                except Exception as e:
-                    print(f"[OMS-ERROR] Order failed: {e}")
-                    # In case of error, use engine price as fallback
-                    if self.engine and self.engine.last_price is not None:
-                        px = self.engine.last_price
-            
-            exec_evt = Execution(ts_ns=appr.ts_ns, symbol=appr.symbol, side=appr.side, qty=appr.qty, price=px or 0.0, reason=appr.reason)
-            await self.exec_q.put(exec_evt)
+            self.submit(await approvals_q.get())
+
+    async def _dispatch(self):
+        """Start queued orders while slots are free; each execution is published as it completes.
+
+        Orders are started in (priority, arrival) order. Entries go one at a time per symbol:
+        an entry whose symbol is busy is held until the previous one completes, so a symbol's
+        entry fills arrive in the order they were approved. Exits (PROTECT/FLATTEN) skip the
+        hold and go out at once, even while an entry for the symbol is still in flight.
+        """
+        while True:
+            while self._pending and self._has_slot(self._pending[0][0]):
+                item = heapq.heappop(self._pending)
+                prio, _, t_enq, appr = item
+                entry = appr.symbol if prio else None
+                if entry is not None:
+                    if entry in self._busy:
+                        heapq.heappush(self._held.setdefault(entry, []), item)
+                        continue
+                    self._busy.add(entry)
+                self.wait.record(time.perf_counter_ns() - t_enq)
+                self.inflight += 1
+                self.inflight_max = max(self.inflight_max, self.inflight)
+                self.dispatched += 1
+                task = asyncio.create_task(self._execute(appr))
+                self._tasks.add(task)
+                task.add_done_callback(lambda t, sym=entry: self._done(t, sym))
+            self._wake.clear()
+            await self._wake.wait()
+
+    def metrics(self) -> dict:
+        w = self.wait.summary()
+        return {"inflight": self.inflight, "max_inflight": self.max_inflight, "inflight_max": self.inflight_max,
+                "queued": len(self._pending) + sum(map(len, self._held.values())), "dispatched": self.dispatched,
+                "wait_p50_ms": w["p50"], "wait_p99_ms": w["p99"], "wait_max_ms": w["max"]}
+
+    def format_metrics(self) -> str:
+        m = self.metrics()
+        out = (f"inflight={m['inflight']}/{m['max_inflight']} max={m['inflight_max']} queued={m['queued']} "
+               f"sent={m['dispatched']} wait p50={m['wait_p50_ms']:.2f}ms p99={m['wait_p99_ms']:.2f}ms "
+               f"max={m['wait_max_ms']:.2f}ms")
+        if self.latency.n:
+            out += f" | orders {self.latency.format()}"
+        if self.mode == "sim":
+            out += f" | fills {self.fill_model.format_metrics()}"
+        if self.tracker is not None:
+            out += (f" | open={len(self.tracker.orders)} stream={'up' if self.tracker.connected else 'down'}"
+                    f" ws={self.tracker.stream_updates} polled={self.tracker.poll_updates}")
+        return out
+
+    async def run(self, approvals_q: asyncio.Queue):
+        self._wake = asyncio.Event()
+        await self.start(warm=self.mode == "live")
+        if self.tracker is not None:
+            self.tracker.start()
+        intake = asyncio.create_task(self._intake(approvals_q))
+        try:
+            await self._dispatch()
+        finally:
+            intake.cancel()
+            for t in list(self._tasks):
+                t.cancel()
+            await self.aclose()
@@ -0,0 +1,206 @@
+# order_tracker.py — order lifecycle from the broker's trade_updates stream, REST polling as fallback
+"""
+``OMSRouter`` registers every live order here before POSTing it (with a generated
+``client_order_id``), and the tracker turns broker updates into ``Execution`` events:
+
+- websocket: ``{base host}/stream``, ``listen`` on ``trade_updates``; each ``fill`` /
+  ``partial_fill`` event carries the execution's own price and quantity
+- polling: open orders are fetched by ``client_order_id`` while the stream is down, when
+  an order has been quiet for ``ORDER_STALE_SEC``, and once after every (re)connect
+
+Both paths feed ``on_order`` with the broker's order snapshot. Fills are booked from the
+cumulative ``filled_qty`` so a duplicate or late update (stream vs. poll race) never books
+twice; an update that skipped a partial fill is priced from ``filled_avg_price``.
+Cancelled/rejected/expired orders end without an Execution for the unfilled rest.
+"""
+import asyncio, json, sys, time, uuid
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlsplit
+
+import websockets
+
+from config import SETTINGS
+from events import Execution
+from tracer import TRACER
+
+TERMINAL = frozenset({"filled", "canceled", "expired", "rejected", "done_for_day"})
+FILL_EVENTS = frozenset({"fill", "partial_fill"})
+
+
+def log(*a): print("[ORDERS]", *a, file=sys.stderr)
+
+
+def stream_url_for(base: str) -> str:
+    """Trading stream for a REST base, e.g. https://paper-api.alpaca.markets/v2 -> wss://paper-api.alpaca.markets/stream."""
+    u = urlsplit(base)
+    return f"{'wss' if u.scheme == 'https' else 'ws'}://{u.netloc}/stream"
+
+
+def _num(v) -> Optional[float]:
+    try:
+        return float(v) if v not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class TrackedOrder:
+    client_order_id: str
+    symbol: str
+    side: str
+    qty: int
+    reason: str
+    legs: tuple = ()                # netted order: per-trigger legs, copied onto every fill
+    order_id: Optional[str] = None
+    status: str = "pending_new"
+    filled_qty: int = 0
+    notional: float = 0.0           # sum of booked fill qty * price
+    posted: Optional[bool] = None   # None: POST in flight, False: no answer (timeout), True: accepted
+    trace: object = None            # the OrderApproved, for its stage stamps (TRACE)
+    updated: float = field(default_factory=time.monotonic)
+
+    @property
+    def avg_price(self) -> float:
+        return self.notional / self.filled_qty if self.filled_qty else 0.0
+
+
+class OrderTracker:
+    def __init__(self, exec_q: asyncio.Queue, oms, stream_url: Optional[str] = None):
+        self.exec_q = exec_q
+        self.oms = oms  # pooled client, base URL, credentials and current mode
+        self.stream_url = stream_url or SETTINGS.trade_stream_url or stream_url_for(oms.base)
+        self.orders: dict[str, TrackedOrder] = {}
+        self._by_id: dict[str, str] = {}  # broker order id -> client_order_id
+        self.connected = False
+        self.stream_updates = 0
+        self.poll_updates = 0
+        self._tasks: list[asyncio.Task] = []
+
+    # ---- registration ----
+    def track(self, symbol: str, side: str, qty: int, reason: str = "", legs: tuple = (), trace=None) -> TrackedOrder:
+        coid = f"tt-{(reason or 'order').lower()}-{uuid.uuid4().hex[:20]}"
+        o = self.orders[coid] = TrackedOrder(coid, symbol, side, qty, reason, legs, trace=trace)
+        return o
+
+    def forget(self, coid: str):
+        o = self.orders.pop(coid, None)
+        if o is not None and o.order_id:
+            self._by_id.pop(o.order_id, None)
+
+    # ---- updates ----
+    async def on_order(self, order: dict, fill_price: Optional[float] = None, fill_qty: Optional[float] = None):
+        """Apply a broker order snapshot; puts an Execution on exec_q for newly filled quantity."""
+        coid = order.get("client_order_id") or self._by_id.get(order.get("id"))
+        o = self.orders.get(coid)
+        if o is None:
+            return  # not ours, or already finished
+        if order.get("id"):
+            o.order_id = order["id"]
+            self._by_id[o.order_id] = coid
+        o.updated = time.monotonic()
+        filled = int(_num(order.get("filled_qty")) or 0)
+        delta = filled - o.filled_qty
+        if delta > 0:
+            avg = _num(order.get("filled_avg_price"))
+            if fill_price is not None and fill_qty == delta:
+                px = fill_price
+            elif avg:
+                px = (avg * filled - o.notional) / delta  # price of the fills we haven't booked
+            else:
+                px = fill_price or 0.0
+            o.filled_qty = filled
+            o.notional += px * delta
+            status = "filled" if filled >= o.qty else "partially_filled"
+            e = Execution(ts_ns=time.time_ns(), symbol=o.symbol, side=o.side, qty=delta,
+                          price=px, status=status, reason=o.reason, legs=o.legs)
+            if TRACER.enabled and o.trace is not None:
+                TRACER.on_fill(e, o.trace)
+            await self.exec_q.put(e)
+        o.status = order.get("status") or o.status
+        if o.status in TERMINAL:
+            if o.status != "filled":
+                log(f"{o.client_order_id} {o.status} with {o.filled_qty}/{o.qty} filled")
+            self.forget(coid)
+
+    # ---- websocket ----
+    async def stream(self):
+        backoff = 2.0
+        while True:
+            if self.oms.mode != "live":
+                await asyncio.sleep(1)
+                continue
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20, ping_timeout=20, close_timeout=5) as ws:
+                    await ws.send(json.dumps({"action": "auth", "key": self.oms.key, "secret": self.oms.secret}))
+                    resp = json.loads(await ws.recv())
+                    if (resp.get("data") or {}).get("status") != "authorized":
+                        raise RuntimeError(f"trade stream auth failed: {resp}")
+                    await ws.send(json.dumps({"action": "listen", "data": {"streams": ["trade_updates"]}}))
+                    json.loads(await ws.recv())  # {"stream": "listening", ...}
+                    self.connected = True
+                    backoff = 2.0
+                    log(f"Listening for trade_updates on {self.stream_url}")
+                    await self.poll_all()  # anything that changed while we were disconnected
+                    async for msg in ws:
+                        try:
+                            m = json.loads(msg)
+                        except ValueError:
+                            continue
+                        if m.get("stream") != "trade_updates":
+                            continue
+                        d = m.get("data") or {}
+                        self.stream_updates += 1
+                        fill = d.get("event") in FILL_EVENTS
+                        await self.on_order(d.get("order") or {},
+                                            _num(d.get("price")) if fill else None,
+                                            _num(d.get("qty")) if fill else None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log("Trade stream reconnect in", f"{backoff:.0f}s:", repr(e))
+            finally:
+                self.connected = False
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+
+    # ---- polling ----
+    async def poll_order(self, o: TrackedOrder):
+        url = f"{self.oms.base}/v2/orders:by_client_order_id"
+        r = await self.oms._ensure_client().get(url, params={"client_order_id": o.client_order_id})
+        if r.status_code == 404:
+            if o.posted is False:  # the POST that timed out never reached the broker
+                log(f"{o.client_order_id} unknown to the broker; dropping")
+                self.forget(o.client_order_id)
+            return
+        r.raise_for_status()
+        self.poll_updates += 1
+        await self.on_order(r.json())
+
+    async def poll_all(self, stale_only: bool = False):
+        now = time.monotonic()
+        for o in list(self.orders.values()):
+            if o.posted is None:
+                continue  # POST still in flight
+            if stale_only and o.posted and now - o.updated < SETTINGS.order_stale_sec:
+                continue
+            try:
+                await self.poll_order(o)
+            except Exception as e:
+                log(f"poll {o.client_order_id} failed: {e!r}")
+
+    async def poll(self):
+        """Fallback: every ORDER_POLL_SEC, fetch open orders (all of them while the stream is down)."""
+        while True:
+            await asyncio.sleep(SETTINGS.order_poll_sec)
+            if self.orders:
+                await self.poll_all(stale_only=self.connected)
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self.stream()), asyncio.create_task(self.poll())]
+
+    def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        self._tasks = []
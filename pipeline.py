@@ -0,0 +1,158 @@
+# pipeline.py — bounded tick -> signal -> approval -> execution queues with overflow policies
+import asyncio, collections, time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from config import SETTINGS, Settings
+from channels import ConflatingChannel
+
+POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+class BoundedStage(asyncio.Queue):
+    """``asyncio.Queue`` with a hard bound, an overflow policy and depth / wait-time metrics.
+
+    - ``block``: ``put`` waits for room (backpressure on the producer).
+    - ``drop_oldest``: ``put`` never waits; the oldest pending item is discarded.
+    - ``coalesce``: an item whose ``key`` matches a pending one replaces it in place;
+      otherwise behaves like ``block``.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, policy: str = "block",
+                 key: Optional[Callable[[Any], Any]] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown queue policy {policy!r}; expected one of {POLICIES}")
+        if policy == "coalesce" and key is None:
+            raise ValueError("coalesce policy needs a key function")
+        self.name = name
+        self.policy = policy
+        self.key = key
+        self.puts = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.wait_sum_ns = 0
+        self.wait_max_ns = 0
+        super().__init__(maxsize)
+
+    # asyncio.Queue storage hooks; entries are [enqueue_ns, item, key]
+    def _init(self, maxsize):
+        self._queue = collections.deque()
+        self._by_key: dict = {}
+
+    def _put(self, item):
+        k = self.key(item) if self.key else None
+        entry = [time.perf_counter_ns(), item, k]
+        self._queue.append(entry)
+        if k is not None:
+            self._by_key[k] = entry
+        self.puts += 1
+        if len(self._queue) > self.max_depth:
+            self.max_depth = len(self._queue)
+
+    def _get(self):
+        t_ns, item, k = self._queue.popleft()
+        if k is not None and self._by_key.get(k) is not None and self._by_key[k][1] is item:
+            del self._by_key[k]
+        wait = time.perf_counter_ns() - t_ns
+        self.wait_sum_ns += wait
+        if wait > self.wait_max_ns:
+            self.wait_max_ns = wait
+        self.delivered += 1
+        return item
+
+    def _coalesce(self, item) -> bool:
+        entry = self._by_key.get(self.key(item))
+        if entry is None:
+            return False
+        entry[1] = item  # keep queue position and enqueue time, take the newer payload
+        self.coalesced += 1
+        return True
+
+    def put_nowait(self, item):
+        if self.policy == "coalesce" and self._coalesce(item):
+            return
+        if self.policy == "drop_oldest" and self.full():
+            t_ns, old, k = self._queue.popleft()
+            if k is not None and self._by_key.get(k) is not None and self._by_key[k][1] is old:
+                del self._by_key[k]
+            self.dropped += 1
+        super().put_nowait(item)
+
+    async def put(self, item):
+        if self.policy == "drop_oldest":
+            return self.put_nowait(item)
+        if self.policy == "coalesce" and self._coalesce(item):
+            return
+        await super().put(item)
+
+    async def put_many(self, items):
+        """Enqueue a batch without yielding while there is room; ``block`` waits only when full."""
+        for item in items:
+            if self.policy == "drop_oldest" or not self.full():
+                self.put_nowait(item)
+            else:
+                await self.put(item)
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.qsize(), "max_depth": self.max_depth, "maxsize": self.maxsize,
+            "puts": self.puts, "delivered": self.delivered,
+            "dropped": self.dropped, "coalesced": self.coalesced,
+            "wait_avg_ms": (self.wait_sum_ns / self.delivered / 1e6) if self.delivered else 0.0,
+            "wait_max_ms": self.wait_max_ns / 1e6,
+        }
+
+
+def signal_key(sig):
+    """Coalesce repeated signals of the same trigger and side for a symbol."""
+    return (sig.symbol, sig.reason, sig.side)
+
+
+def make_stage(name: str, spec: str, key=None):
+    """Build a stage from a ``policy[:maxsize]`` spec, e.g. ``block:1024`` or ``conflate``."""
+    policy, _, size = spec.partition(":")
+    policy = policy.strip().lower().replace("-", "_")
+    if policy == "conflate":
+        return ConflatingChannel()
+    return BoundedStage(name, int(size or 1024), policy, key=key if policy == "coalesce" else None)
+
+
+@dataclass
+class Pipeline:
+    ticks: Any
+    signals: BoundedStage
+    approvals: BoundedStage
+    exec: BoundedStage
+
+    def stages(self) -> dict:
+        return {"ticks": self.ticks, "signals": self.signals, "approvals": self.approvals, "exec": self.exec}
+
+    def metrics(self) -> dict:
+        return {name: st.stats() for name, st in self.stages().items()}
+
+    def format_metrics(self) -> str:
+        parts = []
+        for name, m in self.metrics().items():
+            if "depth" in m:
+                parts.append(f"{name}={m['depth']}/{m['maxsize']} max={m['max_depth']} drop={m['dropped']} "
+                             f"coal={m['coalesced']} wait={m['wait_avg_ms']:.2f}/{m['wait_max_ms']:.2f}ms")
+            else:
+                parts.append(f"{name}=conflate pend={m['pending']} conflated={m['conflated']} drop={m['dropped']}")
+        return " | ".join(parts)
+
+
+def build_pipeline(settings: Settings = SETTINGS, **overrides: str) -> Pipeline:
+    """Create the four stages from ``settings.pipe_*`` specs (keyword overrides win)."""
+    specs = {
+        "ticks": settings.pipe_ticks, "signals": settings.pipe_signals,
+        "approvals": settings.pipe_approvals, "exec": settings.pipe_exec,
+        **overrides,
+    }
+    return Pipeline(
+        ticks=make_stage("ticks", specs["ticks"]),
+        signals=make_stage("signals", specs["signals"], key=signal_key),
+        approvals=make_stage("approvals", specs["approvals"], key=signal_key),
+        exec=make_stage("exec", specs["exec"]),
+    )
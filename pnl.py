@@ -0,0 +1,154 @@
+# pnl.py — vectorized average-cost / flip-aware PnL over a whole fill history
+"""
+Per-fill columns with exactly the semantics of the dashboards' trade replay loop:
+
+- fills with price 0 (demo orders) are ignored: pnl/entry/unrealized are 0 and the open
+  position is unchanged
+- a fill against the open position realizes (price - avg) * min(|fill|, |pos|) (sign-adjusted);
+  crossing through zero re-enters the remainder at the fill price
+- a same-direction fill (or any fill from flat) moves the average entry to the size-weighted mean
+- unrealized is marked at the fill's own price; cumulative = cumsum(realized) + unrealized
+
+The average entry follows a first-order linear recurrence ``avg_k = a_k * avg_{k-1} + b_k``
+(a = 1 on reductions, |pos|/|pos'| on adds, 0 on opens/flips). Opens and flips cut it into
+independent segments, each solved with a log-space cumulative product and a cumulative sum.
+If a segment's product underflows the float range the scalar loop is used instead.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+LOG_LIMIT = 500.0  # exp(±500) stays comfortably inside float64
+
+
+@dataclass
+class PnLColumns:
+    realized: np.ndarray      # per-fill realized PnL ("pnl" in the dashboards)
+    entry_price: np.ndarray   # average entry after the fill (0 for ignored fills)
+    unrealized: np.ndarray    # open PnL marked at the fill price
+    cumulative: np.ndarray    # cumsum(realized) + unrealized
+    position: np.ndarray      # open position after the fill (ignored fills excluded)
+
+
+def _signed_qty(side, qty, price):
+    side = np.asarray(side)
+    if side.dtype.kind in "iuf":
+        sgn = np.where(side >= 0, 1.0, -1.0)
+    else:
+        sgn = np.where(side == "BUY", 1.0, -1.0)
+    qty = np.asarray(qty, dtype=np.float64)
+    price = np.asarray(price, dtype=np.float64)
+    valid = price != 0
+    return np.where(valid, sgn * qty, 0.0), price, valid
+
+
+def _coefficients(delta, price, valid):
+    pos = np.cumsum(delta)
+    prev = pos - delta
+    ap, ad = np.abs(prev), np.abs(delta)
+    s_prev, s_delta = np.sign(prev), np.sign(delta)
+    opens = valid & (prev == 0)
+    adds = valid & (prev != 0) & (s_delta == s_prev)
+    closes = valid & (prev != 0) & (s_delta == -s_prev)
+    flips = closes & (ad > ap)
+    a = np.ones_like(price)
+    b = np.zeros_like(price)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = np.where(adds, ap / (ap + ad), a)
+        b = np.where(adds, ad * price / (ap + ad), b)
+    reset = opens | flips
+    a[reset] = 0.0
+    b[reset] = price[reset]
+    return a, b, pos, prev, closes
+
+
+def _scan_scalar(a, b) -> np.ndarray:
+    out = np.empty_like(b)
+    x = 0.0
+    for k, (ak, bk) in enumerate(zip(a.tolist(), b.tolist())):
+        x = ak * x + bk
+        out[k] = x
+    return out
+
+
+def _segmented_cumsum(x: np.ndarray, starts: np.ndarray, seg_start: np.ndarray) -> np.ndarray:
+    """Cumulative sum restarting at each index in ``starts`` (rows before starts[0] included).
+
+    The previous segment's total is knocked off at every start and each segment is then
+    rebased on its exact first value, so rounding never carries between segments and the
+    running sum stays at the magnitude of the current segment.
+    """
+    if not len(starts):
+        return np.cumsum(x)
+    adj = x.copy()
+    totals = np.add.reduceat(x, starts)  # totals[i] = sum over [starts[i], starts[i+1])
+    adj[starts[0]] -= x[:starts[0]].sum()
+    adj[starts[1:]] -= totals[:-1]
+    cs = np.cumsum(adj)
+    out = cs - (cs[seg_start] - x[seg_start])
+    head = starts[0]
+    out[:head] = np.cumsum(x[:head])
+    return out
+
+
+def linear_scan(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """x_k = a_k * x_{k-1} + b_k with x_{-1} = 0, for a_k in [0, 1]."""
+    n = len(a)
+    if n == 0:
+        return np.empty(0)
+    reset = a == 0
+    starts = np.flatnonzero(reset)
+    seg_start = np.zeros(n, dtype=np.int64)
+    if len(starts):
+        seg_start[starts] = starts
+        seg_start = np.maximum.accumulate(seg_start)
+    with np.errstate(divide="ignore"):
+        la = np.where(reset, 0.0, np.log(np.where(reset, 1.0, a)))
+    L = _segmented_cumsum(la, starts, seg_start)   # log prod of a over (segment start, k]
+    if L.min() < -LOG_LIMIT:
+        return _scan_scalar(a, b)
+    return np.exp(L) * _segmented_cumsum(b * np.exp(-L), starts, seg_start)
+
+
+def avg_cost_pnl(side, qty, price) -> PnLColumns:
+    """Vectorized replay of a time-ordered fill history (see module docstring)."""
+    delta, price, valid = _signed_qty(side, qty, price)
+    if len(delta) == 0:
+        e = np.empty(0)
+        return PnLColumns(e, e, e, e, e)
+    a, b, pos, prev, closes = _coefficients(delta, price, valid)
+    avg = linear_scan(a, b)
+    avg_before = np.concatenate(([0.0], avg[:-1]))
+    close_qty = np.minimum(np.abs(delta), np.abs(prev))
+    realized = np.where(closes, (price - avg_before) * close_qty * np.sign(prev), 0.0)
+    entry = np.where(valid & ((delta != 0) | (prev == 0)), avg, 0.0)  # 0-qty fills on an open position show no entry
+    unrealized = np.where(valid & (pos != 0), (price - avg) * pos, 0.0)
+    return PnLColumns(realized, entry, unrealized, np.cumsum(realized) + unrealized, pos)
+
+
+def avg_cost_pnl_scalar(side, qty, price) -> PnLColumns:
+    """Reference loop (the dashboards' original per-row replay) on plain arrays."""
+    delta_all, price, valid = _signed_qty(side, qty, price)
+    n = len(price)
+    realized, entry, unreal, position = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+    pos, vwap = 0.0, 0.0
+    for k in range(n):
+        if not valid[k]:
+            position[k] = pos
+            continue
+        px, delta = price[k], delta_all[k]
+        if pos != 0 and ((pos > 0 and delta < 0) or (pos < 0 and delta > 0)):
+            close_qty = min(abs(delta), abs(pos))
+            realized[k] = (px - vwap) * close_qty if pos > 0 else (vwap - px) * close_qty
+            entry[k] = vwap
+        if pos == 0 or (pos > 0 and delta > 0) or (pos < 0 and delta < 0):
+            vwap = (abs(pos) * vwap + abs(delta) * px) / (abs(pos) + abs(delta)) if (abs(pos) + abs(delta)) > 0 else px
+            entry[k] = vwap
+        elif abs(delta) > abs(pos):
+            vwap = px
+            entry[k] = vwap
+        pos += delta
+        position[k] = pos
+        if pos != 0:
+            unreal[k] = (px - vwap) * abs(pos) if pos > 0 else (vwap - px) * abs(pos)
+    return PnLColumns(realized, entry, unreal, np.cumsum(realized) + unreal, position)
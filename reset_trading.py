@@ -5,10 +5,13 @@ Programmatically trigger zero-out and fresh start
 """
 import sys
 import time
-import json
 import pathlib
 from typing import Optional
 
+from ledger import LedgerFollower
+from config import SETTINGS
+from live_state import read_state
+
 class TradingResetController:
     """Controller for managing trading day resets"""
     
@@ -21,25 +24,17 @@ class TradingResetController:
     def get_current_state(self) -> Optional[dict]:
         """Read current strategy state"""
         try:
-            return json.loads(self.state_file.read_text())
+            return read_state(self.runtime, SETTINGS.symbol)
         except Exception as e:
             print(f"Warning: Could not read state: {e}")
             return None
     
     def get_current_position(self) -> Optional[int]:
-        """Calculate current position from trades log"""
+        """Current position from the trades log (via the ledger checkpoint + new fills)"""
         try:
-            position = 0
-            with self.trades_file.open("r") as f:
-                for line in f:
-                    trade = json.loads(line.strip())
-                    qty = trade.get("qty", 0)
-                    side = trade.get("side", "")
-                    if side == "BUY":
-                        position += qty
-                    elif side == "SELL":
-                        position -= qty
-            return position
+            if not self.trades_file.exists():
+                raise FileNotFoundError(self.trades_file)
+            return LedgerFollower(self.trades_file).poll().total_position()
         except Exception as e:
             print(f"Warning: Could not calculate position: {e}")
             return None
@@ -0,0 +1,110 @@
+# ring_buffer.py — preallocated (timestamp, value) ring for rolling trigger windows
+from array import array
+
+
+class RingBuffer:
+    """Fixed-capacity ring of (ts, value) pairs backed by two ``array('d')`` buffers.
+
+    ``append``, ``expire_before`` (amortised), ``first``/``last`` and indexing are O(1) and never
+    copy the window. Used for the T11 slow-trend history; any rolling-window trigger (T15, ATR)
+    can share it. If a window ever outlives the preallocated capacity the buffers grow by
+    doubling rather than silently dropping the oldest samples.
+    """
+
+    __slots__ = ("_ts", "_val", "_cap", "_head", "_len")
+
+    def __init__(self, capacity: int = 64):
+        self._cap = max(1, int(capacity))
+        self._ts = array("d", bytes(8 * self._cap))
+        self._val = array("d", bytes(8 * self._cap))
+        self._head = 0
+        self._len = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def _grow(self):
+        ts, val = self.ts_list(), self.values()
+        self._cap *= 2
+        self._ts = array("d", bytes(8 * self._cap))
+        self._val = array("d", bytes(8 * self._cap))
+        self._ts[:len(ts)] = array("d", ts)
+        self._val[:len(val)] = array("d", val)
+        self._head = 0
+
+    def append(self, ts: float, value: float):
+        if self._len == self._cap:
+            self._grow()
+        i = (self._head + self._len) % self._cap
+        self._ts[i] = ts
+        self._val[i] = value
+        self._len += 1
+
+    def popleft(self) -> tuple[float, float]:
+        if not self._len:
+            raise IndexError("pop from empty RingBuffer")
+        h = self._head
+        self._head = (h + 1) % self._cap
+        self._len -= 1
+        return self._ts[h], self._val[h]
+
+    def expire_before(self, cutoff: float) -> int:
+        """Drop samples with ts < cutoff from the front; return how many were dropped."""
+        n = 0
+        ts, cap = self._ts, self._cap
+        while self._len and ts[self._head] < cutoff:
+            self._head = (self._head + 1) % cap
+            self._len -= 1
+            n += 1
+        return n
+
+    def clear(self):
+        self._head = 0
+        self._len = 0
+
+    def reset(self, ts: float, value: float):
+        """Restart the window at a single sample (e.g. after a trigger fires)."""
+        self.clear()
+        self.append(ts, value)
+
+    def first(self) -> tuple[float, float]:
+        if not self._len:
+            raise IndexError("empty RingBuffer")
+        return self._ts[self._head], self._val[self._head]
+
+    def first_value(self) -> float:
+        if not self._len:
+            raise IndexError("empty RingBuffer")
+        return self._val[self._head]
+
+    def last(self) -> tuple[float, float]:
+        if not self._len:
+            raise IndexError("empty RingBuffer")
+        i = (self._head + self._len - 1) % self._cap
+        return self._ts[i], self._val[i]
+
+    def __getitem__(self, k: int) -> tuple[float, float]:
+        if k < 0:
+            k += self._len
+        if not 0 <= k < self._len:
+            raise IndexError("RingBuffer index out of range")
+        i = (self._head + k) % self._cap
+        return self._ts[i], self._val[i]
+
+    def __iter__(self):
+        for k in range(self._len):
+            i = (self._head + k) % self._cap
+            yield self._ts[i], self._val[i]
+
+    def ts_list(self) -> list[float]:
+        return [t for t, _ in self]
+
+    def values(self) -> list[float]:
+        return [v for _, v in self]
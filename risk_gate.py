@@ -1,82 +1,84 @@
 import asyncio, time
 from events import OrderSignal, OrderApproved
 from config import SETTINGS
+from clock import WALL_CLOCK
+from ledger import Ledger
+from netting import SignalNetter
+from tracer import TRACER
 
 class RiskGate:
-    def __init__(self):
-        self.position = 0
+    def __init__(self, clock=None, settings=None, symbol: str | None = None):
+        self.clock = clock or WALL_CLOCK
+        self.settings = settings or SETTINGS  # per-trial Settings in sweeps
+        # position / avg entry / realized PnL live in the ledger (per symbol, per trigger)
+        self.ledger = Ledger(default_symbol=symbol or self.settings.symbol)
+        self.book = self.ledger.book()
         self.daily_pnl = 0.0
-        self._realized_pnl = 0.0
-        self._avg_price = 0.0  # average entry price of current open position
         self._last_price = None
         self.last_order_ts = 0.0
+        # optional: one netted order per symbol per beat / window instead of one per signal
+        S = self.settings
+        self.netter = SignalNetter(S.net_window_ms / 1000.0, self.clock) if S.net_signals else None
 
-    async def run(self, signals_q: asyncio.Queue, approvals_q: asyncio.Queue):
-        while True:
-            sig: OrderSignal = await signals_q.get()
-            now = time.time()
-            # throttle
-            if now - self.last_order_ts < 1.0 / SETTINGS.order_throttle_per_sec:
-                continue
-            # position check
-            new_pos = self.position + (sig.qty if sig.side == "BUY" else -sig.qty)
-            if abs(new_pos) > SETTINGS.max_position:
-                continue
-            # daily loss check (in demo we don't mark-to-market; OMS updates pnl on fills)
-            if self.daily_pnl <= -SETTINGS.daily_max_loss:
-                continue
-            self.last_order_ts = now
-            await approvals_q.put(OrderApproved(
-                ts_ns=sig.ts_ns, symbol=sig.symbol, side=sig.side, qty=sig.qty, reason=sig.reason
-            ))
+    @property
+    def position(self) -> int:
+        return self.book.position
 
-    def on_fill(self, side: str, qty: int, price: float):
-        """Update position, avg price, and realized PnL on execution."""
-        if price is None:
-            price = 0.0
-        delta = qty if side == "BUY" else -qty
-        new_pos = self.position + delta
+    @property
+    def _avg_price(self) -> float:
+        return self.book.avg_price  # average entry price of current open position
+
+    @property
+    def _realized_pnl(self) -> float:
+        return self.book.realized
 
-        # If adding to same-direction position, adjust average price
-        if self.position == 0 or (self.position > 0 and delta > 0) or (self.position < 0 and delta < 0):
-            # increasing exposure in same direction
-            abs_pos = abs(self.position)
-            if abs_pos + abs(delta) > 0:
-                # compute new weighted average price
-                self._avg_price = (
-                    (self._avg_price * abs_pos + price * abs(delta)) / (abs_pos + abs(delta))
-                ) if abs_pos > 0 else price
+    def check(self, sig: OrderSignal, now: float) -> OrderApproved | None:
+        """Apply throttle, position and daily-loss limits; return the approval or None."""
+        S = self.settings
+        # throttle
+        if now - self.last_order_ts < 1.0 / S.order_throttle_per_sec:
+            return None
+        # position check
+        new_pos = self.position + (sig.qty if sig.side == "BUY" else -sig.qty)
+        if abs(new_pos) > S.max_position:
+            return None
+        # daily loss check (in demo we don't mark-to-market; OMS updates pnl on fills)
+        if self.daily_pnl <= -S.daily_max_loss:
+            return None
+        self.last_order_ts = now
+        appr = OrderApproved(
+            ts_ns=sig.ts_ns, symbol=sig.symbol, side=sig.side, qty=sig.qty, reason=sig.reason, legs=sig.legs
+        )
+        if TRACER.enabled:
+            TRACER.on_approval(appr, sig)
+        return appr
+
+    async def run(self, signals_q: asyncio.Queue, approvals_q: asyncio.Queue):
+        if self.netter is not None:
+            async for sigs in self.netter.batches(signals_q):
+                for sig in sigs:
+                    appr = self.check(sig, self.clock.time())
+                    if appr is not None:
+                        await approvals_q.put(appr)
         else:
-            # Reducing or flipping position: realize PnL on the closed shares
-            close_qty = min(abs(qty), abs(self.position))
-            if self.position > 0:
-                # closing part of a long
-                self._realized_pnl += (price - self._avg_price) * close_qty
-            elif self.position < 0:
-                # closing part of a short
-                self._realized_pnl += (self._avg_price - price) * close_qty
-            # If we fully crossed through zero, set avg_price to fill price for the remainder
-            if abs(delta) > abs(self.position):
-                # flipped to the other side; reset avg to entry of new side
-                remainder = abs(delta) - abs(self.position)
-                if remainder > 0:
-                    self._avg_price = price
+            while True:
+                sig: OrderSignal = await signals_q.get()
+                appr = self.check(sig, self.clock.time())
+                if appr is not None:
+                    await approvals_q.put(appr)
 
-        self.position = new_pos
+    def on_fill(self, side: str, qty: int, price: float, reason: str = "", symbol: str | None = None, legs=()):
+        """Update position, avg price, and realized PnL on execution."""
+        self.ledger.apply(side, qty, price, reason, symbol, legs)
 
     def update_mark_to_market(self, last_price: float | None):
         """Recompute daily PnL as realized + unrealized based on last price."""
         self._last_price = last_price if isinstance(last_price, (int, float)) else None
-        unreal = 0.0
-        if self._last_price is not None and self.position != 0:
-            if self.position > 0:
-                unreal = (self._last_price - self._avg_price) * self.position
-            else:
-                unreal = (self._avg_price - self._last_price) * abs(self.position)
-        self.daily_pnl = self._realized_pnl + unreal
+        self.book.last_price = self._last_price
+        self.daily_pnl = self.book.pnl()
 
     def reset_daily_pnl(self):
         """Reset daily PnL tracking for a fresh trading day."""
-        self._realized_pnl = 0.0
+        self.ledger.reset_realized()
         self.daily_pnl = 0.0
         print("[RISK] Daily PnL reset to 0.0")
@@ -10,14 +10,18 @@ from strategy_engine import StrategyEngine
 from risk_gate import RiskGate
 from oms_router import OMSRouter
 from events import Execution
+from pipeline import build_pipeline
+from tick_store import StoreWriter
+from journal import JOURNAL
+from tracer import TRACER
+from live_state import LiveState, as_state
+from candles import CandleAggregator
 from eod import eod_watcher
 from sim_feed import stream_ticks
 
 async def main():
-    ticks_q = asyncio.Queue()
-    signals_q = asyncio.Queue()
-    approvals_q = asyncio.Queue()
-    exec_q = asyncio.Queue()
+    pipe = build_pipeline()
+    ticks_q, signals_q, approvals_q, exec_q = pipe.ticks, pipe.signals, pipe.approvals, pipe.exec
 
     risk = RiskGate()
     engine = StrategyEngine(ticks_q, signals_q, risk_gate=risk)
@@ -29,6 +33,10 @@ async def main():
     # Always use SIM mode in cloud
     oms = OMSRouter(exec_q, engine=engine, mode="sim")
     (runtime / "mode.txt").write_text("sim")
+    live = LiveState(runtime / "live_state.bin", writable=True).slot(SETTINGS.symbol)
+    engine.live = live
+    live.update(mode="sim")
+    engine.candles = CandleAggregator(runtime / "bars", SETTINGS.candle_timeframes.split(","))
     
     print("[CLOUD] Starting in SIMULATOR mode")
 
@@ -61,12 +69,14 @@ async def main():
         """Reset strategy state and daily PnL tracking."""
         engine.reset_state()
         risk.reset_daily_pnl()
+        engine.publish_live()
         print("[RESET] State reset to IDLE, daily PnL cleared.")
 
     async def exec_consumer():
         while True:
             e: Execution = await exec_q.get()
-            risk.on_fill(e.side, e.qty, e.price)
+            risk.on_fill(e.side, e.qty, e.price, e.reason, legs=e.legs)
+            engine.publish_live()
             print(f"[EXEC] {e.side} {e.qty} @ {e.price:.2f}")
             
             trade_line = {
@@ -77,38 +87,36 @@ async def main():
                 "symbol": e.symbol,
                 "reason": e.reason,
             }
-            with (runtime / "trades.jsonl").open("a") as f:
-                f.write(json.dumps(trade_line) + "\n")
+            if e.legs:
+                trade_line["legs"] = [list(leg) for leg in e.legs]  # netted fill: per-trigger attribution
+            JOURNAL.append(runtime / "trades.jsonl", json.dumps(trade_line), commit=True)
 
     async def state_dumper():
+        """Slow state.json snapshot; the dashboard reads runtime/live_state.bin."""
+        if SETTINGS.state_json_sec <= 0:
+            return
         while True:
-            s = engine.state
-            state_obj = {
-                "phase": s.phase,
-                "last_price": engine.last_price,
-                "base_price": s.base_price,
-                "first_order_price": s.first_order_price,
-                "cycles": s.cycles,
-                "mode": "sim",
-                "ts": time.time(),
-            }
             try:
-                (runtime / "state.json").write_text(json.dumps(state_obj))
+                JOURNAL.replace(runtime / "state.json", json.dumps(as_state(live.values)))
             except Exception as ex:
                 print(f"[WARN] state write failed: {ex}")
-            await asyncio.sleep(1)
+            await asyncio.sleep(SETTINGS.state_json_sec)
 
     async def price_tap():
-        """Append last_price to runtime/prices.jsonl at ~2 Hz for charting."""
-        prices_path = runtime / "prices.jsonl"
-        while True:
-            if engine.last_price is not None:
-                try:
-                    with prices_path.open("a") as f:
-                        f.write(json.dumps({"ts": time.time(), "price": engine.last_price}) + "\n")
-                except Exception:
-                    pass
-            await asyncio.sleep(0.5)
+        """Append last_price to the runtime/prices tick store at ~2 Hz; close bars that went quiet."""
+        writer = StoreWriter(runtime / "prices")
+        try:
+            while True:
+                if engine.last_price is not None:
+                    try:
+                        writer.append(time.time_ns(), engine.last_price, 0)
+                    except Exception:
+                        pass
+                engine.candles.close_due(time.time_ns())
+                await asyncio.sleep(0.5)
+        finally:
+            writer.close()
+            engine.candles.close()
 
     async def reset_watcher():
         """Watch for runtime/reset.request file to trigger zero-out and reset."""
@@ -134,11 +142,12 @@ async def main():
         while True:
             risk.update_mark_to_market(engine.last_price)
             print(f"[STATUS] Pos: {risk.position} PnL: {risk.daily_pnl:.2f} Price: {engine.last_price}")
+            print(f"[PIPE] {pipe.format_metrics()}")
             await asyncio.sleep(10)
 
     # Start all tasks
     tasks = [
-        asyncio.create_task(stream_ticks(SETTINGS.symbol, ticks_q)),
+        asyncio.create_task(stream_ticks(SETTINGS.symbol, ticks_q, oms.fill_model.observe_quote)),
         asyncio.create_task(engine.run()),
         asyncio.create_task(risk.run(signals_q, approvals_q)),
         asyncio.create_task(oms.run(approvals_q)),
@@ -148,6 +157,7 @@ async def main():
         asyncio.create_task(reset_watcher()),
         asyncio.create_task(eod_watcher(flatten_all, reset_state)),
         asyncio.create_task(telemetry()),
+        asyncio.create_task(TRACER.run()),
     ]
 
     # Wait for all tasks
@@ -164,3 +174,6 @@ if __name__ == "__main__":
         asyncio.run(main())
     except KeyboardInterrupt:
         print("[CLOUD] Shutdown")
+    finally:
+        TRACER.summary()
+        JOURNAL.close()  # flush queued trades/state before exit
@@ -4,6 +4,12 @@ from strategy_engine import StrategyEngine
 from risk_gate import RiskGate
 from oms_router import OMSRouter
 from events import Execution
+from pipeline import build_pipeline
+from tick_store import StoreWriter
+from journal import JOURNAL
+from tracer import TRACER
+from live_state import LiveState, as_state, read_state
+from candles import CandleAggregator
 from eod import eod_watcher
 
 def choose_stream_fn(mode: str):
@@ -28,19 +34,23 @@ async def price_heartbeat(engine):
             print(f"[HEARTBEAT] last_price={last}")
         await asyncio.sleep(1)
 
-async def telemetry(engine, risk):
+async def telemetry(engine, risk, pipe=None, oms=None):
     """Print periodic status updates"""
     while True:
         # refresh mark-to-market using latest engine price
         risk.update_mark_to_market(engine.last_price)
         print(f"[STATUS] Position: {risk.position} PnL: {risk.daily_pnl:.2f}")
+        if pipe is not None:
+            print(f"[PIPE] {pipe.format_metrics()}")
+        if risk.netter is not None and risk.netter.signals_in:
+            print(f"[NET] {risk.netter.format_metrics()}")
+        if oms is not None and oms.dispatched:
+            print(f"[OMS] {oms.format_metrics()}")
         await asyncio.sleep(5)
 
 async def main():
-    ticks_q = asyncio.Queue()
-    signals_q = asyncio.Queue()
-    approvals_q = asyncio.Queue()
-    exec_q = asyncio.Queue()
+    pipe = build_pipeline()
+    ticks_q, signals_q, approvals_q, exec_q = pipe.ticks, pipe.signals, pipe.approvals, pipe.exec
 
     risk = RiskGate()
     engine = StrategyEngine(ticks_q, signals_q, risk_gate=risk)
@@ -56,6 +66,10 @@ async def main():
         pass
     
     oms = OMSRouter(exec_q, engine=engine, mode=initial_mode)
+    live = LiveState(runtime / "live_state.bin", writable=True).slot(SETTINGS.symbol)
+    engine.live = live
+    live.update(mode=initial_mode)
+    engine.candles = CandleAggregator(runtime / "bars", SETTINGS.candle_timeframes.split(","))
     if SETTINGS.enable_gpt5_for_all_clients:
         print("[FEATURE] GPT-5 for all clients: ENABLED")
     else:
@@ -94,16 +108,18 @@ async def main():
         """Reset strategy state and daily PnL tracking."""
         engine.reset_state()
         risk.reset_daily_pnl()
+        engine.publish_live()
         print("[RESET] State reset to IDLE, daily PnL cleared.")
 
     async def exec_consumer():
         while True:
             e: Execution = await exec_q.get()
             # apply pnl/position updates in risk (very simplified here)
-            risk.on_fill(e.side, e.qty, e.price)
+            risk.on_fill(e.side, e.qty, e.price, e.reason, legs=e.legs)
+            engine.publish_live()
             print(f"[EXEC] {e.side} {e.qty} @ {e.price:.2f}")
             # append to trades log (epoch seconds for dashboard)
-            runtime = pathlib.Path("runtime"); runtime.mkdir(exist_ok=True)
+            runtime = pathlib.Path("runtime")
             trade_line = {
                 "ts": e.ts_ns / 1_000_000_000,
                 "side": e.side,
@@ -112,53 +128,36 @@ async def main():
                 "symbol": e.symbol,
                 "reason": e.reason,
             }
-            with (runtime / "trades.jsonl").open("a") as f:
-                f.write(json.dumps(trade_line) + "\n")
+            if e.legs:
+                trade_line["legs"] = [list(leg) for leg in e.legs]  # netted fill: per-trigger attribution
+            JOURNAL.append(runtime / "trades.jsonl", json.dumps(trade_line), commit=True)
 
     async def state_dumper():
-        runtime = pathlib.Path("runtime"); runtime.mkdir(exist_ok=True)
+        """Slow state.json snapshot for humans/jq; live readers use runtime/live_state.bin."""
+        if SETTINGS.state_json_sec <= 0:
+            return
         while True:
-            s = engine.state
-            mode = "live"
-            try:
-                mtxt = (runtime / "mode.txt").read_text().strip()
-                if mtxt:
-                    mode = mtxt
-            except Exception:
-                pass
-            # simple tick counter derived from engine price change count could be added; instead we track last tick time
-            try:
-                last_tick_age = time.time() - (engine._last_tick_ts)
-            except Exception:
-                last_tick_age = None
-            state_obj = {
-                "phase": s.phase,
-                "last_price": engine.last_price,
-                "base_price": s.base_price,
-                "first_order_price": s.first_order_price,
-                "cycles": s.cycles,
-                "mode": mode,
-                "last_tick_age": last_tick_age,
-                "ts": time.time(),
-            }
             try:
-                (runtime / "state.json").write_text(json.dumps(state_obj))
+                JOURNAL.replace(runtime / "state.json", json.dumps(as_state(live.values)))
             except Exception as ex:
                 print("[WARN] state write failed", ex)
-            await asyncio.sleep(1)
+            await asyncio.sleep(SETTINGS.state_json_sec)
 
     async def price_tap():
-        """Append last_price to runtime/prices.jsonl at ~2 Hz for charting/candles."""
-        runtime = pathlib.Path("runtime"); runtime.mkdir(exist_ok=True)
-        prices_path = runtime / "prices.jsonl"
-        while True:
-            if engine.last_price is not None:
-                try:
-                    with prices_path.open("a") as f:
-                        f.write(json.dumps({"ts": time.time(), "price": engine.last_price}) + "\n")
-                except Exception:
-                    pass
-            await asyncio.sleep(0.5)
+        """Append last_price to the runtime/prices tick store at ~2 Hz; close bars that went quiet."""
+        writer = StoreWriter(pathlib.Path("runtime") / "prices")
+        try:
+            while True:
+                if engine.last_price is not None:
+                    try:
+                        writer.append(time.time_ns(), engine.last_price, 0)
+                    except Exception:
+                        pass
+                engine.candles.close_due(time.time_ns())
+                await asyncio.sleep(0.5)
+        finally:
+            writer.close()
+            engine.candles.close()
 
     (runtime / "mode.txt").write_text(initial_mode)
 
@@ -175,11 +174,13 @@ async def main():
                 pass
         fn = choose_stream_fn(mode)
         print(f"[MODE] Using {'SIMULATOR' if mode=='sim' else 'LIVE'} feed")
-        stream_task = asyncio.create_task(fn(SETTINGS.symbol, ticks_q))
+        stream_task = asyncio.create_task(fn(SETTINGS.symbol, ticks_q, oms.fill_model.observe_quote))
 
     async def mode_watcher():
         nonlocal current_mode
         req_path = runtime / "mode.request"
+        mode_path = runtime / "mode.txt"
+        mode_mtime = None
         while True:
             try:
                 if req_path.exists():
@@ -188,9 +189,17 @@ async def main():
                         print(f"[MODE] Switching from {current_mode} to {req}")
                         current_mode = req
                         oms.mode = current_mode  # Update OMS mode
-                        (runtime / "mode.txt").write_text(current_mode)
+                        live.update(mode=current_mode)
+                        mode_path.write_text(current_mode)
                         await start_stream(current_mode)
                         req_path.unlink(missing_ok=True)
+                # the live adapter rewrites mode.txt on its own SIM fallback; only re-read it when it changed
+                mtime = mode_path.stat().st_mtime_ns
+                if mtime != mode_mtime:
+                    mode_mtime = mtime
+                    mtxt = mode_path.read_text().strip()
+                    if mtxt and mtxt != live.values["mode"]:
+                        live.update(mode=mtxt)
             except Exception as ex:
                 print("[WARN] mode watcher:", ex)
             await asyncio.sleep(1)
@@ -292,7 +301,7 @@ async def main():
                     print("="*70)
                     state = None
                     try:
-                        state = json.loads((runtime / "state.json").read_text())
+                        state = read_state(runtime, SETTINGS.symbol)
                     except:
                         pass
                     
@@ -345,7 +354,7 @@ async def main():
     enable_interactive = os.getenv("ENABLE_INTERACTIVE", "true").lower() in ("1","true","yes","on")
     
     tasks = [
-        asyncio.create_task(telemetry(engine, risk)),
+        asyncio.create_task(telemetry(engine, risk, pipe, oms)),
         stream_task,
         asyncio.create_task(mode_watcher()),
         asyncio.create_task(reset_watcher()),
@@ -358,6 +367,7 @@ async def main():
         asyncio.create_task(price_tap()),
         asyncio.create_task(eod_watcher(flatten_all, reset_state)),
         asyncio.create_task(price_heartbeat(engine)),
+        asyncio.create_task(TRACER.run()),
     ]
     
     # Add interactive command interface if enabled
@@ -377,3 +387,6 @@ if __name__ == "__main__":
         asyncio.run(main())
     except KeyboardInterrupt:
         pass
+    finally:
+        TRACER.summary()
+        JOURNAL.close()  # flush queued trades/state before exit
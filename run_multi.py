@@ -6,12 +6,20 @@ from strategy_engine import StrategyEngine
 from risk_gate import RiskGate
 from oms_router import OMSRouter
 from events import Execution
+from pipeline import build_pipeline
+from tick_store import StoreWriter
+from journal import JOURNAL
+from tracer import TRACER
+from live_state import LiveState
+from candles import CandleAggregator
+from config import SETTINGS
 
 from alpaca_adapter import stream_ticks as stream_ticks_alpaca
 from sim_feed import stream_ticks as stream_ticks_sim
 
 RUNTIME = pathlib.Path("runtime"); RUNTIME.mkdir(exist_ok=True)
 CONFIG = json.loads(pathlib.Path("symbols.json").read_text())
+LIVE = LiveState(RUNTIME / "live_state.bin", writable=True)  # one slot per symbol
 
 DEFAULT_LOGIC = {
     "beat_sec_rth": 14,
@@ -34,12 +42,10 @@ async def launch_symbol(sym_cfg: Dict[str, Any], venue_cfg: Dict[str, Any]):
     symbol = sym_cfg["symbol"]; venue = sym_cfg["venue"]; venue_type = venue_cfg["type"]
     print(f"[BOOT] {symbol}@{venue} ({venue_type})")
 
-    ticks_q = asyncio.Queue()
-    signals_q = asyncio.Queue()
-    approvals_q = asyncio.Queue()
-    exec_q = asyncio.Queue()
+    pipe = build_pipeline()
+    ticks_q, signals_q, approvals_q, exec_q = pipe.ticks, pipe.signals, pipe.approvals, pipe.exec
 
-    risk = RiskGate()
+    risk = RiskGate(symbol=symbol)
     eng = StrategyEngine(ticks_q, signals_q, risk_gate=risk)
     eng.symbol = symbol
     eng.paused = False
@@ -47,6 +53,9 @@ async def launch_symbol(sym_cfg: Dict[str, Any], venue_cfg: Dict[str, Any]):
     # Determine mode for OMS (default to sim for multi-symbol)
     mode = "sim" if venue_type in ("stub_hk", "stub_eu") else "live"
     oms = OMSRouter(exec_q, engine=eng, mode=mode)
+    eng.live = LIVE.slot(symbol)
+    eng.live.update(mode=mode)
+    eng.candles = CandleAggregator(RUNTIME / f"bars_{symbol}", SETTINGS.candle_timeframes.split(","))
 
     if "risk" in sym_cfg:
         risk.max_position   = sym_cfg["risk"].get("max_position", getattr(risk, "max_position", 0))
@@ -71,41 +80,35 @@ async def launch_symbol(sym_cfg: Dict[str, Any], venue_cfg: Dict[str, Any]):
     }
     stream_fn = ADAPTERS.get(venue, stream_ticks_sim)
 
-    STATE_PATH  = RUNTIME / f"state_{symbol}.json"
-    PRICES_PATH = RUNTIME / f"prices_{symbol}.jsonl"
+    PRICES_PATH = RUNTIME / f"prices_{symbol}"  # tick_store segment dir
 
     async def telemetry():
-        import json, time as _t
+        # per-symbol state goes to LIVE on every change; only queue metrics are logged here
         while True:
-            snap = {
-                "ts": _t.time(),
-                "symbol": symbol,
-                "last_price": eng.last_price,
-                "phase": eng.state.phase,
-                "cycles": eng.state.cycles,
-                "position": getattr(risk, "position", 0),
-            }
-            try:
-                STATE_PATH.write_text(json.dumps(snap))
-            except Exception:
-                pass
-            await asyncio.sleep(1)
+            await asyncio.sleep(10)
+            print(f"[{symbol}] [PIPE] {pipe.format_metrics()}")
+            if oms.dispatched:
+                print(f"[{symbol}] [OMS] {oms.format_metrics()}")
 
     async def price_tap():
-        import json, time as _t
-        while True:
-            if eng.last_price is not None:
-                try:
-                    with open(PRICES_PATH, "a") as f:
-                        f.write(json.dumps({"ts": _t.time(), "price": eng.last_price}) + "\n")
-                except Exception:
-                    pass
-            await asyncio.sleep(0.5)
+        import time as _t
+        writer = StoreWriter(PRICES_PATH)
+        try:
+            while True:
+                if eng.last_price is not None:
+                    try:
+                        writer.append(_t.time_ns(), eng.last_price, 0)
+                    except Exception:
+                        pass
+                eng.candles.close_due(_t.time_ns())
+                await asyncio.sleep(0.5)
+        finally:
+            writer.close()
+            eng.candles.close()
 
     async def exec_consumer():
-        import csv, time as _t
+        import time as _t
         csv_path = RUNTIME / f"trades_{symbol}.csv"
-        header_written = csv_path.exists()
         try:
             from slack_notifier import notify
         except Exception:
@@ -118,14 +121,12 @@ async def launch_symbol(sym_cfg: Dict[str, Any], venue_cfg: Dict[str, Any]):
 
         while True:
             e: Execution = await exec_q.get()
-            risk.on_fill(e.side, e.qty, e.price)
+            risk.on_fill(e.side, e.qty, e.price, e.reason, legs=e.legs)
+            eng.publish_live()
             print(f"[{symbol}] [EXEC] {e.side} {e.qty} @ {e.price}")
             try:
-                with open(csv_path, "a", newline="") as cf:
-                    w = csv.writer(cf)
-                    if not header_written:
-                        w.writerow(["ts","side","qty","price"]); header_written = True
-                    w.writerow([_t.time(), e.side, e.qty, e.price])
+                JOURNAL.append_csv(csv_path, [_t.time(), e.side, e.qty, e.price],
+                                   header=["ts","side","qty","price"], commit=True)
                 note = explain(symbol, getattr(e, "reason", "EXEC"), None, None,
                                eng.state.phase, eng.state.cycles, eng.last_price, risk.position)
                 notify(f"[{symbol}] {note}")
@@ -133,7 +134,7 @@ async def launch_symbol(sym_cfg: Dict[str, Any], venue_cfg: Dict[str, Any]):
                 pass
 
     tasks = [
-        asyncio.create_task(stream_fn(symbol, ticks_q)),
+        asyncio.create_task(stream_fn(symbol, ticks_q, oms.fill_model.observe_quote)),
         asyncio.create_task(eng.run()),
         asyncio.create_task(risk.run(signals_q, approvals_q)),
         asyncio.create_task(oms.run(approvals_q)),
@@ -146,8 +147,12 @@ async def launch_symbol(sym_cfg: Dict[str, Any], venue_cfg: Dict[str, Any]):
 async def main():
     venues = CONFIG["venues"]
     coros = [launch_symbol(s, venues[s["venue"]]) for s in CONFIG["symbols"]]
-    await asyncio.gather(*coros)
+    await asyncio.gather(*coros, TRACER.run())
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    finally:
+        TRACER.summary()
+        JOURNAL.close()  # flush queued trades/state before exit
 PY
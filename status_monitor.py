@@ -2,85 +2,48 @@
 """
 Trading Status Monitor - Real-time display of strategy state
 """
-import json
 import time
 import pathlib
 from datetime import datetime
 from typing import Optional
 
+from ledger import LedgerFollower
+from config import SETTINGS
+from live_state import read_state
+
 def clear_screen():
     """Clear terminal screen"""
     print("\033[2J\033[H", end="")
 
 def get_state() -> Optional[dict]:
-    """Read current state"""
+    """Read current state (live state region, state.json fallback)"""
     try:
-        return json.loads(pathlib.Path("runtime/state.json").read_text())
-    except:
+        return read_state("runtime", SETTINGS.symbol)
+    except Exception:
         return None
 
+_LEDGER: Optional[LedgerFollower] = None
+
+def _ledger():
+    """Trade-log ledger, resumed from its checkpoint and advanced by the newly appended fills"""
+    global _LEDGER
+    if _LEDGER is None:
+        _LEDGER = LedgerFollower("runtime/trades.jsonl")
+    return _LEDGER.poll()
+
 def get_position() -> int:
     """Calculate position from trades"""
-    position = 0
     try:
-        with pathlib.Path("runtime/trades.jsonl").open("r") as f:
-            for line in f:
-                trade = json.loads(line.strip())
-                qty = trade.get("qty", 0)
-                side = trade.get("side", "")
-                if side == "BUY":
-                    position += qty
-                elif side == "SELL":
-                    position -= qty
-    except:
-        pass
-    return position
+        return _ledger().total_position()
+    except Exception:
+        return 0
 
 def get_pnl() -> float:
-    """Calculate approximate PnL from trades"""
-    trades = []
+    """Realized PnL from trades"""
     try:
-        with pathlib.Path("runtime/trades.jsonl").open("r") as f:
-            for line in f:
-                trades.append(json.loads(line.strip()))
-    except:
-        return 0.0
-    
-    if not trades:
+        return _ledger().total_realized()
+    except Exception:
         return 0.0
-    
-    # Simple PnL calculation
-    position = 0
-    avg_entry = 0.0
-    realized = 0.0
-    
-    for trade in trades:
-        qty = trade.get("qty", 0)
-        price = trade.get("price", 0.0)
-        side = trade.get("side", "")
-        
-        if side == "BUY":
-            if position >= 0:
-                # Adding to long or entering long
-                avg_entry = ((avg_entry * abs(position)) + (price * qty)) / (abs(position) + qty) if position > 0 else price
-                position += qty
-            else:
-                # Covering short
-                close_qty = min(qty, abs(position))
-                realized += (avg_entry - price) * close_qty
-                position += qty
-        elif side == "SELL":
-            if position <= 0:
-                # Adding to short or entering short
-                avg_entry = ((avg_entry * abs(position)) + (price * qty)) / (abs(position) + qty) if position < 0 else price
-                position -= qty
-            else:
-                # Closing long
-                close_qty = min(qty, abs(position))
-                realized += (price - avg_entry) * close_qty
-                position -= qty
-    
-    return realized
 
 def format_time(ts: float) -> str:
     """Format timestamp"""
@@ -1,10 +1,17 @@
 # strategy_engine.py
-import asyncio, time
+import asyncio, pathlib, time
 from dataclasses import dataclass
 from typing import Optional
 
 from events import Tick, OrderSignal
-from config import SETTINGS
+from config import SETTINGS, Settings
+from clock import WALL_CLOCK
+from ring_buffer import RingBuffer
+from tracer import TRACER
+
+T11_HISTORY_SEC = 15 * 60  # slow-trend price history horizon
+PAUSE_FLAG = pathlib.Path("runtime/pause.flag")  # written by the dashboards
+PAUSE_CHECK_SEC = 1.0  # tick-mode re-stats the pause flag at most this often
 
 
 @dataclass
@@ -30,41 +37,344 @@ class LadderState:
     t16_fallback_cycle: int = 0  # for T16
 
 
+def lots_from_settings(settings: Settings = SETTINGS) -> dict[str, int]:
+    return {
+        "T1": settings.lot_t1,
+        "T2": settings.lot_t2,
+        "T3": settings.lot_t3,
+        "T4": settings.lot_t4,
+        "T5": settings.lot_t5,
+        "T7": settings.lot_t7,
+        "T8": settings.lot_t8,
+        "T9": settings.lot_t9,
+        "T10": settings.lot_t10,
+        "T11": settings.lot_t11,
+        "T12": settings.lot_t12,
+        "T13": settings.lot_t13,
+        "T14": settings.lot_t14,
+        "T15": settings.lot_t15,
+        "T16": settings.lot_t16,
+    }
+
+
+class StrategyCore:
+    """Synchronous T1-T16 trigger ladder: one ``step(ts_ns, price)`` per beat.
+
+    No queues, sleeps, files or prints — the live engine, backtests and sweeps all drive
+    this same object, so they cannot drift apart.
+    """
+
+    def __init__(self, symbol: Optional[str] = None, settings: Settings = SETTINGS,
+                 lots: Optional[dict[str, int]] = None):
+        self.symbol = symbol or settings.symbol
+        self.settings = settings
+        self.lots = lots or lots_from_settings(settings)
+        self.state = LadderState()
+        self._tick_fired: set[str] = set()  # triggers already fired intrabeat since the last beat
+        # Price history for slow trend detection (T11): (timestamp, price) ring sized for 15 min of beats
+        self.price_history = RingBuffer(int(T11_HISTORY_SEC / settings.beat_sec) + 2)
+
+    def reset(self):
+        self.state = LadderState()
+        self._tick_fired = set()
+        self.price_history.clear()
+
+    def _emit(self, out: list, ts_ns: int, price: float, reason: str,
+              from_base_pts: float, from_first_pts: Optional[float]):
+        s = self.state
+        direction = from_first_pts if from_first_pts is not None else from_base_pts
+        out.append(OrderSignal(
+            ts_ns=ts_ns,
+            symbol=self.symbol,
+            side="BUY" if direction > 0 else "SELL",
+            qty=self.lots[reason],
+            reason=reason,
+            base_price=s.base_price or price,
+            first_order_price=s.first_order_price,
+            from_base_pts=from_base_pts,
+            from_first_pts=from_first_pts
+        ))
+
+    def step(self, ts_ns: int, price: float) -> list[OrderSignal]:
+        """Evaluate all 16 entry triggers for one beat at ``price``; return the signals fired."""
+        S = self.settings
+        s = self.state
+        out: list[OrderSignal] = []
+        tick_fired, self._tick_fired = self._tick_fired, set()
+        
+        # Track price history for T11 (slow trend)
+        now = ts_ns / 1e9
+        self.price_history.append(now, price)
+        # Keep only last 15 minutes of history
+        self.price_history.expire_before(now - T11_HISTORY_SEC)
+        
+        # === T14: Violent Swing (always active, any direction) ===
+        if "T14" not in tick_fired and s.base_price is not None and abs(price - s.base_price) >= S.t14_violent_swing:
+            side = "BUY" if price > s.base_price else "SELL"
+            self._emit(out, ts_ns, price, "T14", price - s.base_price, None)
+        
+        # === IDLE state initialization ===
+        if s.phase == "IDLE":
+            s.base_price = price
+            s.first_order_price = None
+            s.t3_anchor = None
+            s.t4_anchor = None
+            s.cycles = 0
+            s.phase = "T1_WINDOW"
+            s.last_beat_price = price
+            s.last_jump_dir = None
+            s.t11_start_price = price
+            s.t11_start_cycle = 0
+            s.t15_window_start = price
+            s.t15_window_start_cycle = 0
+            s.t16_fallback_cycle = 0
+            return out
+        
+        s.cycles += 1
+        from_base = price - (s.base_price or price)
+        
+        # === T8/T9: Jump Detection (directional entry) ===
+        if "T8" not in tick_fired and s.last_beat_price is not None:
+            jump = abs(price - s.last_beat_price)
+            direction = 1 if (price - s.last_beat_price) > 0 else (-1 if (price - s.last_beat_price) < 0 else 0)
+            
+            if s.last_jump_dir is None and jump >= S.t8_jump_single and direction != 0:
+                # T8: First jump detected
+                self._emit(out, ts_ns, price, "T8", from_base, None)
+                s.last_jump_dir = direction
+                s.t9_last_position_price = price
+                s.t9_last_position_side = "BUY" if direction > 0 else "SELL"
+                
+            elif s.last_jump_dir == direction and jump >= S.t9_jump2_single and direction != 0:
+                # T9: Second jump in same direction
+                self._emit(out, ts_ns, price, "T9", from_base, None)
+                s.last_jump_dir = None  # Reset after T9
+                s.t9_last_position_price = price
+                s.t9_last_position_side = "BUY" if direction > 0 else "SELL"
+        
+        # === T10: Post-5K Extension (favorable move after T7/T9) ===
+        if s.t9_last_position_price is not None and s.t9_last_position_side is not None:
+            if s.t9_last_position_side == "BUY":
+                favorable = price - s.t9_last_position_price
+                if favorable >= S.t10_favorable_move:
+                    self._emit(out, ts_ns, price, "T10", from_base, None)
+                    s.t9_last_position_price = None  # Reset
+            elif s.t9_last_position_side == "SELL":
+                favorable = s.t9_last_position_price - price
+                if favorable >= S.t10_favorable_move:
+                    self._emit(out, ts_ns, price, "T10", from_base, None)
+                    s.t9_last_position_price = None  # Reset
+        
+        # === T11: Slow Trend (65-beat window, ~15 minutes) ===
+        if len(self.price_history) >= S.t11_window_beats:
+            window_start_price = self.price_history.first_value()
+            move = abs(price - window_start_price)
+            if move >= S.t11_slow_trend:
+                side = "BUY" if price > window_start_price else "SELL"
+                self._emit(out, ts_ns, price, "T11", from_base, None)
+                # Reset window
+                self.price_history.reset(now, price)
+        
+        # === T12/T13: Counter-Position Sequence (opposite direction) ===
+        if s.last_position_side is not None and s.last_position_price is not None:
+            if not s.t12_triggered:
+                # Check for T12: counter jump
+                if s.last_position_side == "BUY":
+                    counter_move = s.last_position_price - price  # Price dropped
+                    if counter_move >= S.t12_counter_jump:
+                        self._emit(out, ts_ns, price, "T12", from_base, None)
+                        s.t12_triggered = True
+                elif s.last_position_side == "SELL":
+                    counter_move = price - s.last_position_price  # Price rose
+                    if counter_move >= S.t12_counter_jump:
+                        self._emit(out, ts_ns, price, "T12", from_base, None)
+                        s.t12_triggered = True
+            else:
+                # T13: continuation of counter move
+                if s.last_position_side == "BUY":
+                    additional = s.last_position_price - price
+                    if additional >= (S.t12_counter_jump + S.t13_counter_continue):
+                        self._emit(out, ts_ns, price, "T13", from_base, None)
+                        s.t12_triggered = False  # Reset
+                elif s.last_position_side == "SELL":
+                    additional = price - s.last_position_price
+                    if additional >= (S.t12_counter_jump + S.t13_counter_continue):
+                        self._emit(out, ts_ns, price, "T13", from_base, None)
+                        s.t12_triggered = False  # Reset
+        
+        # === T15: Low Volatility Strategy (34-beat/9-min window) ===
+        if s.t15_window_start_cycle == 0:
+            s.t15_window_start = price
+            s.t15_window_start_cycle = s.cycles
+        elif (s.cycles - s.t15_window_start_cycle) >= S.t15_low_vol_window:
+            # Check if range is below threshold
+            window_range = abs(price - s.t15_window_start)
+            if window_range <= S.t15_low_vol_threshold:
+                # Low volatility detected, check for move
+                if window_range >= S.t15_move_mark:
+                    side = "BUY" if price > s.t15_window_start else "SELL"
+                    self._emit(out, ts_ns, price, "T15", from_base, None)
+            # Reset window
+            s.t15_window_start = price
+            s.t15_window_start_cycle = s.cycles
+        
+        # === T16: Fallback Directional (after 11 beats without T1-T5) ===
+        if s.phase == "T1_WINDOW" and s.cycles >= S.t16_fallback_window:
+            if abs(from_base) >= S.t16_fallback_move:
+                side = "BUY" if from_base > 0 else "SELL"
+                self._emit(out, ts_ns, price, "T16", from_base, None)
+                s.phase = "IDLE"  # Reset after T16
+        
+        # === T1-T5 Ladder Logic ===
+        if s.phase == "T1_WINDOW":
+            if s.cycles <= 4 and abs(from_base) >= S.t1_move:
+                self._emit(out, ts_ns, price, "T1", from_base, None)
+                s.first_order_price = price
+                s.last_position_price = price
+                s.last_position_side = "BUY" if from_base > 0 else "SELL"
+                s.phase = "T2_WINDOW"
+                s.cycles = 0
+                s.t3_anchor = price
+            elif s.cycles > 4:
+                s.phase = "IDLE"
+        
+        elif s.phase == "T2_WINDOW":
+            if s.cycles <= 4 and abs(from_base) >= S.t2_hold:
+                from_first = (price - s.first_order_price) if s.first_order_price else None
+                self._emit(out, ts_ns, price, "T2", from_base, from_first)
+                s.last_position_price = price
+                s.last_position_side = "BUY" if from_base > 0 else "SELL"
+                s.phase = "T3_WINDOW"
+                s.cycles = 0
+                s.t3_anchor = price
+            elif s.cycles > 4:
+                s.phase = "IDLE"
+        
+        elif s.phase == "T3_WINDOW":
+            from_first = (price - s.first_order_price) if s.first_order_price else 0.0
+            if s.cycles <= 3 and abs(from_first) >= S.t3_move_from_t0:
+                self._emit(out, ts_ns, price, "T3", from_base, from_first)
+                s.last_position_price = price
+                s.last_position_side = "BUY" if from_first > 0 else "SELL"
+                s.phase = "T4_WINDOW"
+                s.cycles = 0
+                s.t4_anchor = price
+            elif s.cycles > 3:
+                s.phase = "IDLE"
+        
+        elif s.phase == "T4_WINDOW":
+            delta = abs(price - (s.t3_anchor or price))
+            if s.cycles <= 2 and delta >= S.t4_extra_from_t3:
+                from_first = (price - s.first_order_price) if s.first_order_price else None
+                self._emit(out, ts_ns, price, "T4", from_base, from_first)
+                s.last_position_price = price
+                s.last_position_side = "BUY" if from_base > 0 else "SELL"
+                s.phase = "T5_WINDOW"
+                s.cycles = 0
+            elif s.cycles > 2:
+                s.phase = "IDLE"
+        
+        elif s.phase == "T5_WINDOW":
+            delta = abs(price - (s.t4_anchor or price))
+            if s.cycles <= 3 and delta >= S.t5_extra_from_t4:
+                from_first = (price - s.first_order_price) if s.first_order_price else None
+                self._emit(out, ts_ns, price, "T5", from_base, from_first)
+                s.last_position_price = price
+                s.last_position_side = "BUY" if from_base > 0 else "SELL"
+                s.phase = "IDLE"
+            elif s.cycles > 3:
+                s.phase = "IDLE"
+        
+        # === T7: Macro Move from First Order ===
+        if s.first_order_price is not None:
+            total_from_first = abs(price - s.first_order_price)
+            if total_from_first >= S.t7_total_from_first:
+                from_first = price - s.first_order_price
+                self._emit(out, ts_ns, price, "T7", from_base, from_first)
+                s.last_position_price = price
+                s.last_position_side = "BUY" if from_first > 0 else "SELL"
+                s.t9_last_position_price = price  # Enable T10 after T7
+                s.t9_last_position_side = "BUY" if from_first > 0 else "SELL"
+        
+        s.last_beat_price = price
+        return out
+
+    def check_tick(self, ts_ns: int, price: float) -> list[OrderSignal]:
+        """Intrabeat checks for the jump-style triggers (T14 swing, T8 first jump).
+
+        Thresholds are measured exactly as on the beat (from base / from the last beat price);
+        a trigger fired here is skipped by the next ``step`` so it cannot fire twice per beat.
+        """
+        S = self.settings
+        s = self.state
+        out: list[OrderSignal] = []
+        if "T14" not in self._tick_fired and s.base_price is not None \
+                and abs(price - s.base_price) >= S.t14_violent_swing:
+            self._emit(out, ts_ns, price, "T14", price - s.base_price, None)
+            self._tick_fired.add("T14")
+        if s.phase != "IDLE" and "T8" not in self._tick_fired and s.last_jump_dir is None \
+                and s.last_beat_price is not None:
+            move = price - s.last_beat_price
+            if abs(move) >= S.t8_jump_single and move != 0:
+                direction = 1 if move > 0 else -1
+                self._emit(out, ts_ns, price, "T8", price - (s.base_price or price), None)
+                s.last_jump_dir = direction
+                s.t9_last_position_price = price
+                s.t9_last_position_side = "BUY" if direction > 0 else "SELL"
+                self._tick_fired.add("T8")
+        return out
+
+
 class StrategyEngine:
-    def __init__(self, ticks_q: asyncio.Queue, signals_q: asyncio.Queue, symbol: Optional[str] = None, risk_gate=None):
+    def __init__(self, ticks_q: asyncio.Queue, signals_q: asyncio.Queue, symbol: Optional[str] = None, risk_gate=None, clock=None):
         self.ticks_q = ticks_q
         self.signals_q = signals_q
         self.risk_gate = risk_gate  # For protection cycle position tracking
-        self.state = LadderState()
+        self.clock = clock or WALL_CLOCK  # VirtualClock in backtests
+        # symbol for emitted signals (defaults to global SETTINGS)
+        self.core = StrategyCore(symbol or SETTINGS.symbol)
         self.last_price: Optional[float] = None
         self._stop = False
         self.tick_count = 0
         self._last_tick_ts: float | None = None
-        # symbol for emitted signals (defaults to global SETTINGS)
-        self.symbol = (symbol or SETTINGS.symbol)
         # beat can be overridden per-session (used by run_multi)
         self.beat_sec: float = SETTINGS.beat_sec
-        # per-instance lots (overridable for multi-symbol runs)
-        self.lots = {
-            "T1": SETTINGS.lot_t1,
-            "T2": SETTINGS.lot_t2,
-            "T3": SETTINGS.lot_t3,
-            "T4": SETTINGS.lot_t4,
-            "T5": SETTINGS.lot_t5,
-            "T7": SETTINGS.lot_t7,
-            "T8": SETTINGS.lot_t8,
-            "T9": SETTINGS.lot_t9,
-            "T10": SETTINGS.lot_t10,
-            "T11": SETTINGS.lot_t11,
-            "T12": SETTINGS.lot_t12,
-            "T13": SETTINGS.lot_t13,
-            "T14": SETTINGS.lot_t14,
-            "T15": SETTINGS.lot_t15,
-            "T16": SETTINGS.lot_t16,
-        }
-        
-        # Price history for slow trend detection (T11)
-        self.price_history: list[tuple[float, float]] = []  # (timestamp, price)
+        # opt-in tick-driven evaluation (T8/T14 + protection stops between beats)
+        self.tick_triggers: bool = SETTINGS.tick_triggers
+        self._last_tick_eval_ns = 0
+        self._next_beat_ns = 0
+        self._protect_latch_pos: int | None = None  # position a tick-mode PROTECT already fired for
+        self.tick_latency = {"signals": 0, "sum_ns": 0, "max_ns": 0, "lead_sum_ns": 0}
+        self._last_recv_ns = 0  # Tick.recv_ns behind last_price (TRACE)
+        self.paused = False  # cached PAUSE_FLAG, see check_paused()
+        self._pause_checked_ns = 0
+        self.live = None  # live_state.LiveSlot, published on every tick / beat / reset
+        self.candles = None  # candles.CandleAggregator fed with every consumed tick
+
+    # ladder state, lots and symbol live on the core
+    @property
+    def state(self) -> LadderState:
+        return self.core.state
+
+    @state.setter
+    def state(self, value: LadderState):
+        self.core.state = value
+
+    @property
+    def symbol(self) -> str:
+        return self.core.symbol
+
+    @symbol.setter
+    def symbol(self, value: str):
+        self.core.symbol = value
+
+    @property
+    def lots(self) -> dict[str, int]:
+        return self.core.lots
+
+    @property
+    def price_history(self) -> RingBuffer:
+        return self.core.price_history
 
     def set_lots(self, *args, **kwargs):
         """Overridable lot config for multi-symbol."""
@@ -82,242 +392,76 @@ class StrategyEngine:
         """Consume ticks and update last_price."""
         while not self._stop:
             t: Tick = await self.ticks_q.get()
+            if TRACER.enabled:
+                TRACER.span("tick_queue", t.symbol, t.recv_ns, time.perf_counter_ns())
+                self._last_recv_ns = t.recv_ns
             self.last_price = t.price
             self.tick_count += 1
-            self._last_tick_ts = time.time()
+            self._last_tick_ts = self.clock.time()
+            if self.candles is not None:
+                self.candles.on_tick(t)
+            if self.tick_triggers:
+                await self.on_tick_eval(t)
+            self.publish_live()
+
+    def check_paused(self, now_ns: int, max_age_sec: float = 0.0) -> bool:
+        """Re-stat PAUSE_FLAG if the cached value is older than ``max_age_sec``."""
+        if now_ns - self._pause_checked_ns >= max_age_sec * 1e9:
+            self._pause_checked_ns = now_ns
+            self.paused = PAUSE_FLAG.exists()
+        return self.paused
+
+    async def on_tick_eval(self, t: Tick):
+        """Tick-mode trigger checks, rate-limited to one evaluation per TICK_EVAL_MIN_MS."""
+        now_ns = self.clock.time_ns()
+        if now_ns - self._last_tick_eval_ns < SETTINGS.tick_eval_min_ms * 1e6:
+            return
+        self._last_tick_eval_ns = now_ns
+        if self.check_paused(now_ns, PAUSE_CHECK_SEC):
+            return
+        sigs = self.core.check_tick(now_ns, t.price)
+        prot = self._protection_signal(t.price)
+        if prot is not None and self.risk_gate.position != self._protect_latch_pos:
+            self._protect_latch_pos = self.risk_gate.position
+            sigs.append(prot[0])
+            print(f"[PROTECTION] {prot[1]} (tick) - {prot[0].side} {prot[0].qty} @ {t.price:.2f}")
+        for sig in sigs:
+            # detection latency: tick timestamp -> signal; lead: how much earlier than the next beat
+            latency = max(0, now_ns - t.ts_ns)
+            lead = max(0, self._next_beat_ns - now_ns)
+            lt = self.tick_latency
+            lt["signals"] += 1
+            lt["sum_ns"] += latency
+            lt["max_ns"] = max(lt["max_ns"], latency)
+            lt["lead_sum_ns"] += lead
+            print(f"[TICK-SIGNAL] {sig.reason} {sig.side} {sig.qty} @ {t.price:.2f} "
+                  f"latency={latency / 1e6:.2f}ms ahead_of_beat={lead / 1e9:.1f}s")
+            if sig.reason == "PROTECT":
+                await self.signals_q.put(sig)
+            else:
+                await self.emit_signal(sig, t.price)
 
     async def beat_loop(self):
-        """14-second beat cycle evaluating all 16 entry triggers (T1-T16)."""
+        """14-second beat cycle; trigger evaluation is StrategyCore.step."""
         while not self._stop:
-            await asyncio.sleep(self.beat_sec)
-            if self.last_price is None:
-                continue
-            
-            # Check if trading is paused
-            import pathlib
-            if pathlib.Path("runtime/pause.flag").exists():
-                # Skip signal generation when paused
+            self._next_beat_ns = self.clock.time_ns() + int(self.beat_sec * 1e9)
+            await self.clock.sleep(self.beat_sec)
+            # Skip signal generation until the first price or while paused (the beat always
+            # re-reads the flag); still publish, live_state readers treat a silent slot as dead
+            if self.last_price is None or self.check_paused(self.clock.time_ns()):
+                self.publish_live()
                 continue
-            
+
             price = self.last_price
-            s = self.state
-            
-            # Track price history for T11 (slow trend)
-            now = time.time()
-            self.price_history.append((now, price))
-            # Keep only last 15 minutes of history
-            cutoff = now - (15 * 60)
-            self.price_history = [(t, p) for t, p in self.price_history if t >= cutoff]
-            
-            # === T14: Violent Swing (always active, any direction) ===
-            if s.base_price is not None and abs(price - s.base_price) >= SETTINGS.t14_violent_swing:
-                side = "BUY" if price > s.base_price else "SELL"
-                await self.emit_signal(price, "T14", self.lots["T14"], s, price - s.base_price, None)
-            
-            # === IDLE state initialization ===
-            if s.phase == "IDLE":
-                s.base_price = price
-                s.first_order_price = None
-                s.t3_anchor = None
-                s.t4_anchor = None
-                s.cycles = 0
-                s.phase = "T1_WINDOW"
-                s.last_beat_price = price
-                s.last_jump_dir = None
-                s.t11_start_price = price
-                s.t11_start_cycle = 0
-                s.t15_window_start = price
-                s.t15_window_start_cycle = 0
-                s.t16_fallback_cycle = 0
-                continue
-            
-            s.cycles += 1
-            from_base = price - (s.base_price or price)
-            
-            # === T8/T9: Jump Detection (directional entry) ===
-            if s.last_beat_price is not None:
-                jump = abs(price - s.last_beat_price)
-                direction = 1 if (price - s.last_beat_price) > 0 else (-1 if (price - s.last_beat_price) < 0 else 0)
-                
-                if s.last_jump_dir is None and jump >= SETTINGS.t8_jump_single and direction != 0:
-                    # T8: First jump detected
-                    await self.emit_signal(price, "T8", self.lots["T8"], s, from_base, None)
-                    s.last_jump_dir = direction
-                    s.t9_last_position_price = price
-                    s.t9_last_position_side = "BUY" if direction > 0 else "SELL"
-                    
-                elif s.last_jump_dir == direction and jump >= SETTINGS.t9_jump2_single and direction != 0:
-                    # T9: Second jump in same direction
-                    await self.emit_signal(price, "T9", self.lots["T9"], s, from_base, None)
-                    s.last_jump_dir = None  # Reset after T9
-                    s.t9_last_position_price = price
-                    s.t9_last_position_side = "BUY" if direction > 0 else "SELL"
-            
-            # === T10: Post-5K Extension (favorable move after T7/T9) ===
-            if s.t9_last_position_price is not None and s.t9_last_position_side is not None:
-                if s.t9_last_position_side == "BUY":
-                    favorable = price - s.t9_last_position_price
-                    if favorable >= SETTINGS.t10_favorable_move:
-                        await self.emit_signal(price, "T10", self.lots["T10"], s, from_base, None)
-                        s.t9_last_position_price = None  # Reset
-                elif s.t9_last_position_side == "SELL":
-                    favorable = s.t9_last_position_price - price
-                    if favorable >= SETTINGS.t10_favorable_move:
-                        await self.emit_signal(price, "T10", self.lots["T10"], s, from_base, None)
-                        s.t9_last_position_price = None  # Reset
-            
-            # === T11: Slow Trend (65-beat window, ~15 minutes) ===
-            if len(self.price_history) >= SETTINGS.t11_window_beats:
-                window_start_price = self.price_history[0][1]
-                move = abs(price - window_start_price)
-                if move >= SETTINGS.t11_slow_trend:
-                    side = "BUY" if price > window_start_price else "SELL"
-                    await self.emit_signal(price, "T11", self.lots["T11"], s, from_base, None)
-                    # Reset window
-                    self.price_history = [(now, price)]
-            
-            # === T12/T13: Counter-Position Sequence (opposite direction) ===
-            if s.last_position_side is not None and s.last_position_price is not None:
-                if not s.t12_triggered:
-                    # Check for T12: counter jump
-                    if s.last_position_side == "BUY":
-                        counter_move = s.last_position_price - price  # Price dropped
-                        if counter_move >= SETTINGS.t12_counter_jump:
-                            await self.emit_signal(price, "T12", self.lots["T12"], s, from_base, None)
-                            s.t12_triggered = True
-                    elif s.last_position_side == "SELL":
-                        counter_move = price - s.last_position_price  # Price rose
-                        if counter_move >= SETTINGS.t12_counter_jump:
-                            await self.emit_signal(price, "T12", self.lots["T12"], s, from_base, None)
-                            s.t12_triggered = True
-                else:
-                    # T13: continuation of counter move
-                    if s.last_position_side == "BUY":
-                        additional = s.last_position_price - price
-                        if additional >= (SETTINGS.t12_counter_jump + SETTINGS.t13_counter_continue):
-                            await self.emit_signal(price, "T13", self.lots["T13"], s, from_base, None)
-                            s.t12_triggered = False  # Reset
-                    elif s.last_position_side == "SELL":
-                        additional = price - s.last_position_price
-                        if additional >= (SETTINGS.t12_counter_jump + SETTINGS.t13_counter_continue):
-                            await self.emit_signal(price, "T13", self.lots["T13"], s, from_base, None)
-                            s.t12_triggered = False  # Reset
-            
-            # === T15: Low Volatility Strategy (34-beat/9-min window) ===
-            if s.t15_window_start_cycle == 0:
-                s.t15_window_start = price
-                s.t15_window_start_cycle = s.cycles
-            elif (s.cycles - s.t15_window_start_cycle) >= SETTINGS.t15_low_vol_window:
-                # Check if range is below threshold
-                window_range = abs(price - s.t15_window_start)
-                if window_range <= SETTINGS.t15_low_vol_threshold:
-                    # Low volatility detected, check for move
-                    if window_range >= SETTINGS.t15_move_mark:
-                        side = "BUY" if price > s.t15_window_start else "SELL"
-                        await self.emit_signal(price, "T15", self.lots["T15"], s, from_base, None)
-                # Reset window
-                s.t15_window_start = price
-                s.t15_window_start_cycle = s.cycles
-            
-            # === T16: Fallback Directional (after 11 beats without T1-T5) ===
-            if s.phase == "T1_WINDOW" and s.cycles >= SETTINGS.t16_fallback_window:
-                if abs(from_base) >= SETTINGS.t16_fallback_move:
-                    side = "BUY" if from_base > 0 else "SELL"
-                    await self.emit_signal(price, "T16", self.lots["T16"], s, from_base, None)
-                    s.phase = "IDLE"  # Reset after T16
-            
-            # === T1-T5 Ladder Logic ===
-            if s.phase == "T1_WINDOW":
-                if s.cycles <= 4 and abs(from_base) >= SETTINGS.t1_move:
-                    await self.emit_signal(price, "T1", self.lots["T1"], s, from_base, None)
-                    s.first_order_price = price
-                    s.last_position_price = price
-                    s.last_position_side = "BUY" if from_base > 0 else "SELL"
-                    s.phase = "T2_WINDOW"
-                    s.cycles = 0
-                    s.t3_anchor = price
-                elif s.cycles > 4:
-                    s.phase = "IDLE"
-            
-            elif s.phase == "T2_WINDOW":
-                if s.cycles <= 4 and abs(from_base) >= SETTINGS.t2_hold:
-                    from_first = (price - s.first_order_price) if s.first_order_price else None
-                    await self.emit_signal(price, "T2", self.lots["T2"], s, from_base, from_first)
-                    s.last_position_price = price
-                    s.last_position_side = "BUY" if from_base > 0 else "SELL"
-                    s.phase = "T3_WINDOW"
-                    s.cycles = 0
-                    s.t3_anchor = price
-                elif s.cycles > 4:
-                    s.phase = "IDLE"
-            
-            elif s.phase == "T3_WINDOW":
-                from_first = (price - s.first_order_price) if s.first_order_price else 0.0
-                if s.cycles <= 3 and abs(from_first) >= SETTINGS.t3_move_from_t0:
-                    await self.emit_signal(price, "T3", self.lots["T3"], s, from_base, from_first)
-                    s.last_position_price = price
-                    s.last_position_side = "BUY" if from_first > 0 else "SELL"
-                    s.phase = "T4_WINDOW"
-                    s.cycles = 0
-                    s.t4_anchor = price
-                elif s.cycles > 3:
-                    s.phase = "IDLE"
-            
-            elif s.phase == "T4_WINDOW":
-                delta = abs(price - (s.t3_anchor or price))
-                if s.cycles <= 2 and delta >= SETTINGS.t4_extra_from_t3:
-                    from_first = (price - s.first_order_price) if s.first_order_price else None
-                    await self.emit_signal(price, "T4", self.lots["T4"], s, from_base, from_first)
-                    s.last_position_price = price
-                    s.last_position_side = "BUY" if from_base > 0 else "SELL"
-                    s.phase = "T5_WINDOW"
-                    s.cycles = 0
-                elif s.cycles > 2:
-                    s.phase = "IDLE"
-            
-            elif s.phase == "T5_WINDOW":
-                delta = abs(price - (s.t4_anchor or price))
-                if s.cycles <= 3 and delta >= SETTINGS.t5_extra_from_t4:
-                    from_first = (price - s.first_order_price) if s.first_order_price else None
-                    await self.emit_signal(price, "T5", self.lots["T5"], s, from_base, from_first)
-                    s.last_position_price = price
-                    s.last_position_side = "BUY" if from_base > 0 else "SELL"
-                    s.phase = "IDLE"
-                elif s.cycles > 3:
-                    s.phase = "IDLE"
-            
-            # === T7: Macro Move from First Order ===
-            if s.first_order_price is not None:
-                total_from_first = abs(price - s.first_order_price)
-                if total_from_first >= SETTINGS.t7_total_from_first:
-                    from_first = price - s.first_order_price
-                    await self.emit_signal(price, "T7", self.lots["T7"], s, from_base, from_first)
-                    s.last_position_price = price
-                    s.last_position_side = "BUY" if from_first > 0 else "SELL"
-                    s.t9_last_position_price = price  # Enable T10 after T7
-                    s.t9_last_position_side = "BUY" if from_first > 0 else "SELL"
-            
-            s.last_beat_price = price
+            if TRACER.enabled:
+                TRACER.span("price_age", self.symbol, self._last_recv_ns, time.perf_counter_ns())
+            for sig in self.core.step(self.clock.time_ns(), price):
+                await self.emit_signal(sig, price)
+            self.publish_live()
 
-    async def emit_signal(self, price: float, reason: str, qty: int,
-                          s: LadderState, from_base_pts: float,
-                          from_first_pts: Optional[float]):
-        """Emit trading signal with proper formatting."""
-        direction = from_first_pts if from_first_pts is not None else from_base_pts
-        side = "BUY" if direction > 0 else "SELL"
-        
-        sig = OrderSignal(
-            ts_ns=time.time_ns(),
-            symbol=self.symbol,
-            side=side,
-            qty=qty,
-            reason=reason,
-            base_price=s.base_price or price,
-            first_order_price=s.first_order_price,
-            from_base_pts=from_base_pts,
-            from_first_pts=from_first_pts
-        )
-        
+    async def emit_signal(self, sig: OrderSignal, price: float):
+        """Log a core signal and hand it to the risk gate."""
+        from_base_pts, from_first_pts, reason = sig.from_base_pts, sig.from_first_pts, sig.reason
         # Format for logging (handle None values)
         try:
             fb_str = f"+{from_base_pts:.2f}" if from_base_pts >= 0 else f"{from_base_pts:.2f}"
@@ -326,68 +470,82 @@ class StrategyEngine:
         except Exception:
             print(f"[SIGNAL] {reason} {sig.side} {sig.qty} last={price} from_base={from_base_pts} from_first={from_first_pts}")
         
+        if TRACER.enabled:
+            TRACER.on_signal(sig, self._last_recv_ns)
         await self.signals_q.put(sig)
 
+    def _protection_signal(self, p: float) -> tuple[OrderSignal, str] | None:
+        """Stop-loss / take-profit exit for the current position at price p, if due."""
+        rg = self.risk_gate
+        # Protection logic: Exit if stop loss hit OR take profit target reached
+        if rg is None or rg.position == 0:
+            return None
+        
+        # Calculate adverse move (loss) and favorable move (profit) from average entry price
+        if rg.position > 0:
+            # We're long
+            adverse_move = rg._avg_price - p  # loss = entry - current
+            favorable_move = p - rg._avg_price  # profit = current - entry
+        else:
+            # We're short
+            adverse_move = p - rg._avg_price  # loss = current - entry
+            favorable_move = rg._avg_price - p  # profit = entry - current
+        
+        # Exit on stop loss (1.50 pts adverse) OR take profit (2.00 pts favorable)
+        if adverse_move >= SETTINGS.per_leg_stop_pts:
+            exit_reason = f"STOP LOSS (adverse: {adverse_move:.2f} pts)"
+        elif favorable_move >= 2.00:  # Take profit at 2.00 points gain
+            exit_reason = f"TAKE PROFIT (gain: {favorable_move:.2f} pts)"
+        else:
+            return None
+        
+        sig = OrderSignal(
+            ts_ns=self.clock.time_ns(),
+            symbol=self.symbol,
+            side="SELL" if rg.position > 0 else "BUY",
+            qty=abs(rg.position),
+            reason="PROTECT",
+            base_price=self.state.base_price or p,
+            first_order_price=self.state.first_order_price,
+            from_base_pts=None,
+            from_first_pts=None
+        )
+        if TRACER.enabled:
+            TRACER.on_signal(sig, self._last_recv_ns)
+        return sig, exit_reason
+
     async def protection_cycle(self):
         """37-second protection cycle: monitors positions and exits on adverse moves"""
         while not self._stop:
-            await asyncio.sleep(SETTINGS.alt_beat_sec)  # 37 seconds
+            await self.clock.sleep(SETTINGS.alt_beat_sec)  # 37 seconds
             
             if self.last_price is None or self.risk_gate is None:
                 continue
             
             p = self.last_price
-            rg = self.risk_gate
-            
-            # Protection logic: Exit if stop loss hit OR take profit target reached
-            if rg.position == 0:
-                continue
-            
-            # Calculate adverse move (loss) and favorable move (profit) from average entry price
-            adverse_move = 0.0
-            favorable_move = 0.0
-            
-            if rg.position > 0:
-                # We're long
-                adverse_move = rg._avg_price - p  # loss = entry - current
-                favorable_move = p - rg._avg_price  # profit = current - entry
-            else:
-                # We're short
-                adverse_move = p - rg._avg_price  # loss = current - entry
-                favorable_move = rg._avg_price - p  # profit = entry - current
-            
-            # Exit on stop loss (1.50 pts adverse) OR take profit (2.00 pts favorable)
-            should_exit = False
-            exit_reason = ""
-            
-            if adverse_move >= SETTINGS.per_leg_stop_pts:
-                should_exit = True
-                exit_reason = f"STOP LOSS (adverse: {adverse_move:.2f} pts)"
-            elif favorable_move >= 2.00:  # Take profit at 2.00 points gain
-                should_exit = True
-                exit_reason = f"TAKE PROFIT (gain: {favorable_move:.2f} pts)"
-            
-            if should_exit:
-                exit_side = "SELL" if rg.position > 0 else "BUY"
-                exit_qty = abs(rg.position)
-                
-                sig = OrderSignal(
-                    ts_ns=time.time_ns(),
-                    symbol=self.symbol,
-                    side=exit_side,
-                    qty=exit_qty,
-                    reason="PROTECT",
-                    base_price=self.state.base_price or p,
-                    first_order_price=self.state.first_order_price,
-                    from_base_pts=None,
-                    from_first_pts=None
-                )
-                print(f"[PROTECTION] {exit_reason} - {exit_side} {exit_qty} @ {p:.2f} (avg entry: {rg._avg_price:.2f})")
+            prot = self._protection_signal(p)
+            if prot is not None:
+                sig, exit_reason = prot
+                self._protect_latch_pos = self.risk_gate.position
+                print(f"[PROTECTION] {exit_reason} - {sig.side} {sig.qty} @ {p:.2f} (avg entry: {self.risk_gate._avg_price:.2f})")
                 await self.signals_q.put(sig)
 
     def reset_state(self):
-        self.state = LadderState()
-        self.price_history = []
+        self.core.reset()
+        self.publish_live()
+
+    def publish_live(self):
+        """Push ladder state, last price and the risk gate's book into the live state slot."""
+        if self.live is None:
+            return
+        s = self.state
+        fields = dict(phase=s.phase, last_price=self.last_price, base_price=s.base_price,
+                      first_order_price=s.first_order_price, cycles=s.cycles,
+                      last_tick_ns=int(self._last_tick_ts * 1e9) if self._last_tick_ts else 0)
+        rg = self.risk_gate
+        if rg is not None:
+            fields.update(position=rg.position, realized=rg.book.realized, pnl=rg.book.pnl(self.last_price))
+        self.live.update(**fields)
 
     async def run(self):
         await asyncio.gather(
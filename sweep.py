@@ -0,0 +1,174 @@
+# sweep.py — parallel parameter sweep over Settings trigger thresholds / lots
+"""
+Examples:
+  # full grid over two thresholds, two CSV days
+  python sweep.py --csv day1.csv day2.csv --grid t1_move=0.10,0.14,0.18 --grid lot_t7=1000,5000
+
+  # 200 random draws
+  python sweep.py --csv day1.csv --random 200 --range t1_move=0.08:0.30 --range t8_jump_single=0.10:0.30
+
+Ticks are parsed once in the parent and placed in shared memory; workers attach to the
+same buffers, resample them per beat_sec and run batch_backtest on each trial.
+"""
+import argparse, csv, dataclasses, itertools, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import SETTINGS, Settings
+from batch_backtest import load_csv, resample_to_beats, run_batch, simulate_fills
+
+TRIGGERS = [f"T{i}" for i in range(1, 17) if i != 6]
+FIELD_TYPES = {f.name: f.type for f in dataclasses.fields(Settings)}
+
+
+def parse_value(name: str, raw: str):
+    typ = FIELD_TYPES.get(name)
+    if typ is None:
+        raise SystemExit(f"[SWEEP] Unknown Settings field: {name}")
+    if typ in (bool, "bool"):
+        v = raw.strip().lower()
+        if v in ("1", "true", "yes", "on"):
+            return True
+        if v in ("0", "false", "no", "off"):
+            return False
+        raise SystemExit(f"[SWEEP] {name} expects true/false/1/0, got {raw!r}")
+    if typ in (str, "str"):
+        return raw  # e.g. fill_model=instant,impact
+    return int(float(raw)) if typ in (int, "int") else float(raw)
+
+
+def grid_space(specs: list[str]) -> list[dict]:
+    names, values = [], []
+    for spec in specs:
+        name, raw = spec.split("=", 1)
+        names.append(name)
+        values.append([parse_value(name, v) for v in raw.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*values)]
+
+
+def random_space(specs: list[str], n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    ranges = []
+    for spec in specs:
+        name, raw = spec.split("=", 1)
+        lo, hi = raw.split(":")
+        ranges.append((name, parse_value(name, lo), parse_value(name, hi)))
+    out = []
+    for _ in range(n):
+        out.append({name: (rng.choice((lo, hi)) if isinstance(lo, bool) else
+                           rng.randint(lo, hi) if isinstance(lo, int) else round(rng.uniform(lo, hi), 4))
+                    for name, lo, hi in ranges})
+    return out
+
+
+# ---- shared tick data -------------------------------------------------------------------
+
+def share_array(arr: np.ndarray) -> tuple[shared_memory.SharedMemory, tuple]:
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+_WORKER_DATA: list[tuple[np.ndarray, np.ndarray]] = []
+_WORKER_SHM: list[shared_memory.SharedMemory] = []
+_BEAT_CACHE: dict[tuple[int, float], tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _attach(desc):
+    name, shape, dtype = desc
+    shm = shared_memory.SharedMemory(name=name)
+    _WORKER_SHM.append(shm)  # keep the mapping alive for the life of the worker
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _init_worker(descs):
+    _WORKER_DATA.clear()
+    for ts_desc, px_desc in descs:
+        _WORKER_DATA.append((_attach(ts_desc), _attach(px_desc)))
+
+
+def _beats(i: int, beat_sec: float):
+    key = (i, beat_sec)
+    if key not in _BEAT_CACHE:
+        ts, px = _WORKER_DATA[i]
+        _BEAT_CACHE[key] = resample_to_beats(ts, px, beat_sec)
+    return _BEAT_CACHE[key]
+
+
+def run_trial(params: dict) -> dict:
+    settings = dataclasses.replace(SETTINGS, **params)
+    row = {**params, "pnl": 0.0, "max_drawdown": 0.0, "fills": 0, "fill_cost": 0.0, "beats": 0}
+    hits = dict.fromkeys(TRIGGERS, 0)
+    for i, (ts, px) in enumerate(_WORKER_DATA):
+        beat_ts, beat_px = _beats(i, settings.beat_sec)
+        res = run_batch(beat_ts, beat_px, settings)
+        summ = simulate_fills(res, ts, px, settings)
+        row["pnl"] += summ.pnl
+        row["max_drawdown"] = min(row["max_drawdown"], summ.max_drawdown)
+        row["fills"] += summ.fills
+        row["fill_cost"] += summ.fill_cost
+        row["beats"] += len(beat_ts)
+        for reason, n in res.counts().items():
+            hits[reason] = hits.get(reason, 0) + n
+    # hit rate = share of beats on which the trigger fired
+    for t in TRIGGERS:
+        row[f"hit_{t}"] = hits[t] / row["beats"] if row["beats"] else 0.0
+    return row
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parallel sweep over config.Settings fields")
+    ap.add_argument("--csv", nargs="+", required=True, help="tick CSVs (ts,price,size)")
+    ap.add_argument("--grid", action="append", default=[], help="field=v1,v2,...  (cartesian product)")
+    ap.add_argument("--range", action="append", default=[], help="field=lo:hi  (for --random)")
+    ap.add_argument("--random", type=int, default=0, help="number of random draws from --range")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default="sweep_results.csv")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--tick-cache", action="store_true", help="reuse/write parsed ticks as <csv>.*.ticks.npy")
+    args = ap.parse_args(argv)
+
+    trials = grid_space(args.grid) if args.grid else [{}]
+    if args.random:
+        draws = random_space(args.range, args.random, args.seed)
+        trials = [{**g, **d} for g in trials for d in draws]
+    print(f"[SWEEP] {len(trials)} trials x {len(args.csv)} files on {args.workers} workers")
+
+    t0 = time.perf_counter()
+    shms, descs = [], []
+    for path in args.csv:
+        ts, px, _ = load_csv(path, cache=args.tick_cache)
+        order = np.argsort(ts, kind="stable")
+        s_ts, d_ts = share_array(ts[order])
+        s_px, d_px = share_array(px[order])
+        shms += [s_ts, s_px]
+        descs.append((d_ts, d_px))
+    print(f"[SWEEP] Loaded ticks in {time.perf_counter() - t0:.2f}s")
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(descs,)) as ex:
+            rows = list(ex.map(run_trial, trials, chunksize=max(1, len(trials) // (args.workers * 4))))
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    rows.sort(key=lambda r: r["pnl"], reverse=True)
+    cols = list(rows[0].keys()) if rows else []
+    with open(args.out, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=["rank"] + cols)
+        w.writeheader()
+        for rank, r in enumerate(rows, 1):
+            w.writerow({"rank": rank, **r})
+    print(f"[SWEEP] {len(rows)} trials in {time.perf_counter() - t0:.2f}s -> {args.out}")
+    params = [c for c in cols if c in FIELD_TYPES]
+    for rank, r in enumerate(rows[:args.top], 1):
+        p = " ".join(f"{k}={r[k]}" for k in params)
+        print(f"[SWEEP] #{rank:<3} pnl={r['pnl']:>12.2f} dd={r['max_drawdown']:>12.2f} fills={r['fills']:<6} {p}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
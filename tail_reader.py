@@ -0,0 +1,114 @@
+# tail_reader.py — incremental follower for append-only line files (trades.jsonl, trade CSVs)
+"""
+Dashboards rerun every couple of seconds; re-reading the whole trade log each time makes a
+refresh O(file size). A ``TailReader`` kept alive across reruns (``st.cache_resource``)
+remembers its byte offset and only parses lines appended since the last ``poll``.
+
+- first open: reads the whole file, or with ``window=N`` seeks backwards from EOF for the
+  last N lines only
+- a trailing line without ``\\n`` is left for the next poll (writer mid-flush)
+- inode change or shrink (CLEAR LOGS archive, reset, truncation) drops the cached records
+  and restarts from the top of the new file
+"""
+import collections, csv, json, os, pathlib, threading
+from typing import Callable, Optional
+
+_BLOCK = 64 * 1024
+
+
+class TailReader:
+    def __init__(self, path, parse: Callable[[str], object] = json.loads,
+                 window: Optional[int] = None, max_records: Optional[int] = None):
+        self.path = pathlib.Path(path)
+        self.parse = parse            # returns None to skip a line (e.g. CSV header)
+        self.window = window
+        self.records = collections.deque(maxlen=max_records)
+        self.offset = 0
+        self.inode = None
+        self.rotations = 0
+        self.bad_lines = 0
+        self._lock = threading.Lock()  # cached readers are shared between dashboard sessions
+
+    def _initial_offset(self, f, size: int) -> int:
+        """Byte offset of the start of the last ``window`` lines (0 = whole file)."""
+        if not self.window:
+            return 0
+        pos, newlines = size, 0
+        while pos > 0:
+            step = min(_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            i = len(block)
+            # window+1 newlines: the file's final newline ends the last line, it doesn't start one
+            while (i := block.rfind(b"\n", 0, i)) >= 0:
+                newlines += 1
+                if newlines > self.window:
+                    return pos + i + 1
+        return 0
+
+    def _reset(self):
+        self.records.clear()
+        self.offset = 0
+        self.inode = None
+
+    def poll(self) -> list:
+        """Parse lines appended since the last call; returns just the new records."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self.inode is not None:
+                    self.rotations += 1
+                    self._reset()
+                return []
+            if self.inode is not None and (st.st_ino != self.inode or st.st_size < self.offset):
+                self.rotations += 1
+                self._reset()
+                self.inode = st.st_ino
+                first = False  # a fresh file after rotation is read from the top
+            else:
+                first = self.inode is None
+            if st.st_size == self.offset and not first:
+                return []
+            new = []
+            with open(self.path, "rb") as f:
+                if first:
+                    self.offset = self._initial_offset(f, st.st_size)
+                self.inode = st.st_ino
+                f.seek(self.offset)
+                chunk = f.read(st.st_size - self.offset)
+            end = chunk.rfind(b"\n")
+            if end < 0:
+                return []
+            self.offset += end + 1
+            for raw in chunk[:end].split(b"\n"):
+                line = raw.decode("utf-8", "replace").strip()
+                if not line:
+                    continue
+                try:
+                    rec = self.parse(line)
+                except ValueError:
+                    self.bad_lines += 1
+                    continue
+                if rec is not None:
+                    new.append(rec)
+            self.records.extend(new)
+            return new
+
+    def snapshot(self) -> list:
+        """Poll, then return every record held (the initial window plus everything since)."""
+        self.poll()
+        with self._lock:
+            return list(self.records)
+
+
+def csv_parser(columns: list[str]) -> Callable[[str], Optional[dict]]:
+    """Line parser for header-optional CSVs: skips the header row, maps fields to ``columns``."""
+    header = ",".join(columns)
+
+    def parse(line: str):
+        if line == header:
+            return None
+        return dict(zip(columns, next(csv.reader([line]))))
+    return parse
@@ -0,0 +1,45 @@
+"""
+Frame decoder: one Tick list per frame for the subscribed channel/symbol, the same with
+orjson and the stdlib parser, quotes reported to the fill model, control messages passed
+back, and one put_many per frame.
+"""
+import asyncio, json
+
+import alpaca_adapter
+from alpaca_adapter import enqueue, make_decoder
+from pipeline import BoundedStage
+
+FRAME = json.dumps([
+    {"T": "subscription", "trades": ["DIA"], "quotes": ["DIA"], "bars": []},
+    {"T": "t", "S": "DIA", "p": 480.12, "s": 100, "t": "2024-01-02T15:00:00Z"},
+    {"T": "t", "S": "SPY", "p": 470.5, "s": 5},
+    {"T": "q", "S": "DIA", "bp": 480.10, "ap": 480.14, "bs": 1, "as": 2},
+    {"T": "t", "S": "DIA", "p": "480.13", "s": "7"},
+    {"T": "t", "S": "DIA", "p": 0, "s": 1},
+])
+
+
+def test_decoder_channels_and_parsers(monkeypatch):
+    parsers = [json.loads] + ([alpaca_adapter.orjson.loads] if alpaca_adapter.HAVE_ORJSON else [])
+    for loads in parsers:
+        monkeypatch.setattr(alpaca_adapter, "loads", loads)
+        ticks, control = make_decoder("trades", "DIA")(FRAME, 123, 456)
+        assert [(t.ts_ns, t.symbol, t.price, t.size, t.recv_ns) for t in ticks] == [
+            (123, "DIA", 480.12, 100, 456), (123, "DIA", 480.13, 7, 456)]
+        assert [d["T"] for d in control] == ["subscription"]
+        seen = []
+        quotes, _ = make_decoder("quotes", "DIA", lambda *q: seen.append(q))(FRAME, 1)
+        assert [round(t.price, 2) for t in quotes] == [480.12] and seen == [("DIA", 480.10, 480.14)]
+        assert make_decoder("trades", "DIA")("not json", 1) == ([], [])
+
+
+def test_enqueue_hands_over_a_frame():
+    async def go():
+        q = BoundedStage("ticks", 4, "block")
+        ticks, _ = make_decoder("trades", "DIA")(FRAME, 1)
+        await enqueue(q, ticks)
+        plain = asyncio.Queue()
+        await enqueue(plain, ticks)
+        return [q.get_nowait().price for _ in range(q.qsize())], plain.qsize()
+
+    assert asyncio.run(go()) == ([480.12, 480.13], 2)
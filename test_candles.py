@@ -0,0 +1,34 @@
+"""
+Candles: bars are epoch-aligned per timeframe, take conflated highs/lows the engine never saw
+as a last price, close on a timer when ticks stop, and round-trip through the bar store.
+"""
+from candles import CandleAggregator, load_bars, available_timeframes
+from channels import ConflatingChannel
+from events import Tick
+
+S = 1_000_000_000
+
+
+def test_bars_from_conflated_ticks(tmp_path):
+    ch = ConflatingChannel()
+    agg = CandleAggregator(tmp_path, ["5s", "1min"])
+    t0 = 1_700_000_000 * S  # 5s-aligned, 20s into its minute
+    for dt, px in [(0, 100.0), (1, 103.0), (2, 99.0), (3, 101.0)]:
+        ch.put_nowait(Tick(t0 + dt * S, "DIA", px, 10))
+    agg.on_tick(ch.get_nowait())  # one conflated tick: O=100 H=103 L=99 C=101
+    agg.on_tick(Tick(t0 + 4 * S, "DIA", 102.0, 5))
+    agg.on_tick(Tick(t0 + 6 * S, "DIA", 104.0, 1))  # completes the first 5s bar
+    agg.close_due(t0 + 11 * S)                      # quiet: second 5s bar closed by the timer
+
+    bars = load_bars(tmp_path, "5s", 10)
+    assert bars["ts_ns"].tolist() == [t0, t0 + 5 * S]
+    first = bars[0]
+    assert (first["open"], first["high"], first["low"], first["close"]) == (100.0, 103.0, 99.0, 102.0)
+    assert first["volume"] == 45 and first["count"] == 5
+    assert bars[1]["open"] == bars[1]["close"] == 104.0
+
+    # 1min bar is still forming; its start is minute-aligned
+    assert len(load_bars(tmp_path, "1min", 10)) == 0
+    assert agg.forming("1min")[0] == t0 - 20 * S
+    assert available_timeframes(tmp_path) == ["5s", "1min"]
+    agg.close()
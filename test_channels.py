@@ -0,0 +1,68 @@
+"""
+Tick channel behaviour: conflation keeps the latest tick per symbol with OHLC/volume
+of everything it replaced, and consumers block until something is pending.
+"""
+import asyncio
+
+from channels import ConflatingChannel
+from events import Tick
+
+
+def test_conflates_to_latest_with_aggregates():
+    ch = ConflatingChannel()
+    for i, px in enumerate([100.0, 101.5, 99.0, 100.5]):
+        ch.put_nowait(Tick(ts_ns=i, symbol="DIA", price=px, size=10))
+    ch.put_nowait(Tick(ts_ns=9, symbol="SPY", price=500.0, size=1))
+
+    assert ch.qsize() == 2
+    dia = ch.get_nowait()
+    assert (dia.symbol, dia.ts_ns, dia.price) == ("DIA", 3, 100.5)
+    assert (dia.open, dia.high, dia.low, dia.volume, dia.count) == (100.0, 101.5, 99.0, 40, 4)
+    assert [t.symbol for t in ch.drain()] == ["SPY"]
+    assert ch.stats() == {"puts": 5, "delivered": 2, "conflated": 3, "dropped": 0, "pending": 0}
+
+    last = ConflatingChannel(aggregate=False)
+    for i, px in enumerate([100.0, 101.5, 99.0, 100.5]):
+        last.put_nowait(Tick(ts_ns=i, symbol="DIA", price=px, size=10))
+    dia = last.get_nowait()
+    assert (dia.price, dia.open, dia.high, dia.low, dia.volume, dia.count) == (100.5, 100.5, 100.5, 100.5, 10, 4)
+
+
+def test_get_waits_for_next_tick():
+    async def run():
+        ch = ConflatingChannel()
+        getter = asyncio.create_task(ch.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        await ch.put(Tick(ts_ns=1, symbol="DIA", price=1.0))
+        return await asyncio.wait_for(getter, 1.0)
+
+    assert asyncio.run(run()).price == 1.0
+
+
+def test_max_symbols_drops_new_symbols():
+    ch = ConflatingChannel(max_symbols=1)
+    ch.put_nowait(Tick(ts_ns=1, symbol="A", price=1.0))
+    ch.put_nowait(Tick(ts_ns=2, symbol="B", price=2.0))
+    assert ch.dropped == 1 and ch.qsize() == 1
+
+
+def test_bounded_stage_drop_oldest_and_coalesce():
+    from events import OrderSignal
+    from pipeline import BoundedStage, signal_key
+
+    q = BoundedStage("t", maxsize=2, policy="drop_oldest")
+    for i in range(3):
+        q.put_nowait(i)
+    assert [q.get_nowait(), q.get_nowait()] == [1, 2]
+    assert q.stats()["dropped"] == 1 and q.stats()["max_depth"] == 2
+
+    sigs = BoundedStage("s", maxsize=4, policy="coalesce", key=signal_key)
+    sigs.put_nowait(OrderSignal(ts_ns=1, symbol="DIA", side="BUY", qty=1, reason="T1",
+                                base_price=1.0, first_order_price=None, from_base_pts=0.0, from_first_pts=None))
+    sigs.put_nowait(OrderSignal(ts_ns=2, symbol="DIA", side="SELL", qty=1, reason="T2",
+                                base_price=1.0, first_order_price=None, from_base_pts=0.0, from_first_pts=None))
+    sigs.put_nowait(OrderSignal(ts_ns=3, symbol="DIA", side="BUY", qty=5, reason="T1",
+                                base_price=1.0, first_order_price=None, from_base_pts=0.0, from_first_pts=None))
+    first = sigs.get_nowait()
+    assert (first.reason, first.qty, sigs.qsize(), sigs.coalesced) == ("T1", 5, 1, 1)
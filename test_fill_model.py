@@ -0,0 +1,67 @@
+"""
+Simulated execution: size impact makes big orders cost more per share, the vectorized
+prices match the per-order clips, quoted spreads replace the default, and sim-mode
+OMSRouter emits partial fills after latency.
+"""
+import asyncio, dataclasses
+
+import numpy as np
+
+from config import SETTINGS
+from events import OrderApproved
+from fill_model import FillModel, ImpactFill, make_fill_model
+from oms_router import OMSRouter
+
+
+def test_impact_scales_with_size_and_matches_vectorized():
+    m = ImpactFill(spread_pts=0.02, impact_pts=0.02, impact_qty=1000, clip_qty=1000)
+    small = m.clip_fills("DIA", "BUY", 10, 480.0)
+    big = m.clip_fills("DIA", "SELL", 5000, 480.0)
+    assert small == [(10, 480.012)]
+    assert [q for q, _ in big] == [1000] * 5 and all(px < 480.0 for _, px in big)
+    big_avg = sum(q * px for q, px in big) / 5000
+    assert 480.0 - big_avg > 3 * (small[0][1] - 480.0)  # per share, T7 pays far more than T1
+    vec = m.avg_prices(np.array([1.0, -1.0]), np.array([10, 5000]), np.array([480.0, 480.0]))
+    assert np.allclose(vec, [small[0][1], big_avg], atol=1e-4)
+    assert np.array_equal(FillModel().avg_prices(np.array([1.0]), np.array([5000]), np.array([480.0])), [480.0])
+
+
+def test_quoted_spread_is_charged():
+    m = ImpactFill(spread_pts=0.02, impact_pts=0.0)
+    one = (np.array([1.0]), np.array([100]), np.array([480.0]))
+    m.observe_quote("DIA", 479.95, 480.05)
+    assert m.clip_fills("DIA", "BUY", 100, 480.0) == [(100, 480.05)]
+    assert m.clip_fills("SPY", "BUY", 100, 480.0) == [(100, 480.01)]  # no quote yet: FILL_SPREAD_PTS
+    assert np.allclose(m.avg_prices(*one, symbol="DIA"), [480.05])
+    assert np.allclose(m.avg_prices(*one, np.array([0.2]), "DIA"), [480.1])  # per-order spread wins
+
+
+def test_sim_router_partial_fills_after_latency(monkeypatch):
+    for k, v in dict(fill_model="impact", fill_latency_ms=20, fill_latency_sigma=0.0,
+                     fill_clip_qty=200, fill_clip_ms=5).items():
+        monkeypatch.setattr(SETTINGS, k, v)
+
+    class Engine:
+        last_price = 480.0
+
+    async def go():
+        execs = asyncio.Queue()
+        oms = OMSRouter(execs, engine=Engine(), mode="sim", track_orders=False)
+        t0 = asyncio.get_running_loop().time()
+        await oms._execute(OrderApproved(ts_ns=1, symbol="DIA", side="BUY", qty=500, reason="T5"))
+        return [execs.get_nowait() for _ in range(execs.qsize())], asyncio.get_running_loop().time() - t0
+
+    got, elapsed = asyncio.run(go())
+    assert elapsed >= 0.02
+    assert [(e.qty, e.status) for e in got] == [(200, "partially_filled"), (200, "partially_filled"), (100, "filled")]
+    assert got[0].price < got[1].price < got[2].price and all(e.reason == "T5" for e in got)
+
+
+def test_make_fill_model_rejects_unknown():
+    assert make_fill_model(dataclasses.replace(SETTINGS, fill_model="instant")).name == "instant"
+    try:
+        make_fill_model(dataclasses.replace(SETTINGS, fill_model="magic"))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown FILL_MODEL accepted")
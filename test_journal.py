@@ -0,0 +1,27 @@
+"""
+Journal writer: queued records reach disk on flush/close, CSV headers are written once,
+replace() keeps only the latest snapshot, and commit records are fsynced as a group.
+"""
+import json
+
+from journal import Journal
+
+
+def test_batches_appends_csv_and_replace(tmp_path):
+    j = Journal(flush_ms=10_000, fsync="commit")  # nothing flushes on time during the test
+    trades, csv_path, state = tmp_path / "trades.jsonl", tmp_path / "t.csv", tmp_path / "state.json"
+    for i in range(3):
+        j.append(trades, json.dumps({"i": i}), commit=True)
+        j.append_csv(csv_path, [i, "BUY"], header=["n", "side"])
+        j.replace(state, json.dumps({"v": i}))
+    assert j.flush(timeout=5)
+
+    assert [json.loads(x)["i"] for x in trades.read_text().splitlines()] == [0, 1, 2]
+    assert csv_path.read_text().splitlines() == ["n,side", "0,BUY", "1,BUY", "2,BUY"]
+    assert json.loads(state.read_text()) == {"v": 2}
+    assert 1 <= j.fsyncs <= 3  # commits grouped into however many batches the writer took
+
+    j.append_csv(csv_path, [3, "SELL"], header=["n", "side"])
+    j.close()
+    assert csv_path.read_text().splitlines()[-1] == "3,SELL"
+    assert csv_path.read_text().count("n,side") == 1
@@ -0,0 +1,58 @@
+"""
+Ledger: avg-cost fills with per-trigger attribution, and a follower that resumes from its
+checkpoint (applying only later fills) and starts a new book when the log is archived.
+"""
+import json
+
+from ledger import Ledger, LedgerFollower
+
+
+def _fill(path, side, qty, price, reason, symbol="DIA"):
+    with open(path, "a") as f:
+        f.write(json.dumps({"ts": 0, "side": side, "qty": qty, "price": price,
+                            "symbol": symbol, "reason": reason}) + "\n")
+
+
+def test_avg_cost_flip_and_attribution():
+    led = Ledger("DIA")
+    led.apply("BUY", 10, 100.0, "T1")
+    led.apply("BUY", 10, 102.0, "T2")
+    assert led.book().avg_price == 101.0
+    assert led.apply("SELL", 30, 104.0, "T8") == 60.0  # closes 20 long, flips 10 short
+    b = led.book()
+    assert (b.position, b.avg_price, b.realized) == (-10, 104.0, 60.0)
+    assert b.by_trigger["T8"].realized == 60.0 and b.by_trigger["T1"].qty == 10
+    assert b.pnl(103.0) == 70.0
+    led.apply("BUY", 5, 1.0, "T1", symbol="SPY")
+    assert led.total_position() == -5
+
+
+def test_netted_fill_attributes_traded_legs_only():
+    led = Ledger("DIA")
+    legs = (("T4", 200), ("T5", 500), ("T14", -400))  # NET BUY 300
+    for part in (100, 100, 100):  # partial fills
+        led.apply("BUY", part, 100.0, "NET", legs=legs)
+    led.apply("SELL", 300, 101.0, "NET", legs=(("T8", -300),))
+    trig = led.book().by_trigger
+    assert sum(t.qty for t in trig.values() if t is not trig["T8"]) == 300
+    assert (trig["T4"].qty, trig["T5"].qty, trig["T8"].realized) == (87, 213, 300.0)
+    assert "T14" not in trig
+
+
+def test_follower_resumes_from_checkpoint(tmp_path):
+    trades = tmp_path / "trades.jsonl"
+    _fill(trades, "BUY", 10, 100.0, "T1")
+    _fill(trades, "SELL", 10, 101.0, "T8")
+    f1 = LedgerFollower(trades)
+    assert f1.poll().total_realized() == 10.0
+    f1.checkpoint()
+
+    _fill(trades, "BUY", 5, 100.0, "T1")
+    f2 = LedgerFollower(trades)
+    assert f2.reader.offset > 0  # resumed, not replayed
+    led = f2.poll()
+    assert (led.total_realized(), led.total_position()) == (10.0, 5)
+
+    trades.rename(tmp_path / "archived.jsonl")
+    _fill(trades, "SELL", 1, 99.0, "T2")
+    assert f2.poll().total_position() == -1
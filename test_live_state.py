@@ -0,0 +1,56 @@
+"""
+Live state region: slots are claimed per symbol and reused across restarts, readers see the
+latest publish without parsing, and a slot caught mid-write (odd seq) is never returned.
+Slots of dead or silent engines are hidden from readers and reused.
+"""
+import json, subprocess, sys, time
+
+from live_state import LiveState, read_state, read_all_states, _SEQ, _HEADER_SIZE
+
+
+def test_publish_read_and_slots(tmp_path):
+    path = tmp_path / "live_state.bin"
+    w = LiveState(path, slots=4, writable=True)
+    dia = w.slot("DIA")
+    dia.update(phase="T1_WINDOW", mode="sim", last_price=480.25, cycles=3, position=-20)
+    spy = w.slot("SPY")
+    spy.update(phase="IDLE", last_price=None)
+
+    r = LiveState(path)
+    rec = r.read("DIA")
+    assert rec["phase"] == "T1_WINDOW" and rec["mode"] == "sim" and rec["cycles"] == 3
+    assert rec["last_price"] == 480.25 and rec["base_price"] is None and rec["position"] == -20
+    assert r.read("SPY")["last_price"] is None
+    assert [s["symbol"] for s in read_all_states(tmp_path)] == ["DIA", "SPY"]
+
+    dia.update(last_price=481.0)
+    assert r.read("DIA")["last_price"] == 481.0  # same mapping, no reopen
+
+    # a restarted engine gets its old slot back instead of a new one
+    assert LiveState(path, writable=True).slot("SPY").index == spy.index
+
+    # writer caught between the two seq bumps: readers give up rather than return a torn slot
+    _SEQ.pack_into(w.mm, _HEADER_SIZE + dia.index * 128, dia.seq + 1)
+    assert r.read_slot(dia.index) is None
+
+
+def test_read_state_falls_back_to_json(tmp_path):
+    assert read_state(tmp_path) is None
+    (tmp_path / "state.json").write_text(json.dumps({"phase": "IDLE"}))
+    assert read_state(tmp_path)["phase"] == "IDLE"
+    LiveState(tmp_path / "live_state.bin", writable=True).slot("DIA").update(phase="T2_WINDOW")
+    st = read_state(tmp_path)
+    assert st["phase"] == "T2_WINDOW" and st["symbol"] == "DIA" and st["last_tick_age"] is None
+
+
+def test_dead_and_stale_slots_are_skipped(tmp_path):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    w = LiveState(tmp_path / "live_state.bin", slots=2, writable=True)
+    w.slot("DIA").update(phase="IDLE")
+    w.slot("SPY").update(pid=dead.pid)
+    assert [s["symbol"] for s in read_all_states(tmp_path)] == ["DIA"]
+    assert read_state(tmp_path, "SPY") is None and read_state(tmp_path, "DIA")["phase"] == "IDLE"
+    assert w.slot("QQQ").index == 1  # file full: the dead engine's slot is taken over
+    time.sleep(0.01)
+    assert read_all_states(tmp_path, max_age_sec=0.005) == []
@@ -0,0 +1,104 @@
+"""
+The live path end to end against mock_alpaca: the market-data adapter streams ticks from
+it, OMSRouter orders fill through its trade_updates stream, and the injected faults
+(401, 406, 429) come back the way Alpaca sends them; finished orders and their tasks are
+not kept forever.
+"""
+import asyncio, json
+
+import httpx
+import websockets
+
+import alpaca_adapter
+from config import SETTINGS
+from mock_alpaca import MockAlpaca, MockConfig
+from oms_router import OMSRouter
+
+
+def _creds(monkeypatch):
+    monkeypatch.setattr(SETTINGS, "alpaca_key", "k")
+    monkeypatch.setattr(SETTINGS, "alpaca_secret", "s")
+
+
+def test_adapter_streams_ticks(monkeypatch, tmp_path):
+    _creds(monkeypatch)
+    monkeypatch.chdir(tmp_path)  # the adapter writes runtime/mode.txt
+
+    async def go():
+        mock = await MockAlpaca(MockConfig(rate=200, batch=4, key="k", secret="s")).start()
+        monkeypatch.setenv("ALPACA_WS_URL", mock.ws_url)
+        q = asyncio.Queue()
+        task = asyncio.create_task(alpaca_adapter.stream_ticks("DIA", q))
+        ticks = [await asyncio.wait_for(q.get(), 2) for _ in range(10)]
+        # a second connection is over the limit; wrong keys are refused
+        async with websockets.connect(mock.ws_url) as ws:
+            await ws.recv()
+            await ws.send(json.dumps({"action": "auth", "key": "k", "secret": "s"}))
+            over = json.loads(await ws.recv())
+        async with websockets.connect(mock.ws_url) as ws:
+            await ws.recv()
+            await ws.send(json.dumps({"action": "auth", "key": "k", "secret": "nope"}))
+            bad = json.loads(await ws.recv())
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await mock.stop()
+        return ticks, over, bad
+
+    ticks, over, bad = asyncio.run(go())
+    assert all(t.symbol == "DIA" and t.price > 0 for t in ticks)
+    assert over[0]["code"] == 406 and bad[0]["code"] == 401
+
+
+def test_orders_fill_via_trade_updates(monkeypatch):
+    _creds(monkeypatch)
+
+    async def go():
+        mock = await MockAlpaca(MockConfig(partials=2, fill_delay_ms=20, key="k", secret="s")).start()
+        execs = asyncio.Queue()
+        # configured the way the mock's banner says (ALPACA_PAPER_BASE / ALPACA_TRADE_STREAM_URL)
+        monkeypatch.setattr(SETTINGS, "alpaca_base", mock.rest_url)
+        monkeypatch.setattr(SETTINGS, "trade_stream_url", mock.stream_url)
+        oms = OMSRouter(execs, mode="live", track_orders=True)
+        oms.tracker.start()
+        while not oms.tracker.connected:
+            await asyncio.sleep(0.01)
+        await oms.place_order("DIA", "BUY", 100, reason="T4")
+        got = [await asyncio.wait_for(execs.get(), 2) for _ in range(2)]
+        (order,) = mock.orders.values()
+        via = (oms.tracker.stream_updates, oms.tracker.poll_updates)
+        await oms.aclose()
+        await mock.stop()
+        return got, order, via
+
+    got, order, (streamed, polled) = asyncio.run(go())
+    assert streamed >= 2 and polled == 0  # fills came over trade_updates, not REST polling
+    assert [(e.qty, e.status, e.reason) for e in got] == [(50, "partially_filled", "T4"), (100 - 50, "filled", "T4")]
+    assert order["status"] == "filled"
+    assert abs(sum(e.qty * e.price for e in got) / 100 - float(order["filled_avg_price"])) < 1e-3
+
+
+def test_rest_rate_limit():
+    async def go():
+        mock = await MockAlpaca(MockConfig(rate_limit=3)).start()
+        async with httpx.AsyncClient() as client:
+            codes = [(await client.get(f"{mock.rest_url}/v2/clock")).status_code for _ in range(5)]
+        await mock.stop()
+        return codes
+
+    assert asyncio.run(go()) == [200, 200, 200, 429, 429]
+
+
+def test_finished_orders_and_tasks_are_released():
+    async def go():
+        mock = await MockAlpaca(MockConfig(max_orders=2)).start()
+        ids = [mock._new_order({"symbol": "DIA", "qty": 1, "side": "buy"})[1]["id"] for _ in range(4)]
+        await asyncio.sleep(0.05)
+        tasks = len(mock._tasks)
+        mock._new_order({"symbol": "DIA", "qty": 1, "side": "buy"})
+        kept = set(mock.orders)
+        await mock.stop()
+        return ids, tasks, kept, len(mock._by_coid)
+
+    ids, tasks, kept, coids = asyncio.run(go())
+    assert tasks == 1  # only the market-data loop; fill and publish tasks are gone
+    assert kept >= set(ids[2:]) and not kept & set(ids[:2]) and len(kept) == coids == 3
@@ -0,0 +1,78 @@
+"""
+Signal netting: one beat's signals become one order per symbol (exits untouched, flat
+batches dropped), the risk gate routes the netted batch, an exit arriving mid-window goes
+out at once, and the ledger books the net fill once while crediting each trigger leg.
+"""
+import asyncio, dataclasses
+
+from config import SETTINGS
+from events import OrderSignal
+from ledger import Book
+from netting import net_signals
+from risk_gate import RiskGate
+
+
+def sig(reason, side, qty, symbol="DIA", ts=1):
+    return OrderSignal(ts, symbol, side, qty, reason, 480.0, None, 0.0, None)
+
+
+def test_net_signals():
+    out = net_signals([sig("T4", "BUY", 200), sig("T5", "BUY", 500), sig("PROTECT", "SELL", 50),
+                       sig("T14", "SELL", 400), sig("T1", "BUY", 10, "SPY"), sig("T8", "SELL", 10, "SPY")])
+    assert [(s.reason, s.side, s.qty) for s in out] == [("PROTECT", "SELL", 50), ("NET", "BUY", 300)]
+    assert out[1].legs == (("T4", 200), ("T5", 500), ("T14", -400))
+    lone = sig("T1", "BUY", 10)
+    assert net_signals([lone]) == [lone]
+
+
+def test_risk_gate_nets_a_beat_and_ledger_attributes_legs():
+    settings = dataclasses.replace(SETTINGS, net_signals=True, net_window_ms=0.0,
+                                   order_throttle_per_sec=1e9, max_position=10_000)
+
+    async def go():
+        signals, approvals = asyncio.Queue(), asyncio.Queue()
+        for s in (sig("T4", "BUY", 200), sig("T5", "BUY", 500), sig("T14", "SELL", 400)):
+            signals.put_nowait(s)
+        task = asyncio.create_task(RiskGate(settings=settings).run(signals, approvals))
+        appr = await asyncio.wait_for(approvals.get(), 1)
+        await asyncio.sleep(0.01)
+        task.cancel()
+        return appr, approvals.qsize()
+
+    appr, more = asyncio.run(go())
+    assert (appr.reason, appr.side, appr.qty, more) == ("NET", "BUY", 300, 0)
+
+    b = Book("DIA")
+    b.apply("SELL", 100, 481.0, "T1")
+    b.apply(appr.side, appr.qty, 480.0, appr.reason, appr.legs)  # covers the short, 200 left long
+    assert b.position == 200 and b.fills == 2 and b.avg_price == 480.0
+    t = b.by_trigger
+    assert (t["T4"].qty, t["T5"].qty, "T14" in t) == (86, 214, False)  # 300 traded, split 2:5
+    # the 100 covered realized +100; split over the BUY legs that traded, none to the crossed T14
+    assert abs(t["T4"].realized - 100 * 2 / 7) < 1e-9 and abs(t["T5"].realized - 100 * 5 / 7) < 1e-9
+    assert b.realized == 100.0
+
+
+def test_exit_is_not_held_by_the_netting_window():
+    settings = dataclasses.replace(SETTINGS, net_signals=True, net_window_ms=300.0,
+                                   order_throttle_per_sec=1e9, max_position=10_000)
+
+    async def go():
+        loop = asyncio.get_running_loop()
+        signals, approvals = asyncio.Queue(), asyncio.Queue()
+        task = asyncio.create_task(RiskGate(settings=settings).run(signals, approvals))
+        signals.put_nowait(sig("T4", "BUY", 200))
+        await asyncio.sleep(0.02)  # the window opened by T4 is running
+        signals.put_nowait(sig("PROTECT", "SELL", 50))
+        t0 = loop.time()
+        exit_ = await asyncio.wait_for(approvals.get(), 1)
+        exit_wait = loop.time() - t0
+        signals.put_nowait(sig("T5", "BUY", 100))
+        entry = await asyncio.wait_for(approvals.get(), 1)
+        task.cancel()
+        return exit_, exit_wait, entry, loop.time() - t0
+
+    exit_, exit_wait, entry, entry_wait = asyncio.run(go())
+    assert exit_.reason == "PROTECT" and exit_wait < 0.1
+    assert (entry.reason, entry.qty, entry.legs) == ("NET", 300, (("T4", 200), ("T5", 100)))  # still one window
+    assert entry_wait >= 0.2
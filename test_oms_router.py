@@ -0,0 +1,143 @@
+"""
+OMSRouter keeps one pooled client for every order (warm-up and keep-alive pings included),
+records per-order latency, closes the pool when it shuts down, and dispatches concurrently
+across symbols but one entry at a time per symbol (exits are never held).
+"""
+import asyncio, json
+
+import httpx
+
+from events import OrderApproved
+from latency import LatencyHistogram
+from oms_router import OMSRouter
+
+
+def test_orders_share_one_client():
+    seen = []
+
+    def handler(req: httpx.Request):
+        seen.append((req.method, req.url.path))
+        if req.url.path.endswith("/orders"):
+            assert json.loads(req.content)["side"] == "buy"
+            return httpx.Response(200, json={"status": "filled", "filled_avg_price": "480.10"})
+        return httpx.Response(200, json={"is_open": True})
+
+    async def go():
+        oms = OMSRouter(asyncio.Queue(), mode="live", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                        track_orders=False)
+        client = oms.client
+        await oms.start()
+        assert await oms.warm_up(2) == 2
+        px = [await oms.place_order("DIA", "BUY", 10) for _ in range(3)]
+        assert oms.client is client and px == [480.10] * 3
+        assert oms.latency.n == 3 and oms.latency.max_ns > 0
+        await oms.aclose()
+        assert client.is_closed and oms._keepalive_task is None
+
+    asyncio.run(go())
+    assert sum(m == "POST" and p.endswith("/orders") for m, p in seen) == 3
+    assert sum(m == "GET" and p.endswith("/clock") for m, p in seen) >= 2
+
+
+def test_latency_percentiles():
+    h = LatencyHistogram()
+    for ms in range(1, 101):
+        h.record(ms * 1_000_000)
+    s = h.summary()
+    assert s["n"] == 100 and s["max"] == 100.0 and abs(s["mean"] - 50.5) < 1e-9
+    assert 50.0 <= s["p50"] <= 50.0 * 1.05 and 99.0 <= s["p99"] <= 100.0
+
+
+def test_dispatch_is_concurrent_and_exits_go_first():
+    delays = {"10": 0.3, "20": 0.0, "30": 0.0}
+
+    async def handler(req: httpx.Request):
+        if req.url.path.endswith("/orders"):
+            await asyncio.sleep(delays[str(json.loads(req.content)["qty"])])
+            return httpx.Response(200, json={"filled_avg_price": "480.00"})
+        return httpx.Response(200, json={})
+
+    async def go():
+        approvals, execs = asyncio.Queue(), asyncio.Queue()
+        oms = OMSRouter(execs, mode="live", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                        track_orders=False)
+        oms.max_inflight = 2  # one slot for entries, one held back for exits
+        task = asyncio.create_task(oms.run(approvals))
+        approvals.put_nowait(OrderApproved(0, "DIA", "BUY", 10, "T4"))
+        await asyncio.sleep(0.05)  # T4 is in flight (slow broker)
+        approvals.put_nowait(OrderApproved(0, "QQQ", "BUY", 20, "T5"))
+        approvals.put_nowait(OrderApproved(0, "SPY", "SELL", 30, "PROTECT"))
+        got = [await asyncio.wait_for(execs.get(), 2) for _ in range(3)]
+        m = oms.metrics()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return [e.reason for e in got], m
+
+    order, m = asyncio.run(go())
+    # the slow T4 holds the entry slot: PROTECT overtakes it, T5 waits its turn behind it
+    assert order == ["PROTECT", "T4", "T5"]
+    assert m["dispatched"] == 3 and m["inflight_max"] == 2 and m["queued"] == 0
+    assert m["wait_max_ms"] >= 200  # T5 queued behind T4
+
+
+def test_one_entry_in_flight_per_symbol():
+    delays = {"10": 0.2, "20": 0.0, "30": 0.0}
+    posted = []
+
+    async def handler(req: httpx.Request):
+        body = json.loads(req.content)
+        posted.append(body["symbol"])
+        await asyncio.sleep(delays[str(body["qty"])])
+        return httpx.Response(200, json={"filled_avg_price": "480.00"})
+
+    async def go():
+        approvals, execs = asyncio.Queue(), asyncio.Queue()
+        oms = OMSRouter(execs, mode="live", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                        track_orders=False)
+        oms.max_inflight = 4
+        task = asyncio.create_task(oms.run(approvals))
+        # the slow DIA order would finish after the fast one if both were in flight
+        for appr in (OrderApproved(0, "DIA", "BUY", 10, "T4"), OrderApproved(0, "DIA", "BUY", 20, "T5"),
+                     OrderApproved(0, "SPY", "BUY", 30, "T1")):
+            approvals.put_nowait(appr)
+        got = [await asyncio.wait_for(execs.get(), 2) for _ in range(3)]
+        m = oms.metrics()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return [(e.symbol, e.reason) for e in got], m
+
+    order, m = asyncio.run(go())
+    assert order == [("SPY", "T1"), ("DIA", "T4"), ("DIA", "T5")]  # SPY not held up by DIA
+    assert posted == ["DIA", "SPY", "DIA"] and m["inflight_max"] == 2 and m["queued"] == 0
+
+
+def test_exit_is_not_held_behind_a_hung_entry():
+    release = None
+
+    async def handler(req: httpx.Request):
+        if req.url.path.endswith("/orders") and str(json.loads(req.content)["qty"]) == "10":
+            await release.wait()  # hung entry POST
+        return httpx.Response(200, json={"filled_avg_price": "480.00"})
+
+    async def go():
+        nonlocal release
+        release = asyncio.Event()
+        approvals, execs = asyncio.Queue(), asyncio.Queue()
+        oms = OMSRouter(execs, mode="live", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                        track_orders=False)
+        oms.max_inflight = 2
+        task = asyncio.create_task(oms.run(approvals))
+        approvals.put_nowait(OrderApproved(0, "DIA", "BUY", 10, "T4"))
+        await asyncio.sleep(0.05)  # T4's POST is in flight and hangs
+        approvals.put_nowait(OrderApproved(0, "DIA", "BUY", 20, "T5"))
+        approvals.put_nowait(OrderApproved(0, "DIA", "SELL", 30, "PROTECT"))
+        first = await asyncio.wait_for(execs.get(), 1)
+        queued = oms.metrics()["queued"]
+        release.set()
+        rest = [await asyncio.wait_for(execs.get(), 1) for _ in range(2)]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return [e.reason for e in [first] + rest], queued
+
+    order, queued = asyncio.run(go())
+    assert order == ["PROTECT", "T4", "T5"] and queued == 1  # T5 still waits for T4
@@ -0,0 +1,119 @@
+"""
+Order tracker against a local mock broker: fills come from trade_updates events at their
+own prices (partials included, duplicates ignored), polling takes over when the stream is
+unavailable, and an order whose POST timed out is resolved by client_order_id.
+"""
+import asyncio, json
+
+import httpx
+import websockets
+
+from config import SETTINGS
+from oms_router import OMSRouter
+
+
+class MockBroker:
+    """REST via httpx.MockTransport, trade_updates via a websockets server on 127.0.0.1."""
+
+    def __init__(self):
+        self.orders = {}          # client_order_id -> broker order snapshot
+        self.push = asyncio.Queue()
+        self.timeout_posts = False
+
+    def rest(self, req: httpx.Request):
+        if req.method == "POST" and req.url.path.endswith("/orders"):
+            body = json.loads(req.content)
+            coid = body["client_order_id"]
+            self.orders[coid] = {"id": f"o{len(self.orders) + 1}", "client_order_id": coid, "status": "accepted",
+                                 "qty": str(body["qty"]), "filled_qty": "0", "filled_avg_price": None}
+            if self.timeout_posts:
+                raise httpx.ReadTimeout("slow broker", request=req)
+            return httpx.Response(200, json=self.orders[coid])
+        if req.url.path.endswith("/orders:by_client_order_id"):
+            o = self.orders.get(req.url.params["client_order_id"])
+            return httpx.Response(200, json=o) if o else httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={})
+
+    async def ws(self, conn):
+        await conn.recv()
+        await conn.send(json.dumps({"stream": "authorization", "data": {"status": "authorized", "action": "authenticate"}}))
+        await conn.recv()
+        await conn.send(json.dumps({"stream": "listening", "data": {"streams": ["trade_updates"]}}))
+        async def pump():
+            while True:
+                await conn.send(json.dumps(await self.push.get()))
+        task = asyncio.create_task(pump())
+        await conn.wait_closed()
+        task.cancel()
+
+    def fill(self, coid, event, qty, price, filled, avg, status):
+        o = self.orders[coid]
+        o.update(filled_qty=str(filled), filled_avg_price=str(avg), status=status)
+        return {"stream": "trade_updates", "data": {"event": event, "price": str(price), "qty": str(qty), "order": dict(o)}}
+
+
+def _router(broker, exec_q):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(broker.rest))
+    return OMSRouter(exec_q, mode="live", client=client, track_orders=True)
+
+
+def test_stream_fills_at_event_prices():
+    async def go():
+        broker, execs = MockBroker(), asyncio.Queue()
+        async with websockets.serve(broker.ws, "127.0.0.1", 0) as server:
+            oms = _router(broker, execs)
+            oms.tracker.stream_url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+            oms.tracker.start()
+            while not oms.tracker.connected:
+                await asyncio.sleep(0.01)
+            assert await oms.place_order("DIA", "BUY", 100, reason="T4") is None
+            (coid,) = broker.orders
+            part = broker.fill(coid, "partial_fill", 40, 480.10, 40, 480.10, "partially_filled")
+            await broker.push.put(part)
+            await broker.push.put(part)  # duplicate delivery
+            await broker.push.put(broker.fill(coid, "fill", 60, 480.22, 100, 480.172, "filled"))
+            got = [await asyncio.wait_for(execs.get(), 2) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            assert execs.empty() and not oms.tracker.orders
+            await oms.aclose()
+        return got
+
+    got = asyncio.run(go())
+    assert [(e.side, e.qty, e.price, e.status, e.reason) for e in got] == [
+        ("BUY", 40, 480.10, "partially_filled", "T4"), ("BUY", 60, 480.22, "filled", "T4")]
+
+
+def test_polling_fallback_and_timed_out_post(monkeypatch):
+    monkeypatch.setattr(SETTINGS, "order_poll_sec", 0.02)
+
+    async def go():
+        broker, execs = MockBroker(), asyncio.Queue()
+        oms = _router(broker, execs)
+        oms.tracker.stream_url = "ws://127.0.0.1:9"  # nothing listening: stream stays down
+        oms.tracker.start()
+        await oms.place_order("DIA", "SELL", 50, reason="PROTECT")
+        (coid,) = broker.orders
+        broker.orders[coid].update(filled_qty="50", filled_avg_price="479.95", status="filled")
+        e = await asyncio.wait_for(execs.get(), 2)
+
+        # POST times out but the broker did take the order: the poller finds and books it
+        broker.timeout_posts = True
+        try:
+            await oms.place_order("DIA", "BUY", 10, reason="T1")
+        except httpx.ReadTimeout:
+            pass
+        coid2 = [c for c in broker.orders if c != coid][0]
+        broker.orders[coid2].update(filled_qty="10", filled_avg_price="480.00", status="filled")
+        e2 = await asyncio.wait_for(execs.get(), 2)
+
+        # ...and one the broker never saw is dropped without an execution
+        lost = oms.tracker.track("DIA", "BUY", 5, "T2")
+        lost.posted = False
+        await asyncio.sleep(0.1)
+        assert not oms.tracker.orders and execs.empty()
+        await oms.aclose()
+        return e, e2
+
+    e, e2 = asyncio.run(go())
+    assert (e.side, e.qty, e.price, e.status) == ("SELL", 50, 479.95, "filled")
+    assert (e2.side, e2.qty, e2.price) == ("BUY", 10, 480.0)
@@ -0,0 +1,30 @@
+"""
+Vectorized avg-cost PnL must reproduce the dashboards' per-row replay: random fill streams
+(including zero-qty and unpriced fills) and a hand-checked flip.
+"""
+import numpy as np
+
+from pnl import avg_cost_pnl, avg_cost_pnl_scalar
+
+FIELDS = ("realized", "entry_price", "unrealized", "cumulative", "position")
+
+
+def test_matches_scalar_replay():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        n = int(rng.integers(1, 200))
+        side = rng.choice(["BUY", "SELL"], n)
+        qty = rng.integers(0, 30, n)
+        price = np.round(480 + rng.normal(0, 2, n), 2)
+        price[rng.random(n) < 0.05] = 0.0
+        vec, ref = avg_cost_pnl(side, qty, price), avg_cost_pnl_scalar(side, qty, price)
+        for f in FIELDS:
+            np.testing.assert_allclose(getattr(vec, f), getattr(ref, f), rtol=1e-9, atol=1e-7)
+
+
+def test_flip_example():
+    cols = avg_cost_pnl(["BUY", "BUY", "SELL", "BUY"], [10, 10, 30, 10], [100.0, 102.0, 104.0, 103.0])
+    assert cols.entry_price.tolist() == [100.0, 101.0, 104.0, 104.0]
+    assert cols.realized.tolist() == [0.0, 0.0, 60.0, 10.0]
+    assert cols.position.tolist() == [10, 20, -10, 0]
+    assert cols.cumulative.tolist() == [0.0, 20.0, 60.0, 70.0]
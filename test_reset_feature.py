@@ -166,7 +166,7 @@ def test_runtime_directory() -> bool:
             print_pass("runtime/ directory exists")
             
             # Check for expected files (may not exist yet)
-            expected = ["state.json", "trades.jsonl", "prices.jsonl", "mode.txt"]
+            expected = ["state.json", "trades.jsonl", "prices", "mode.txt"]
             for fname in expected:
                 fpath = runtime / fname
                 if fpath.exists():
@@ -0,0 +1,35 @@
+"""
+Tail reader: the first poll reads only the requested window from EOF, later polls parse just
+the appended lines (holding back a half-written one), and an archived/truncated file resets.
+"""
+import json
+
+from tail_reader import TailReader
+
+
+def _write(path, rows, mode="a"):
+    with open(path, mode) as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+def test_window_incremental_and_rotation(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    _write(path, [{"i": i} for i in range(1000)])
+    tr = TailReader(path, window=5)
+    assert [r["i"] for r in tr.poll()] == [995, 996, 997, 998, 999]
+
+    _write(path, [{"i": 1000}])
+    with open(path, "a") as f:
+        f.write('{"i": 10')  # writer mid-flush
+    assert [r["i"] for r in tr.poll()] == [1000]
+    with open(path, "a") as f:
+        f.write('01}\n')
+    assert [r["i"] for r in tr.poll()] == [1001]
+    assert tr.poll() == []
+
+    path.rename(tmp_path / "archived.jsonl")  # CLEAR LOGS
+    assert tr.poll() == [] and len(tr.records) == 0
+    _write(path, [{"i": 0}, {"i": 1}], mode="w")
+    assert [r["i"] for r in tr.snapshot()] == [0, 1]
+    assert tr.rotations == 1
@@ -0,0 +1,53 @@
+"""
+Tick loader: chunked parsing of plain and gzip'd CSVs matches the row-by-row semantics
+(epoch-ns or ISO ts, optional size), and the .npy cache is reused until the source changes.
+"""
+import datetime as dt, gzip, os
+
+from tick_loader import cache_path, first_ts, iter_batches, load_ticks
+
+ROWS = [(1_700_000_000_000_000_000 + i * 250_000_000, 480.0 + i * 0.01, i % 7) for i in range(10)]
+
+
+def _write(path, rows, header="ts,price,size"):
+    text = header + "\n" + "".join(",".join(map(str, r)) + "\n" for r in rows)
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+
+
+def test_chunks_gzip_and_iso(tmp_path):
+    plain, gz = tmp_path / "t.csv", tmp_path / "t.csv.gz"
+    _write(plain, ROWS)
+    _write(gz, ROWS)
+    chunks = list(iter_batches(plain, chunk_rows=4))
+    assert [len(b) for b in chunks] == [4, 4, 2]
+    for b in (load_ticks(plain), load_ticks(gz)):
+        assert b.ts_ns.tolist() == [r[0] for r in ROWS]
+        assert b.price.tolist() == [float(str(r[1])) for r in ROWS]
+        assert b.size.tolist() == [r[2] for r in ROWS]
+    assert first_ts(gz) == ROWS[0][0]
+
+    iso = tmp_path / "iso.csv"
+    _write(iso, [("2024-10-04T09:30:00.250000-04:00", 480.5), ("2024-10-04T13:30:01Z", 480.6)], header="ts,price")
+    b = load_ticks(iso)
+    assert b.ts_ns.tolist() == [1728048600_250000000, 1728048601_000000000]
+    assert b.size.tolist() == [0, 0]
+    naive = tmp_path / "naive.csv"
+    _write(naive, [("2024-10-04T09:30:00", 1.0, 1)])
+    assert load_ticks(naive).ts_ns[0] == int(dt.datetime.fromisoformat("2024-10-04T09:30:00").timestamp()) * 10**9
+
+
+def test_cache_reused_until_source_changes(tmp_path):
+    path = tmp_path / "t.csv"
+    _write(path, ROWS)
+    first = load_ticks(path, cache=True)
+    cp = cache_path(path)
+    assert cp.exists() and load_ticks(path, cache=True).ts_ns.tolist() == first.ts_ns.tolist()
+
+    _write(path, ROWS[:3])
+    os.utime(path, ns=(1, 1))  # make sure the fingerprint changes even within one mtime tick
+    assert len(load_ticks(path, cache=True)) == 3
+    assert not cp.exists() and cache_path(path).exists()
@@ -0,0 +1,38 @@
+"""
+Binary tick store: appends land in per-day segments, range/tail reads binary-search across
+them, and a torn trailing record is ignored by readers and trimmed by the next writer.
+"""
+from tick_store import DAY_NS, StoreReader, StoreWriter
+
+
+def test_daily_segments_and_range(tmp_path):
+    w = StoreWriter(tmp_path)
+    day0 = 20_000 * DAY_NS
+    ts = [day0 + i * 3_600_000_000_000 for i in range(30)]  # hourly, spans two days
+    for i, t in enumerate(ts):
+        w.append(t, 100.0 + i, i)
+    w.close()
+
+    r = StoreReader(tmp_path)
+    assert [p.name for p in r.segments()] == ["20241004.bin", "20241005.bin"]
+    got = r.range(ts[20], ts[26])
+    assert got["ts_ns"].tolist() == ts[20:26]
+    assert got["price"].tolist() == [120.0, 121.0, 122.0, 123.0, 124.0, 125.0]
+    assert r.tail(3)["size"].tolist() == [27, 28, 29]
+    assert r.tail(100)["ts_ns"].tolist() == ts
+    assert float(r.latest()["price"]) == 129.0
+
+
+def test_torn_record_is_ignored_then_trimmed(tmp_path):
+    w = StoreWriter(tmp_path)
+    w.append(1_000, 1.0, 1)
+    w.close()
+    seg = StoreReader(tmp_path).segments()[0]
+    with open(seg, "ab") as f:
+        f.write(b"\x01\x02\x03")  # half-written record
+    assert len(StoreReader(tmp_path).tail(10)) == 1
+
+    w = StoreWriter(tmp_path)
+    w.append(2_000, 2.0, 2)
+    w.close()
+    assert StoreReader(tmp_path).tail(10)["price"].tolist() == [1.0, 2.0]
@@ -0,0 +1,51 @@
+"""
+Stage tracing: stamps set at the feed travel signal -> approval -> execution and land in
+per-stage, per-symbol histograms; buffered samples fold into the same buckets as record().
+"""
+import asyncio, time
+
+from events import OrderSignal, Tick
+from latency import LatencyHistogram
+from oms_router import OMSRouter
+from risk_gate import RiskGate
+from tracer import STAGES, TRACER, Tracer
+
+
+def test_stamps_flow_through_pipeline(monkeypatch):
+    monkeypatch.setattr(TRACER, "enabled", True)
+    TRACER.reset()
+
+    class Engine:
+        last_price = 480.0
+
+    async def go():
+        tick = Tick(ts_ns=time.time_ns(), symbol="DIA", price=480.0, recv_ns=TRACER.now())
+        TRACER.span("tick_queue", tick.symbol, tick.recv_ns, time.perf_counter_ns())
+        sig = OrderSignal(ts_ns=tick.ts_ns, symbol="DIA", side="BUY", qty=10, reason="T1", base_price=480.0,
+                          first_order_price=None, from_base_pts=0.14, from_first_pts=None)
+        TRACER.on_signal(sig, tick.recv_ns)
+        appr = RiskGate().check(sig, time.time())
+        execs = asyncio.Queue()
+        await OMSRouter(execs, engine=Engine(), mode="sim", track_orders=False)._execute(appr)
+        return tick, appr, execs.get_nowait()
+
+    try:
+        tick, appr, e = asyncio.run(go())
+        snap = TRACER.snapshot()
+    finally:
+        TRACER.reset()
+    assert tick.recv_ns <= appr.signal_ns <= appr.approve_ns <= appr.send_ns <= e.fill_ns
+    assert (e.tick_ns, e.signal_ns, e.approve_ns, e.send_ns) == (tick.recv_ns, appr.signal_ns, appr.approve_ns, appr.send_ns)
+    assert set(snap) == set(STAGES) - {"price_age"} and all(s["DIA"]["n"] == 1 for s in snap.values())
+    assert snap["end_to_end"]["DIA"]["max"] >= snap["broker"]["DIA"]["max"]
+
+
+def test_buffered_samples_match_histogram():
+    t, h = Tracer(True), LatencyHistogram()
+    samples = [500, 2_000, 35_000, 1_200_000, 7_000_000] * 1000  # crosses FOLD_AT
+    for ns in samples:
+        t.span("broker", "DIA", 1_000, 1_000 + ns)
+        h.record(ns)
+    got = t.snapshot()["broker"]["DIA"]
+    assert got == h.summary()
+    assert not Tracer(False).now()
@@ -0,0 +1,112 @@
+# tick_loader.py — chunked tick CSV / CSV.gz loader yielding TickBatch, with an optional binary cache
+"""
+Reads ``ts,price,size`` tick files (header required, extra columns ignored, ``size``
+optional) with pandas' C parser in large chunks instead of a ``csv.DictReader`` + ``Tick``
+per row::
+
+    for batch in iter_batches("ticks.csv.gz"):   # one TickBatch per chunk
+        ...
+    batch = load_ticks("ticks.csv", cache=True)  # whole file; parsed form cached next to it
+
+The ``ts`` format is detected once, on the first chunk: integers are epoch ns, anything
+else is ISO-8601 and converted per chunk with one vectorized ``to_datetime`` (naive times
+are local time, as ``datetime.fromisoformat(...).timestamp()`` always treated them).
+gzip is detected from the file's magic bytes, not its name.
+
+Cache: ``<file>.<size>-<mtime_ns>.ticks.npy`` (``CACHE_DTYPE`` records), memory-mapped on
+load so a repeated backtest skips parsing entirely. A changed source gets a new name and
+the stale cache is removed when the new one is written.
+"""
+import os, pathlib
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import SETTINGS
+from events import TickBatch
+
+CACHE_DTYPE = np.dtype([("ts_ns", "<i8"), ("price", "<f8"), ("size", "<i8")])
+CHUNK_ROWS = 1_000_000
+
+
+def _compression(path: pathlib.Path) -> Optional[str]:
+    with open(path, "rb") as f:
+        return "gzip" if f.read(2) == b"\x1f\x8b" else None
+
+
+def _iso_to_ns(values: pd.Series) -> np.ndarray:
+    if pd.Timestamp(values.iloc[0]).tzinfo is not None:  # offsets may differ row to row (DST)
+        return pd.to_datetime(values, format="ISO8601", utc=True).dt.as_unit("ns").astype("int64").to_numpy()
+    from dateutil.tz import tzlocal
+    ts = pd.to_datetime(values, format="ISO8601")
+    ts = ts.dt.tz_localize(tzlocal(), ambiguous=np.zeros(len(ts), dtype=bool), nonexistent="shift_forward")
+    return ts.dt.as_unit("ns").astype("int64").to_numpy()
+
+
+def iter_batches(path, symbol: Optional[str] = None, chunk_rows: int = CHUNK_ROWS) -> Iterator[TickBatch]:
+    """Yield the file as ``TickBatch`` chunks of up to ``chunk_rows`` ticks."""
+    path = pathlib.Path(path)
+    symbol = symbol or SETTINGS.symbol
+    compression = _compression(path)
+    header = pd.read_csv(path, nrows=0, compression=compression)
+    cols = [c for c in ("ts", "price", "size") if c in header.columns]
+    if "ts" not in cols or "price" not in cols:
+        raise ValueError(f"{path}: tick CSV needs ts and price columns, got {list(header.columns)}")
+    iso = None
+    with pd.read_csv(path, usecols=cols, chunksize=chunk_rows, compression=compression,
+                     dtype={"price": np.float64}, engine="c") as reader:
+        for df in reader:
+            if not len(df):
+                continue
+            if iso is None:
+                iso = df["ts"].dtype.kind not in "iu"
+            ts_ns = _iso_to_ns(df["ts"]) if iso else df["ts"].to_numpy(dtype=np.int64)
+            size = (df["size"].fillna(0).to_numpy(dtype=np.int64) if "size" in df
+                    else np.zeros(len(df), dtype=np.int64))
+            yield TickBatch(symbol, ts_ns, df["price"].to_numpy(), size)
+
+
+def first_ts(path) -> Optional[int]:
+    """Timestamp of the first row (parses a single row)."""
+    for batch in iter_batches(path, chunk_rows=1):
+        return int(batch.ts_ns[0])
+    return None
+
+
+def cache_path(path) -> pathlib.Path:
+    path = pathlib.Path(path)
+    st = os.stat(path)
+    return path.with_name(f"{path.name}.{st.st_size}-{st.st_mtime_ns}.ticks.npy")
+
+
+def _write_cache(path: pathlib.Path, batch: TickBatch):
+    target = cache_path(path)
+    recs = np.empty(len(batch), dtype=CACHE_DTYPE)
+    recs["ts_ns"], recs["price"], recs["size"] = batch.ts_ns, batch.price, batch.size
+    tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.save(f, recs)
+        os.replace(tmp, target)
+        for old in path.parent.glob(f"{path.name}.*.ticks.npy"):
+            if old != target:
+                old.unlink(missing_ok=True)
+    except OSError:
+        tmp.unlink(missing_ok=True)  # read-only data dir: run uncached
+
+
+def load_ticks(path, symbol: Optional[str] = None, cache: bool = False) -> TickBatch:
+    """Whole file as one ``TickBatch``; ``cache=True`` reuses (or writes) the parsed .npy."""
+    path = pathlib.Path(path)
+    symbol = symbol or SETTINGS.symbol
+    if cache:
+        cp = cache_path(path)
+        if cp.exists():
+            recs = np.load(cp, mmap_mode="r")
+            return TickBatch(symbol, recs["ts_ns"], recs["price"], recs["size"])
+    batches = list(iter_batches(path, symbol))
+    batch = TickBatch.concat(batches) if batches else TickBatch(symbol, [], [])
+    if cache:
+        _write_cache(path, batch)
+    return batch
@@ -0,0 +1,183 @@
+# tick_store.py — append-only fixed-record binary store with daily segments and mmap reads
+"""
+Records are packed little-endian structs (``TICK_DTYPE``: ts_ns int64, price float64,
+size int32 = 20 bytes) appended to one segment file per UTC day::
+
+    runtime/prices/20250114.bin
+    runtime/prices/20250115.bin
+
+Readers memory-map the segments and binary-search the ts column, so "last 5 minutes" costs
+the same on day one as after a month of uptime. Writers must append in non-decreasing ts
+order (wall-clock taps do). Any fixed-size record with a leading int64 ``ts_ns`` field works
+(pass ``dtype=``), e.g. OHLC bars.
+"""
+import os, pathlib, time, datetime as dt
+from typing import Optional
+
+import numpy as np
+
+from events import TickBatch
+
+TICK_DTYPE = np.dtype([("ts_ns", "<i8"), ("price", "<f8"), ("size", "<i4")])
+SEGMENT_SUFFIX = ".bin"
+DAY_NS = 86_400 * 1_000_000_000
+
+
+def segment_name(ts_ns: int) -> str:
+    return dt.datetime.fromtimestamp(ts_ns // DAY_NS * 86_400, dt.timezone.utc).strftime("%Y%m%d") + SEGMENT_SUFFIX
+
+
+def _segment_day(path: pathlib.Path) -> Optional[int]:
+    """Day number (ts_ns // DAY_NS) encoded in a segment filename, or None."""
+    try:
+        d = dt.datetime.strptime(path.stem, "%Y%m%d").replace(tzinfo=dt.timezone.utc)
+    except ValueError:
+        return None
+    return int(d.timestamp()) // 86_400
+
+
+class StoreWriter:
+    """Appends records to the current day's segment; rotates when the day changes."""
+
+    def __init__(self, root, dtype: np.dtype = TICK_DTYPE):
+        self.root = pathlib.Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dtype = np.dtype(dtype)
+        self._f = None
+        self._day = None
+        self._path = None
+        self._ino = None
+        self.records = 0
+
+    def _open(self, ts_ns: int):
+        self.close()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._path = self.root / segment_name(ts_ns)
+        self._f = open(self._path, "ab")
+        self._ino = os.fstat(self._f.fileno()).st_ino
+        # drop a torn trailing record left by a crash mid-write
+        size = self._f.tell()
+        if size % self.dtype.itemsize:
+            self._f.truncate(size - size % self.dtype.itemsize)
+        self._day = ts_ns // DAY_NS
+
+    def _needs_open(self, ts_ns: int) -> bool:
+        if self._f is None or ts_ns // DAY_NS != self._day:
+            return True
+        try:  # segment archived/deleted underneath us (dashboard "clear logs")
+            return os.stat(self._path).st_ino != self._ino
+        except FileNotFoundError:
+            return True
+
+    def append(self, ts_ns: int, *fields):
+        """Append one record (``ts_ns`` followed by the remaining fields in dtype order)."""
+        if self._needs_open(ts_ns):
+            self._open(ts_ns)
+        rec = np.array([(ts_ns, *fields)], dtype=self.dtype)
+        self._f.write(rec.tobytes())
+        self._f.flush()
+        self.records += 1
+
+    def append_many(self, recs: np.ndarray):
+        """Append a ts-sorted structured array (split across day segments as needed)."""
+        recs = np.asarray(recs, dtype=self.dtype)
+        if not len(recs):
+            return
+        days = recs["ts_ns"] // DAY_NS
+        cuts = np.flatnonzero(np.diff(days)) + 1
+        for chunk in np.split(recs, cuts):
+            ts0 = int(chunk["ts_ns"][0])
+            if self._needs_open(ts0):
+                self._open(ts0)
+            self._f.write(chunk.tobytes())
+        self._f.flush()
+        self.records += len(recs)
+
+    def append_batch(self, batch: TickBatch):
+        recs = np.empty(len(batch), dtype=self.dtype)
+        recs["ts_ns"], recs["price"], recs["size"] = batch.ts_ns, batch.price, batch.size
+        self.append_many(recs)
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+class StoreReader:
+    """Memory-mapped, read-only view over a store directory."""
+
+    def __init__(self, root, dtype: np.dtype = TICK_DTYPE):
+        self.root = pathlib.Path(root)
+        self.dtype = np.dtype(dtype)
+        self._maps: dict[str, tuple[int, int, np.ndarray]] = {}  # name -> (inode, size, memmap)
+
+    def segments(self) -> list[pathlib.Path]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p for p in self.root.iterdir() if p.suffix == SEGMENT_SUFFIX and _segment_day(p) is not None)
+
+    def _map(self, path: pathlib.Path) -> np.ndarray:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return np.empty(0, dtype=self.dtype)
+        n = st.st_size // self.dtype.itemsize  # ignore a partially written trailing record
+        cached = self._maps.get(path.name)
+        if cached and cached[0] == st.st_ino and cached[1] == n:
+            return cached[2]
+        arr = np.memmap(path, dtype=self.dtype, mode="r", shape=(n,)) if n else np.empty(0, dtype=self.dtype)
+        self._maps[path.name] = (st.st_ino, n, arr)
+        return arr
+
+    def range(self, start_ns: Optional[int] = None, end_ns: Optional[int] = None) -> np.ndarray:
+        """Records with start_ns <= ts < end_ns (either bound may be None)."""
+        lo_day = None if start_ns is None else start_ns // DAY_NS
+        hi_day = None if end_ns is None else (end_ns - 1) // DAY_NS
+        parts = []
+        for seg in self.segments():
+            day = _segment_day(seg)
+            if (lo_day is not None and day < lo_day) or (hi_day is not None and day > hi_day):
+                continue
+            arr = self._map(seg)
+            ts = arr["ts_ns"]
+            i = 0 if start_ns is None else int(np.searchsorted(ts, start_ns, side="left"))
+            j = len(arr) if end_ns is None else int(np.searchsorted(ts, end_ns, side="left"))
+            if j > i:
+                parts.append(arr[i:j])
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(parts)  # copies; the result stays valid after segments rotate
+
+    def tail(self, n: int) -> np.ndarray:
+        """Last ``n`` records across segments."""
+        parts, need = [], n
+        for seg in reversed(self.segments()):
+            if need <= 0:
+                break
+            arr = self._map(seg)
+            parts.append(arr[max(0, len(arr) - need):])
+            need -= len(parts[-1])
+        if not parts:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(parts[::-1])
+
+    def since(self, seconds: float, now_ns: Optional[int] = None) -> np.ndarray:
+        end = time.time_ns() if now_ns is None else now_ns
+        return self.range(end - int(seconds * 1e9), None)
+
+    def latest(self):
+        t = self.tail(1)
+        return t[0] if len(t) else None
+
+    def batch(self, recs: np.ndarray, symbol: str = "") -> TickBatch:
+        return TickBatch(symbol, recs["ts_ns"], recs["price"], recs["size"])
+
+    def prune(self, keep_days: int) -> int:
+        """Delete segments older than the newest ``keep_days``; returns how many were removed."""
+        segs = self.segments()
+        old = segs[:-keep_days] if keep_days > 0 else segs
+        for p in old:
+            self._maps.pop(p.name, None)
+            p.unlink(missing_ok=True)
+        return len(old)
@@ -0,0 +1,138 @@
+# tracer.py — per-stage latency of the tick -> signal -> approval -> execution path
+"""
+With ``TRACE=true`` events carry ``perf_counter_ns`` stamps as they move through the
+pipeline (``Tick.recv_ns`` -> ``tick_ns``/``signal_ns`` on the signal -> ``approve_ns`` ->
+``send_ns`` -> ``fill_ns`` on the execution) and ``TRACER`` keeps one ``LatencyHistogram``
+per (stage, symbol):
+
+  tick_queue      feed put -> engine took the tick off ticks_q
+  price_age       age of last_price when a beat evaluated it
+  tick_to_signal  the tick behind the price -> signal emitted (includes waiting for the beat)
+  risk            signal emitted -> approved (signals_q, netting window, checks)
+  oms_queue       approved -> order sent (approvals_q, dispatcher heap)
+  broker          order sent -> fill reported (REST round trip + broker, or sim fill model)
+  end_to_end      tick received -> fill reported
+
+``run()`` prints the table every ``TRACE_DUMP_SEC`` and replaces ``runtime/trace.json``;
+``summary()`` does the same once at shutdown. Disabled, every hook is one attribute test
+and the stamps stay 0. Enabled, a hook is a clock read and an append of the raw sample to
+a per-(stage, symbol) ``array``; samples are folded into the histograms with numpy every
+``FOLD_AT`` samples and before each report, which keeps the per-event cost well under a
+microsecond (a ``LatencyHistogram.record`` per sample costs more than that on its own).
+"""
+import asyncio, json
+from array import array
+from time import perf_counter_ns
+from typing import Optional
+
+from config import SETTINGS
+from journal import JOURNAL
+from latency import LatencyHistogram
+
+STAGES = ("tick_queue", "price_age", "tick_to_signal", "risk", "oms_queue", "broker", "end_to_end")
+TRACE_PATH = "runtime/trace.json"
+FOLD_AT = 4096  # buffered samples per (stage, symbol) before folding into the histogram
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.hists: dict[tuple[str, str], LatencyHistogram] = {}
+        self._buf: dict[tuple[str, str], array] = {}
+
+    def now(self) -> int:
+        return perf_counter_ns() if self.enabled else 0
+
+    def record(self, stage: str, symbol: str, ns: int):
+        key = (stage, symbol)
+        buf = self._buf.get(key)
+        if buf is None:
+            buf = self._buf[key] = array("q")
+            self.hists[key] = LatencyHistogram(f"{stage}:{symbol}")
+        buf.append(ns)
+        if len(buf) >= FOLD_AT:
+            self._fold(key, buf)
+
+    def _fold(self, key, buf: array):
+        self.hists[key].record_many(buf)
+        del buf[:]
+
+    def fold(self):
+        """Move buffered samples into the histograms."""
+        for key, buf in self._buf.items():
+            if buf:
+                self._fold(key, buf)
+
+    def span(self, stage: str, symbol: str, start_ns: int, end_ns: int):
+        """Record ``end - start`` unless the start stamp is missing (event from an untraced source)."""
+        if start_ns and end_ns >= start_ns:
+            buf = self._buf.get((stage, symbol))  # record() inlined: this runs once per tick
+            if buf is None or len(buf) >= FOLD_AT - 1:
+                self.record(stage, symbol, end_ns - start_ns)
+            else:
+                buf.append(end_ns - start_ns)
+
+    # ---- stage hooks ----
+    def on_signal(self, sig, tick_ns: int):
+        sig.tick_ns, sig.signal_ns = tick_ns, perf_counter_ns()
+        self.span("tick_to_signal", sig.symbol, tick_ns, sig.signal_ns)
+
+    def on_approval(self, appr, sig):
+        """Carry the signal's stamps onto its approval and record the risk stage."""
+        appr.tick_ns, appr.signal_ns = sig.tick_ns, sig.signal_ns
+        appr.approve_ns = now = perf_counter_ns()
+        self.span("risk", sig.symbol, sig.signal_ns, now)
+
+    def on_send(self, appr):
+        appr.send_ns = now = perf_counter_ns()
+        self.span("oms_queue", appr.symbol, appr.approve_ns, now)
+
+    def on_fill(self, e, src):
+        """Copy ``src``'s stamps (approval or tracked order) onto Execution ``e``; record broker / end to end."""
+        e.tick_ns, e.signal_ns, e.approve_ns, e.send_ns = src.tick_ns, src.signal_ns, src.approve_ns, src.send_ns
+        e.fill_ns = now = perf_counter_ns()
+        self.span("broker", e.symbol, e.send_ns, now)
+        self.span("end_to_end", e.symbol, e.tick_ns, now)
+
+    # ---- reporting ----
+    def snapshot(self) -> dict:
+        """{stage: {symbol: summary in ms}} in pipeline order."""
+        self.fold()
+        out: dict[str, dict] = {}
+        for stage in STAGES + tuple(sorted({s for s, _ in self.hists} - set(STAGES))):
+            for (st, sym), h in sorted(self.hists.items()):
+                if st == stage and h.n:
+                    out.setdefault(stage, {})[sym] = h.summary()
+        return out
+
+    def format(self) -> list[str]:
+        return [f"{stage:<14} {sym:<6} {s['n']:>7d}  p50={s['p50']:.3f}ms p90={s['p90']:.3f}ms "
+                f"p99={s['p99']:.3f}ms max={s['max']:.3f}ms"
+                for stage, by_sym in self.snapshot().items() for sym, s in by_sym.items()]
+
+    def dump(self, path: Optional[str] = TRACE_PATH, tag: str = "[TRACE]"):
+        lines = self.format()
+        for ln in lines:
+            print(tag, ln)
+        if path and lines:
+            JOURNAL.replace(path, json.dumps(self.snapshot(), indent=2))
+
+    def summary(self, path: Optional[str] = TRACE_PATH):
+        if self.enabled and self.hists:
+            print("[TRACE] Stage latency summary (stage symbol n percentiles):")
+            self.dump(path)
+
+    def reset(self):
+        self.hists.clear()
+        self._buf.clear()
+
+    async def run(self, interval: Optional[float] = None):
+        interval = SETTINGS.trace_dump_sec if interval is None else interval
+        if not self.enabled or interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            self.dump()
+
+
+TRACER = Tracer(SETTINGS.trace)